@@ -0,0 +1,53 @@
+using System.Collections.Generic;
+using UnityEngine;
+using Newtonsoft.Json;
+
+/// <summary>
+/// Loads lesson definitions from Resources/LessonDefinitions/{language}.json.
+/// Each course is read the first time it is opened and kept for later calls,
+/// so adding or editing lessons no longer requires recompiling LessonManager.
+/// The files are written by scripts/generate_lesson_definitions.py.
+/// </summary>
+public static class LessonDefinitions
+{
+    private const string ResourceFolder = "LessonDefinitions";
+
+    private class CourseFile
+    {
+        public int version;
+        public string language;
+        public List<Lesson> lessons = new List<Lesson>();
+    }
+
+    private static readonly Dictionary<string, List<Lesson>> loadedCourses = new Dictionary<string, List<Lesson>>();
+
+    /// <summary>
+    /// Fills target with the lessons of a course. Returns false if the course has no definitions file.
+    /// </summary>
+    public static bool TryLoad(string language, List<Lesson> target)
+    {
+        if (!loadedCourses.TryGetValue(language, out List<Lesson> lessons))
+        {
+            TextAsset file = Resources.Load<TextAsset>($"{ResourceFolder}/{language}");
+            if (file == null)
+            {
+                return false;
+            }
+
+            CourseFile course = JsonConvert.DeserializeObject<CourseFile>(file.text);
+            Resources.UnloadAsset(file);
+            if (course == null || course.lessons == null || course.lessons.Count == 0)
+            {
+                Debug.LogWarning($"[LessonDefinitions] No lessons in {ResourceFolder}/{language}");
+                return false;
+            }
+
+            lessons = course.lessons;
+            loadedCourses[language] = lessons;
+        }
+
+        target.Clear();
+        target.AddRange(lessons);
+        return true;
+    }
+}
@@ -95,8 +95,8 @@ public class LessonManager : MonoBehaviour
     {
         Debug.Log("[LessonManager] Start called");
 
-        // Initialize with Python lesson 1, exercise 2 (variables) from senkou-code
-        InitializeDefaultExercise();
+        // Initialize with the Python lessons from senkou-code
+        InitializeLessonsForLanguage("python");
         StartCoroutine(WaitForLocalizationAndDisplay());
 
         // Register console panel next button listener
@@ -187,6 +187,10 @@ public class LessonManager : MonoBehaviour
         }
     }
 
+#if LESSON_CODE_FALLBACK
+    // Compiled copies of the lessons, used only when LESSON_CODE_FALLBACK is defined.
+    // The lessons normally load from Resources/LessonDefinitions (generate_lesson_definitions.py).
+
     /// <summary>
     /// Initialize with all exercises from all Python lessons
     /// Based on senkou-code/data/lessons/python.ts, python2.ts, python3.ts, python4.ts, python5.ts
@@ -5073,6 +5077,7 @@ public class LessonManager : MonoBehaviour
 
         Debug.Log($"[LessonManager] Initialized {lessons.Count} Assembly lessons");
     }
+#endif // LESSON_CODE_FALLBACK
 
 
     private IEnumerator WaitForLocalizationAndDisplay()
@@ -5523,6 +5528,16 @@ public class LessonManager : MonoBehaviour
     {
         lessons.Clear();
 
+        // Lessons come from the data files written by scripts/generate_lesson_definitions.py
+        if (LessonDefinitions.TryLoad(language.ToLower(), lessons))
+        {
+            currentLessonIndex = 0;
+            currentExerciseIndex = 0;
+            Debug.Log($"[LessonManager] Loaded {lessons.Count} lessons for {language} from lesson definitions");
+            return;
+        }
+
+#if LESSON_CODE_FALLBACK
         switch (language.ToLower())
         {
             case "python":
@@ -5592,8 +5607,15 @@ public class LessonManager : MonoBehaviour
         }
 
         Debug.Log($"[LessonManager] Initialized {lessons.Count} lessons for {language}");
+#else
+        Debug.LogWarning($"[LessonManager] No lesson definitions for {language}, defaulting to Python");
+        LessonDefinitions.TryLoad("python", lessons);
+        currentLessonIndex = 0;
+        currentExerciseIndex = 0;
+#endif
     }
 
+#if LESSON_CODE_FALLBACK
     /// <summary>
     /// Initialize Python lessons (extracted from InitializeDefaultExercise)
     /// </summary>
@@ -6924,6 +6946,7 @@ public class LessonManager : MonoBehaviour
 
         lessons.Add(lesson4);
     }
+#endif // LESSON_CODE_FALLBACK
 
     public Lesson GetCurrentLesson()
     {
@@ -7739,6 +7762,7 @@ public class LessonManager : MonoBehaviour
     }
 
     
+#if LESSON_CODE_FALLBACK
     private void InitializeRustLessons()
     {
         lessons.Clear();
@@ -12923,6 +12947,7 @@ public class LessonManager : MonoBehaviour
         currentLessonIndex = 0;
         currentExerciseIndex = 0;
     }
+#endif // LESSON_CODE_FALLBACK
 
     #endregion
 }
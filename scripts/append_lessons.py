@@ -1,51 +1,40 @@
 #!/usr/bin/env python3
 """
-Append generated lesson methods to LessonManager.cs
+Put generated lesson methods from scripts/generated/ into LessonManager.cs
+
+Each method is replaced between its `// <generated:lang>` markers (see
+generate_lesson_manager.splice_method) instead of being appended again,
+so running this twice leaves the file unchanged. generate_lesson_manager.py
+already does this for the languages it regenerates; use this script to
+re-apply hand-edited files from scripts/generated/.
 """
-from pathlib import Path
+from generate_lesson_manager import LESSON_MANAGER_PATH, OUTPUT_DIR, update_lesson_manager
 
 def main():
-    generated_dir = Path('C:/Work/MetaXR/ProgramShooting/scripts/generated')
-    lesson_manager = Path('C:/Work/MetaXR/ProgramShooting/Assets/Scripts/LessonManager.cs')
+    generated_dir = OUTPUT_DIR
+    lesson_manager = LESSON_MANAGER_PATH
 
     # Languages to add (excluding go and csharp which already exist)
     languages = ['rust', 'ruby', 'php', 'swift', 'kotlin', 'bash', 'sql', 'lua', 'perl', 'haskell', 'elixir']
 
-    # Read current content
-    with open(lesson_manager, 'r', encoding='utf-8') as f:
-        content = f.read()
-
-    # Find the position before the last closing brace
-    # The file ends with:
-    #     #endregion
-    # }
-
-    # Find the last occurrence of "#endregion" followed by "}"
-    insert_pos = content.rfind('#endregion')
-    if insert_pos == -1:
-        # Fallback: find last closing brace
-        insert_pos = content.rfind('}')
-
     # Collect all method content
-    methods_content = []
+    methods = {}
     for lang in languages:
         gen_file = generated_dir / f'{lang}_lessons.cs'
         if gen_file.exists():
             with open(gen_file, 'r', encoding='utf-8') as f:
-                method_code = f.read()
-            methods_content.append(f'\n{method_code}\n')
-            print(f"Added {lang}")
+                methods[lang] = f.read().strip('\n')
         else:
             print(f"Warning: {gen_file} not found")
 
-    # Insert before #endregion
-    new_content = content[:insert_pos] + '\n'.join(methods_content) + '\n    ' + content[insert_pos:]
-
-    # Write back
-    with open(lesson_manager, 'w', encoding='utf-8') as f:
-        f.write(new_content)
+    placed, written = update_lesson_manager(lesson_manager, methods)
+    for lang, how in placed.items():
+        print(f"{lang}: {how}")
 
-    print(f"\nDone! Added {len(methods_content)} language methods to LessonManager.cs")
+    if written:
+        print(f"\nDone! Updated {len(methods)} language methods in LessonManager.cs")
+    else:
+        print("\nLessonManager.cs already up to date")
 
 if __name__ == '__main__':
     main()
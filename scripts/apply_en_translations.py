@@ -7,6 +7,8 @@ Reads *_en_translated.json files and updates the corresponding lesson files.
 import json
 from pathlib import Path
 
+from json_utils import safe_json_dump
+
 def apply_translations(lesson_file, translation_file):
     """Apply translations from translation file to lesson file."""
     print(f"Applying translations from {translation_file.name} to {lesson_file.name}")
@@ -33,8 +35,7 @@ def apply_translations(lesson_file, translation_file):
     data['en'] = en_section
 
     # Write back
-    with open(lesson_file, 'w', encoding='utf-8') as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+    safe_json_dump(data, lesson_file, indent=2)
 
     print(f"  Updated {updated_count} keys")
     return updated_count
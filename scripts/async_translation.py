@@ -0,0 +1,322 @@
+#!/usr/bin/env python3
+"""
+Asyncio HTTP backend for Google Translate.
+
+The translation scripts used to call GoogleTranslator / googletrans one
+string at a time, opening a new HTTPS connection per call and sleeping
+between calls to stay under the rate limit. This module keeps the same
+translate(text, src, dest) contract but:
+
+- reuses keep-alive connections from a per-host pool (AsyncHTTPClient)
+- keeps at most max_in_flight requests running at once
+- paces requests per host with a token bucket instead of fixed sleeps
+- retries 429 / 5xx answers, timeouts and dropped connections with
+  exponential backoff
+
+Only the standard library is used (asyncio streams), so nothing extra has
+to be installed. The event loop runs in a background thread; translate()
+blocks the caller like the old clients did, while translate_many() sends a
+whole list concurrently.
+
+Usage:
+    translator = get_translator()
+    text = translator.translate("こんにちは", "ja", "en")
+    results = translator.translate_many(texts, "ja", "de")   # str or Exception each
+
+Environment:
+    TRANSLATE_ENDPOINT   translate URL (default: Google's public endpoint);
+                         point it at mock_translate_server.py for benchmarks
+    TRANSLATE_RATE       requests per second per host (default: 5)
+    TRANSLATE_IN_FLIGHT  concurrent requests (default: 8)
+"""
+
+import asyncio
+import atexit
+import json
+import os
+import ssl
+import threading
+import time
+from collections import defaultdict, deque
+from urllib.parse import urlencode, urlsplit
+
+DEFAULT_ENDPOINT = "https://translate.googleapis.com/translate_a/single"
+
+# Project locale codes that Google spells differently
+GOOGLE_LANG_CODES = {
+    "zh-Hans": "zh-CN",
+    "zh-Hant": "zh-TW",
+}
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+# Timeouts, refused/reset connections and truncated responses
+# (OSError covers ConnectionError, EOFError covers IncompleteReadError)
+RETRY_ERRORS = (asyncio.TimeoutError, OSError, EOFError)
+
+
+class TranslationHTTPError(RuntimeError):
+    """Raised when the translate endpoint answers with an error status."""
+
+    def __init__(self, status, body=b""):
+        super().__init__(f"HTTP {status}: {body[:200].decode('utf-8', 'replace')}")
+        self.status = status
+
+
+class TokenBucket:
+    """
+    Request pacing for one host.
+
+    Holds up to `capacity` tokens, refilled at `rate` per second; every
+    request takes one. Lets short bursts through and then settles at rate.
+    Must only be used from its event loop.
+    """
+
+    def __init__(self, rate, capacity=None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+
+    async def acquire(self):
+        while True:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return
+            await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class AsyncHTTPClient:
+    """
+    Minimal HTTP/1.1 client with keep-alive connection pools.
+
+    At most connections_per_host connections are open to one host; idle
+    ones are reused by the next request. Handles Content-Length, chunked
+    and read-until-close bodies.
+    """
+
+    def __init__(self, connections_per_host=8, rate_per_host=5.0, burst=None, timeout=30.0):
+        self.connections_per_host = connections_per_host
+        self.rate_per_host = rate_per_host
+        self.burst = burst
+        self.timeout = timeout
+        self._idle = defaultdict(deque)
+        self._slots = {}
+        self._buckets = {}
+        self._ssl = None
+        self.connections_opened = 0
+
+    def _host_state(self, origin):
+        if origin not in self._slots:
+            self._slots[origin] = asyncio.Semaphore(self.connections_per_host)
+            self._buckets[origin] = TokenBucket(self.rate_per_host, self.burst)
+        return self._slots[origin], self._buckets[origin]
+
+    async def _connect(self, scheme, host, port):
+        context = None
+        if scheme == "https":
+            if self._ssl is None:
+                self._ssl = ssl.create_default_context()
+            context = self._ssl
+        self.connections_opened += 1
+        return await asyncio.open_connection(host, port, ssl=context)
+
+    async def request(self, method, url, body=None, headers=None):
+        """Send a request and return (status, headers, body bytes)."""
+        parts = urlsplit(url)
+        scheme = parts.scheme or "http"
+        host = parts.hostname
+        port = parts.port or (443 if scheme == "https" else 80)
+        path = parts.path or "/"
+        if parts.query:
+            path += "?" + parts.query
+        origin = (scheme, host, port)
+        slots, bucket = self._host_state(origin)
+
+        lines = [f"{method} {path} HTTP/1.1", f"Host: {parts.netloc}",
+                 "Connection: keep-alive", "Accept-Encoding: identity",
+                 "User-Agent: Mozilla/5.0"]
+        for name, value in (headers or {}).items():
+            lines.append(f"{name}: {value}")
+        body = body or b""
+        lines.append(f"Content-Length: {len(body)}")
+        raw = ("\r\n".join(lines) + "\r\n\r\n").encode("ascii") + body
+
+        await bucket.acquire()
+        async with slots:
+            idle = self._idle[origin]
+            # A pooled connection may have been closed by the server; retry once fresh
+            for attempt in range(2):
+                reused = bool(idle)
+                reader, writer = idle.pop() if reused else await self._connect(scheme, host, port)
+                try:
+                    writer.write(raw)
+                    await writer.drain()
+                    status, response_headers, response_body = await asyncio.wait_for(
+                        self._read_response(reader), self.timeout)
+                except (ConnectionError, asyncio.IncompleteReadError, EOFError):
+                    writer.close()
+                    if reused and attempt == 0:
+                        continue
+                    raise
+                except BaseException:
+                    writer.close()
+                    raise
+                if response_headers.get("connection", "").lower() == "close":
+                    writer.close()
+                else:
+                    idle.append((reader, writer))
+                return status, response_headers, response_body
+
+    async def _read_response(self, reader):
+        status_line = await reader.readline()
+        if not status_line:
+            raise EOFError("connection closed")
+        status = int(status_line.split()[1])
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        if headers.get("transfer-encoding", "").lower() == "chunked":
+            chunks = []
+            while True:
+                size = int((await reader.readline()).split(b";")[0], 16)
+                if size == 0:
+                    await reader.readline()
+                    break
+                chunks.append(await reader.readexactly(size))
+                await reader.readexactly(2)
+            return status, headers, b"".join(chunks)
+        if "content-length" in headers:
+            return status, headers, await reader.readexactly(int(headers["content-length"]))
+        headers["connection"] = "close"
+        return status, headers, await reader.read()
+
+    async def close(self):
+        for idle in self._idle.values():
+            while idle:
+                _, writer = idle.pop()
+                writer.close()
+
+
+class AsyncTranslator:
+    """
+    Google Translate client with translate(text, src, dest) -> str.
+
+    Runs its own event loop in a daemon thread, so it can be called from
+    plain synchronous code and from worker threads alike.
+    """
+
+    def __init__(self, endpoint=None, max_in_flight=None, rate_per_host=None, burst=None,
+                 retries=3, timeout=30.0):
+        self.endpoint = endpoint or os.environ.get("TRANSLATE_ENDPOINT", DEFAULT_ENDPOINT)
+        self.max_in_flight = max_in_flight or int(os.environ.get("TRANSLATE_IN_FLIGHT", "8"))
+        self.rate_per_host = rate_per_host or float(os.environ.get("TRANSLATE_RATE", "5"))
+        self.burst = burst
+        self.retries = retries
+        self.timeout = timeout
+        self.requests = 0
+        self._loop = None
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def _start(self):
+        with self._lock:
+            if self._loop is not None:
+                return
+            loop = asyncio.new_event_loop()
+            thread = threading.Thread(target=loop.run_forever, name="async-translation", daemon=True)
+            thread.start()
+            self._client = AsyncHTTPClient(self.max_in_flight, self.rate_per_host, self.burst, self.timeout)
+            self._in_flight = None
+            self._loop, self._thread = loop, thread
+
+    def _run(self, coroutine):
+        self._start()
+        return asyncio.run_coroutine_threadsafe(coroutine, self._loop).result()
+
+    async def translate_async(self, text, src, dest):
+        """
+        Translate one text, retrying 429 / 5xx answers and transport errors.
+
+        Raises TranslationHTTPError (or the last transport error) once
+        retries run out.
+        """
+        if self._in_flight is None:
+            self._in_flight = asyncio.Semaphore(self.max_in_flight)
+        params = urlencode({"client": "gtx", "dt": "t",
+                            "sl": GOOGLE_LANG_CODES.get(src, src),
+                            "tl": GOOGLE_LANG_CODES.get(dest, dest)})
+        body = urlencode({"q": text}).encode("utf-8")
+        headers = {"Content-Type": "application/x-www-form-urlencoded;charset=utf-8"}
+
+        for attempt in range(self.retries + 1):
+            try:
+                async with self._in_flight:
+                    self.requests += 1
+                    status, _, payload = await self._client.request(
+                        "POST", f"{self.endpoint}?{params}", body, headers)
+            except RETRY_ERRORS:
+                if attempt == self.retries:
+                    raise
+                await asyncio.sleep(min(30.0, 0.5 * 2 ** attempt))
+                continue
+            if status == 200:
+                data = json.loads(payload.decode("utf-8"))
+                return "".join(segment[0] for segment in data[0] if segment and segment[0])
+            if status not in RETRY_STATUSES or attempt == self.retries:
+                raise TranslationHTTPError(status, payload)
+            await asyncio.sleep(min(30.0, 0.5 * 2 ** attempt))
+
+    def translate(self, text, src, dest):
+        """Translate one text, blocking until it is done."""
+        if not text or not text.strip():
+            return text
+        return self._run(self.translate_async(text, src, dest))
+
+    def translate_many(self, texts, src, dest):
+        """
+        Translate a list concurrently (up to max_in_flight at once).
+
+        Returns a list in input order; a failed item is its exception.
+        """
+        async def one(text):
+            if not text or not text.strip():
+                return text
+            return await self.translate_async(text, src, dest)
+
+        async def gather():
+            return await asyncio.gather(*(one(text) for text in texts), return_exceptions=True)
+
+        return self._run(gather())
+
+    @property
+    def connections_opened(self):
+        return self._client.connections_opened if self._loop else 0
+
+    def close(self):
+        if self._loop is None:
+            return
+        self._run(self._client.close())
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+        self._loop = None
+
+
+_default_translator = None
+
+
+def get_translator():
+    """Return the process-wide AsyncTranslator, creating it on first use."""
+    global _default_translator
+    if _default_translator is None:
+        _default_translator = AsyncTranslator()
+        atexit.register(_default_translator.close)
+    return _default_translator
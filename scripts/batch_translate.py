@@ -3,10 +3,8 @@
 Batch translate JA files to EN using efficient chunking.
 """
 import json
-import re
 import sys
 import io
-import time
 from pathlib import Path
 
 sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
@@ -26,12 +24,11 @@ except ImportError:
     safe_json_dump = None
     validate_json_file = None
 
-try:
-    from deep_translator import GoogleTranslator
-except ImportError:
-    import subprocess
-    subprocess.check_call([sys.executable, "-m", "pip", "install", "deep-translator", "-q"])
-    from deep_translator import GoogleTranslator
+from code_spans import is_code_only, protect_code, restore_code
+from translation_journal import TranslationJournal
+from translation_memory import get_memory
+from translation_backends import get_backend
+from translation_scheduler import run_concurrently
 
 LOCAL_DIR = Path("C:/Work/MetaXR/ProgramShooting/Assets/Resources")
 
@@ -43,37 +40,26 @@ LANGUAGES = [
     "lua", "perl", "haskell", "elixir"
 ]
 
-def protect_code(text):
-    blocks = []
-    def save_block(m):
-        blocks.append(m.group(0))
-        return f"CODEBLOCK{len(blocks)-1}ENDBLOCK"
-    text = re.sub(r'```[\s\S]*?```', save_block, text)
-    inlines = []
-    def save_inline(m):
-        inlines.append(m.group(0))
-        return f"INLINECODE{len(inlines)-1}ENDINLINE"
-    text = re.sub(r'`[^`]+`', save_inline, text)
-    return text, blocks, inlines
-
-def restore_code(text, blocks, inlines):
-    for i, b in enumerate(blocks):
-        text = text.replace(f"CODEBLOCK{i}ENDBLOCK", b)
-    for i, c in enumerate(inlines):
-        text = text.replace(f"INLINECODE{i}ENDINLINE", c)
-    return text
-
-def translate_text(translator, text):
+def translate_text(translator, text, source='ja', target='en'):
     if not text or not text.strip():
         return text
-    protected, blocks, inlines = protect_code(text)
+    memory = get_memory()
+    cached = memory.get(text, source, target, translator.name)
+    if cached is not None:
+        return cached
+    protected, spans = protect_code(text)
+    if is_code_only(protected):
+        return text
     try:
-        translated = translator.translate(protected)
-        restored = restore_code(translated, blocks, inlines)
+        translated = translator.translate(protected, source, target)
+        # Raises CodeSpanError (caught below) if the code did not survive
+        restored = restore_code(translated, spans)
         # Sanitize to prevent JSON corruption
-        return sanitize_text_for_json(restored)
+        result = sanitize_text_for_json(restored)
     except Exception as e:
         return text
+    memory.put(text, source, target, translator.name, result)
+    return result
 
 def process_language(lang):
     ja_path = LOCAL_DIR / f"{lang}Lessons_ja.json"
@@ -86,19 +72,35 @@ def process_language(lang):
     if en_path.exists():
         with open(en_path, 'r', encoding='utf-8') as f:
             en_data = json.load(f)
-    translator = GoogleTranslator(source='ja', target='en')
+    # Resume from batches journaled by an interrupted run
+    journal = TranslationJournal(en_path, 'en')
+    resumed = journal.replay(ja_data)
+    if resumed:
+        print(f"  Resumed {len(resumed)} keys from journal")
+        en_data.update(resumed)
+    translator = get_backend(default='google')
     keys_to_translate = [k for k in ja_data if k not in en_data or not en_data[k]]
-    if not keys_to_translate:
+    if not keys_to_translate and not resumed:
         print(f"  Already done")
         return 0
     print(f"  {len(keys_to_translate)} keys to translate...")
     count = 0
-    for key in keys_to_translate:
-        en_data[key] = translate_text(translator, ja_data[key])
+    batch = {}
+
+    def on_result(key, result):
+        nonlocal count, batch
+        en_data[key] = ja_data[key] if isinstance(result, Exception) else result
+        batch[key] = en_data[key]
         count += 1
         if count % 50 == 0:
+            journal.append(batch, ja_data)
+            batch = {}
             print(f"    {count}/{len(keys_to_translate)}")
-        time.sleep(0.02)
+
+    # Requests run concurrently; the backend bounds how many are in flight
+    run_concurrently(keys_to_translate, lambda key: translate_text(translator, ja_data[key]),
+                     max_concurrency=translator.max_in_flight, on_result=on_result)
+    journal.append(batch, ja_data)
     sorted_data = dict(sorted(en_data.items()))
 
     # Validate before writing
@@ -112,13 +114,15 @@ def process_language(lang):
         with open(en_path, 'w', encoding='utf-8') as f:
             json.dump(sorted_data, f, ensure_ascii=False, indent=2)
 
+    journal.discard()
+
     # Verify the written file
     if validate_json_file:
         is_valid, error, _ = validate_json_file(en_path)
         if not is_valid:
             print(f"    WARNING: Written file has JSON errors: {error}")
 
-    return count
+    return count + len(resumed)
 
 def main():
     print("JA -> EN Translation")
@@ -129,6 +133,7 @@ def main():
             print(f"  OK: {count}")
         except Exception as e:
             print(f"  ERROR: {e}")
+    print(get_memory().summary())
     print("Done")
 
 if __name__ == "__main__":
@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+"""
+Compile the localization JSON files into one binary bundle per locale.
+
+LocalizationManager currently parses localizedText.json plus every
+`*Lessons_common.json` and `*Lessons_<locale>.json` (over 420 files) at
+startup, then copies the common keys into every language. This build step
+does that merge ahead of time (see localization_layout.py) and writes
+`<locale>.bytes`, so the runtime only has to load the selected language.
+
+Bundle format (all integers little-endian uint32 unless noted):
+
+    header          magic "PSLB", version (uint16), flags (uint16, 0),
+                    entry_count, string_table_offset, string_table_size
+    index           entry_count x (key_offset, key_length,
+                                   value_offset, value_length)
+    string table    UTF-8 bytes; offsets are relative to its start
+
+Index entries are sorted by key in ordinal UTF-16 order (C#
+string.CompareOrdinal), so a key can be found by binary search without
+building a dictionary. Identical strings are stored once.
+
+Usage:
+    python build_localization_bundle.py [--locale ja] [--verify] [--benchmark]
+"""
+
+import argparse
+import os
+import struct
+import sys
+import time
+from pathlib import Path
+
+from localization_layout import RESOURCES_PATH, load_merged_locales, source_files
+
+OUTPUT_PATH = RESOURCES_PATH / "LocalizationBundles"
+
+MAGIC = b"PSLB"
+VERSION = 1
+HEADER = struct.Struct("<4sHHIII")
+INDEX_ENTRY = struct.Struct("<IIII")
+
+
+def _sort_key(key):
+    return key.encode('utf-16-be')
+
+
+def build_bundle(texts):
+    """Return the bundle bytes for a {key: text} dict."""
+    table = bytearray()
+    offsets = {}
+
+    def intern(s):
+        encoded = s.encode('utf-8')
+        offset = offsets.get(encoded)
+        if offset is None:
+            offset = len(table)
+            offsets[encoded] = offset
+            table.extend(encoded)
+        return offset, len(encoded)
+
+    index = bytearray()
+    for key in sorted(texts, key=_sort_key):
+        key_offset, key_length = intern(key)
+        value_offset, value_length = intern(texts[key])
+        index.extend(INDEX_ENTRY.pack(key_offset, key_length, value_offset, value_length))
+
+    table_offset = HEADER.size + len(index)
+    header = HEADER.pack(MAGIC, VERSION, 0, len(texts), table_offset, len(table))
+    return bytes(header) + bytes(index) + bytes(table)
+
+
+class LocalizationBundle:
+    """Reader for a bundle produced by build_bundle()."""
+
+    def __init__(self, data):
+        magic, version, _flags, count, table_offset, table_size = HEADER.unpack_from(data, 0)
+        if magic != MAGIC:
+            raise ValueError("Not a localization bundle")
+        if version != VERSION:
+            raise ValueError(f"Unsupported bundle version {version}")
+        if table_offset != HEADER.size + count * INDEX_ENTRY.size or \
+                table_offset + table_size != len(data):
+            raise ValueError("Bundle is truncated or corrupt")
+        self._data = memoryview(data)
+        self._count = count
+        self._table = table_offset
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'rb') as f:
+            return cls(f.read())
+
+    def __len__(self):
+        return self._count
+
+    def _string(self, offset, length):
+        start = self._table + offset
+        return str(self._data[start:start + length], 'utf-8')
+
+    def _entry(self, i):
+        return INDEX_ENTRY.unpack_from(self._data, HEADER.size + i * INDEX_ENTRY.size)
+
+    def get(self, key, default=None):
+        """Look a key up by binary search over the sorted index."""
+        target = _sort_key(key)
+        lo, hi = 0, self._count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            key_offset, key_length, value_offset, value_length = self._entry(mid)
+            probe = _sort_key(self._string(key_offset, key_length))
+            if probe < target:
+                lo = mid + 1
+            elif probe > target:
+                hi = mid
+            else:
+                return self._string(value_offset, value_length)
+        return default
+
+    def to_dict(self):
+        """Decode every entry into a {key: text} dict."""
+        result = {}
+        index = self._data[HEADER.size:self._table]
+        for key_offset, key_length, value_offset, value_length in INDEX_ENTRY.iter_unpack(index):
+            result[self._string(key_offset, key_length)] = self._string(value_offset, value_length)
+        return result
+
+
+def write_bundle(data, path):
+    """Write bundle bytes atomically."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def verify_bundle(path, expected):
+    """
+    Check that a bundle decodes back to exactly `expected`.
+
+    Returns a list of problems (empty when the round trip is exact).
+    """
+    problems = []
+    try:
+        bundle = LocalizationBundle.load(path)
+    except (OSError, ValueError, struct.error) as e:
+        return [f"cannot read bundle: {e}"]
+
+    decoded = bundle.to_dict()
+    missing = expected.keys() - decoded.keys()
+    extra = decoded.keys() - expected.keys()
+    if missing:
+        problems.append(f"{len(missing)} keys missing (e.g. {sorted(missing)[0]})")
+    if extra:
+        problems.append(f"{len(extra)} unexpected keys (e.g. {sorted(extra)[0]})")
+    changed = [k for k in expected.keys() & decoded.keys() if expected[k] != decoded[k]]
+    if changed:
+        problems.append(f"{len(changed)} values differ (e.g. {sorted(changed)[0]})")
+
+    # Binary search must agree with the full decode
+    for key in list(expected)[:200]:
+        if bundle.get(key) != expected[key]:
+            problems.append(f"lookup of {key} returned the wrong value")
+            break
+    return problems
+
+
+def _best_time(func, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def benchmark(resources_path, output_path, locales, repeat=3):
+    """Compare load size and time of the JSON layout against the bundles."""
+    json_files = source_files(resources_path)
+    json_bytes = sum(p.stat().st_size for p in json_files)
+    json_time = _best_time(lambda: load_merged_locales(resources_path), repeat)
+
+    print("\n" + "=" * 60)
+    print("Benchmark (best of %d)" % repeat)
+    print("=" * 60)
+    print(f"JSON layout: {len(json_files)} files, {json_bytes / 1024:.0f} KB, "
+          f"{json_time * 1000:.1f} ms to parse and merge")
+    print(f"{'Locale':<10} {'Bundle KB':>10} {'Load ms':>10} {'Lookup us':>10}")
+
+    total_bytes = 0
+    for locale in locales:
+        path = output_path / f"{locale}.bytes"
+        if not path.exists():
+            continue
+        size = path.stat().st_size
+        total_bytes += size
+        load_time = _best_time(lambda: LocalizationBundle.load(path).to_dict(), repeat)
+
+        bundle = LocalizationBundle.load(path)
+        keys = list(bundle.to_dict())[::max(1, len(bundle) // 100)]
+        lookup_time = _best_time(lambda: [bundle.get(k) for k in keys], repeat)
+        lookup_us = lookup_time / max(1, len(keys)) * 1e6
+        print(f"{locale:<10} {size / 1024:>10.0f} {load_time * 1000:>10.2f} {lookup_us:>10.1f}")
+
+    if json_bytes:
+        print(f"\nAll bundles: {total_bytes / 1024:.0f} KB "
+              f"({total_bytes / json_bytes * 100:.0f}% of the JSON layout)")
+    print("At runtime only one bundle is loaded instead of the whole JSON layout.")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Build binary localization bundles per locale')
+    parser.add_argument('--path', type=Path, default=RESOURCES_PATH,
+                        help='Resources folder with the localization JSON files')
+    parser.add_argument('--output', type=Path, default=OUTPUT_PATH,
+                        help='Folder to write <locale>.bytes into')
+    parser.add_argument('--locale', action='append',
+                        help='Only build this locale (repeatable)')
+    parser.add_argument('--verify', action='store_true',
+                        help='Round-trip every bundle against the JSON merge')
+    parser.add_argument('--benchmark', action='store_true',
+                        help='Compare size and load time with the JSON layout')
+    parser.add_argument('--repeat', type=int, default=3,
+                        help='Benchmark repetitions (default: 3)')
+    args = parser.parse_args()
+
+    merged = load_merged_locales(args.path, args.locale)
+    if not merged:
+        print("No locales found")
+        return 1
+
+    print("=" * 60)
+    print("Localization Bundle Build")
+    print("=" * 60)
+
+    failed = 0
+    for locale, texts in merged.items():
+        path = args.output / f"{locale}.bytes"
+        write_bundle(build_bundle(texts), path)
+        line = f"{locale:<10} {len(texts):>6} keys  {path.stat().st_size / 1024:>7.0f} KB"
+        if args.verify:
+            problems = verify_bundle(path, texts)
+            if problems:
+                failed += 1
+                line += "  [NG] " + "; ".join(problems)
+            else:
+                line += "  [OK] round trip"
+        print(line)
+
+    print(f"\nWrote {len(merged)} bundles to {args.output}")
+
+    if args.benchmark:
+        benchmark(args.path, args.output, list(merged), args.repeat)
+
+    if failed:
+        print(f"\n{failed} bundle(s) failed verification")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,303 @@
+#!/usr/bin/env python3
+"""
+Build a lazy-loading manifest for the per-course lesson localization files.
+
+A player only ever opens one course, but LocalizationManager loads every
+`*Lessons_*.json` for every locale at startup. This script maps each lesson
+key prefix (e.g. `python_lesson3_`) to the files and byte ranges that hold
+its keys, so the runtime can read just the slices it needs:
+
+    {
+      "version": 1,
+      "files": {"pythonLessons_ja.json": {"size": 123, "hash": "..."}},
+      "prefixes": {
+        "python_lesson3_": {
+          "common": [{"file": "pythonLessons_common.json", "keys": 40,
+                      "ranges": [[1200, 5400]]}],
+          "ja":     [{"file": "pythonLessons_ja.json", "keys": 310,
+                      "ranges": [[83000, 190000]]}]
+        }
+      }
+    }
+
+Each range covers whole `"key": value` members, without separating commas.
+Joining a file's ranges with "," and wrapping them in "{...}" gives valid
+JSON containing exactly the prefix's keys. Apply "common" before the locale
+entries, as LocalizationManager does.
+
+`--check` verifies an existing manifest against the current files: hashes,
+range bounds, overlaps, that every key is covered exactly once, and that
+the slices decode to the same values as the full files.
+
+Usage:
+    python build_localization_manifest.py [--check]
+"""
+
+import argparse
+import hashlib
+import json
+import re
+import sys
+from pathlib import Path
+
+from json_utils import safe_json_dump
+from localization_layout import LANG_CODES, LESSON_BASES, RESOURCES_PATH
+
+MANIFEST_PATH = RESOURCES_PATH / "LocalizationBundles" / "manifest.json"
+MANIFEST_VERSION = 1
+
+PREFIX_PATTERN = re.compile(r'^([a-z]+_lesson\d+_)')
+
+_decoder = json.JSONDecoder()
+_WS = re.compile(r'[ \t\n\r]*')
+
+
+def key_prefix(key):
+    """Return the lesson prefix of a key ("python_lesson3_"), or None."""
+    match = PREFIX_PATTERN.match(key)
+    return match.group(1) if match else None
+
+
+def scan_members(text):
+    """
+    Yield (key, value, start, end) for each top-level member of a JSON object.
+
+    start/end are character offsets of the `"key": value` text.
+    """
+    idx = _WS.match(text, 0).end()
+    if text[idx:idx + 1] != '{':
+        raise ValueError("Top-level value is not an object")
+    idx = _WS.match(text, idx + 1).end()
+    if text[idx:idx + 1] == '}':
+        return
+
+    while True:
+        start = idx
+        if text[idx:idx + 1] != '"':
+            raise ValueError(f"Expected key at offset {idx}")
+        key, idx = json.decoder.scanstring(text, idx + 1)
+        idx = _WS.match(text, idx).end()
+        if text[idx:idx + 1] != ':':
+            raise ValueError(f"Expected ':' at offset {idx}")
+        idx = _WS.match(text, idx + 1).end()
+        value, end = _decoder.raw_decode(text, idx)
+        yield key, value, start, end
+
+        idx = _WS.match(text, end).end()
+        if text[idx:idx + 1] == ',':
+            idx = _WS.match(text, idx + 1).end()
+        elif text[idx:idx + 1] == '}':
+            return
+        else:
+            raise ValueError(f"Expected ',' or '}}' at offset {idx}")
+
+
+def file_ranges(path):
+    """
+    Return {prefix: (key_count, [[byte_start, byte_end], ...])} for one file.
+
+    Consecutive members with the same prefix are merged into one range.
+    A key repeated in the file is counted once; as with json.load, the
+    last occurrence wins when the slices are decoded.
+    """
+    raw = path.read_bytes()
+    text = raw.decode('utf-8')
+
+    result = {}
+    seen = set()
+    last_prefix = None
+    char_pos = 0
+    byte_pos = 0
+
+    def to_bytes(pos):
+        nonlocal char_pos, byte_pos
+        byte_pos += len(text[char_pos:pos].encode('utf-8'))
+        char_pos = pos
+        return byte_pos
+
+    for key, _value, start, end in scan_members(text):
+        prefix = key_prefix(key)
+        if prefix is None:
+            last_prefix = None
+            continue
+        byte_start = to_bytes(start)
+        byte_end = to_bytes(end)
+
+        count, ranges = result.setdefault(prefix, [0, []])
+        if key not in seen:
+            seen.add(key)
+            result[prefix][0] = count + 1
+        if prefix == last_prefix and ranges:
+            ranges[-1][1] = byte_end
+        else:
+            ranges.append([byte_start, byte_end])
+        last_prefix = prefix
+
+    return {prefix: (count, ranges) for prefix, (count, ranges) in result.items()}
+
+
+def _hash(raw):
+    return hashlib.blake2b(raw, digest_size=16).hexdigest()
+
+
+def lesson_files(resources_path):
+    """Yield (locale or "common", path) for every lesson file, in load order."""
+    for base in LESSON_BASES:
+        for locale in ["common"] + LANG_CODES:
+            path = resources_path / f"{base}_{locale}.json"
+            if path.exists():
+                yield locale, path
+
+
+def build_manifest(resources_path=RESOURCES_PATH):
+    """Scan the lesson files and return the manifest dict."""
+    resources_path = Path(resources_path)
+    files = {}
+    prefixes = {}
+
+    for locale, path in lesson_files(resources_path):
+        raw = path.read_bytes()
+        files[path.name] = {"size": len(raw), "hash": _hash(raw)}
+        for prefix, (count, ranges) in file_ranges(path).items():
+            prefixes.setdefault(prefix, {}).setdefault(locale, []).append(
+                {"file": path.name, "keys": count, "ranges": ranges})
+
+    return {
+        "version": MANIFEST_VERSION,
+        "files": files,
+        "prefixes": dict(sorted(prefixes.items())),
+    }
+
+
+def load_slices(raw, ranges):
+    """Decode the members covered by `ranges` of a file's bytes."""
+    parts = [raw[start:end].decode('utf-8') for start, end in ranges]
+    return json.loads("{" + ",".join(parts) + "}")
+
+
+def check_manifest(manifest, resources_path=RESOURCES_PATH):
+    """Return a list of problems found in the manifest (empty if consistent)."""
+    resources_path = Path(resources_path)
+    problems = []
+
+    if manifest.get("version") != MANIFEST_VERSION:
+        return [f"unsupported manifest version {manifest.get('version')}"]
+
+    # Files on disk and in the manifest must agree
+    on_disk = {path.name: path for _, path in lesson_files(resources_path)}
+    for name in sorted(on_disk.keys() - manifest["files"].keys()):
+        problems.append(f"{name}: not in manifest")
+    for name in sorted(manifest["files"].keys() - on_disk.keys()):
+        problems.append(f"{name}: listed in manifest but missing")
+
+    contents = {}
+    for name, info in manifest["files"].items():
+        if name not in on_disk:
+            continue
+        raw = on_disk[name].read_bytes()
+        if len(raw) != info["size"] or _hash(raw) != info["hash"]:
+            problems.append(f"{name}: changed since the manifest was built")
+            continue
+        contents[name] = raw
+
+    covered = {name: {} for name in contents}
+    spans = {name: [] for name in contents}
+    for prefix, locales in manifest["prefixes"].items():
+        for locale, entries in locales.items():
+            for entry in entries:
+                name = entry["file"]
+                if name not in contents:
+                    continue
+                raw = contents[name]
+                if any(s < 0 or e > len(raw) or s >= e for s, e in entry["ranges"]):
+                    problems.append(f"{name}: {prefix} range out of bounds")
+                    continue
+                try:
+                    members = load_slices(raw, entry["ranges"])
+                except ValueError as e:
+                    problems.append(f"{name}: {prefix} slices are not valid JSON ({e})")
+                    continue
+                if len(members) != entry["keys"]:
+                    problems.append(f"{name}: {prefix} has {len(members)} keys, "
+                                    f"manifest says {entry['keys']}")
+                for key, value in members.items():
+                    if key_prefix(key) != prefix:
+                        problems.append(f"{name}: {key} sliced under {prefix}")
+                    if key in covered[name]:
+                        problems.append(f"{name}: {key} covered twice")
+                    covered[name][key] = value
+                spans[name].extend(entry["ranges"])
+
+    for name, raw in contents.items():
+        ordered = sorted(spans[name])
+        for (_, prev_end), (start, _) in zip(ordered, ordered[1:]):
+            if start < prev_end:
+                problems.append(f"{name}: overlapping ranges at byte {start}")
+                break
+
+        full = json.loads(raw.decode('utf-8'))
+        expected = {k: v for k, v in full.items() if key_prefix(k)}
+        missing = expected.keys() - covered[name].keys()
+        if missing:
+            problems.append(f"{name}: {len(missing)} keys not covered "
+                            f"(e.g. {sorted(missing)[0]})")
+        changed = [k for k in expected.keys() & covered[name].keys()
+                   if expected[k] != covered[name][k]]
+        if changed:
+            problems.append(f"{name}: {len(changed)} sliced values differ "
+                            f"(e.g. {sorted(changed)[0]})")
+
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Build the lazy per-course localization manifest')
+    parser.add_argument('--path', type=Path, default=RESOURCES_PATH,
+                        help='Resources folder with the lesson JSON files')
+    parser.add_argument('--output', type=Path, default=MANIFEST_PATH,
+                        help='Manifest file to write or check')
+    parser.add_argument('--check', action='store_true',
+                        help='Verify an existing manifest instead of building one')
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("Localization Manifest " + ("Check" if args.check else "Build"))
+    print("=" * 60)
+
+    if args.check:
+        try:
+            with open(args.output, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Cannot read {args.output}: {e}")
+            return 1
+    else:
+        manifest = build_manifest(args.path)
+        # LocalizationBundles/ is gitignored and may not exist on a fresh checkout
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        safe_json_dump(manifest, args.output, indent=None)
+        print(f"Wrote {args.output}")
+
+    problems = check_manifest(manifest, args.path)
+
+    range_count = sum(len(entry["ranges"])
+                      for locales in manifest["prefixes"].values()
+                      for entries in locales.values() for entry in entries)
+    print(f"Files:    {len(manifest['files'])}")
+    print(f"Prefixes: {len(manifest['prefixes'])}")
+    print(f"Ranges:   {range_count}")
+
+    if problems:
+        print(f"\n[NG] {len(problems)} problem(s):")
+        for problem in problems[:50]:
+            print(f"  - {problem}")
+        if len(problems) > 50:
+            print(f"  ... and {len(problems) - 50} more")
+        return 1
+
+    print("\n[OK] Manifest is consistent with the lesson files")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
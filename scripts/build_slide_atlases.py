@@ -0,0 +1,310 @@
+#!/usr/bin/env python3
+"""
+Pack slide illustrations into texture atlases, one per exercise or lesson.
+
+SlideManager loads every slide image with its own Resources.Load while
+the player pages through a tutorial, which causes hitches in VR. This
+offline tool groups the images referenced by the `*_slideN_image` keys in
+`*Lessons_common.json` per exercise (or per lesson), packs each group with
+a MaxRects bin packer (best short side fit) and writes:
+
+- one atlas image per group (more pages if it does not fit --max-size)
+- a JSON sidecar mapping every `{lang}_lesson{N}_ex{M}_slide{K}_image`
+  key to its atlas page, pixel rect and UV rect:
+
+    {
+      "version": 1,
+      "atlases": {"python_lesson1_ex1": [{"file": "python_lesson1_ex1_0.png",
+                                          "width": 2048, "height": 1024}]},
+      "sprites": {"python_lesson1_ex1_slide1_image": {
+          "atlas": "python_lesson1_ex1", "page": 0,
+          "rect": [0, 0, 1024, 1024], "uv": [0.0, 0.0, 0.5, 1.0]}}
+    }
+
+`rect` is x, y, width, height in pixels from the top-left corner. `uv` is
+u_min, v_min, u_max, v_max with Unity's bottom-left origin, ready for
+Sprite.Create / Rect.
+
+Slides are 1024x1024, so the default is no padding: any gutter stops two
+slides from sharing a 2048 edge and doubles the atlas size. Use --padding
+if mipmapped sampling bleeds between neighbours.
+
+Packing only needs image dimensions, which are read from file headers;
+--plan-only computes the layout and writes the sidecar without Pillow.
+Writing the atlas images requires Pillow (pip install pillow).
+
+Usage:
+    python build_slide_atlases.py [--group exercise|lesson] [--plan-only]
+"""
+
+import argparse
+import re
+import sys
+from collections import defaultdict
+from pathlib import Path
+
+from json_utils import safe_json_dump
+from slide_images import RESOURCES_PATH, image_size, iter_image_references, normalize_reference
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+OUTPUT_PATH = RESOURCES_PATH / "SlideAtlases"
+SIDECAR_NAME = "slide_atlases.json"
+SIDECAR_VERSION = 1
+
+KEY_PATTERN = re.compile(r'^(?P<lesson>[a-z]+_lesson\d+)_(?P<exercise>ex\d+)_slide\d+_image$')
+
+
+class MaxRectsPacker:
+    """
+    MaxRects bin packer with the best-short-side-fit heuristic.
+
+    Keeps the list of maximal free rectangles; each placement splits every
+    free rectangle it overlaps and prunes those contained in another.
+    """
+
+    def __init__(self, width, height, padding=0):
+        self.width = width
+        self.height = height
+        self.padding = padding
+        self.free = [(0, 0, width + padding, height + padding)]
+
+    def insert(self, width, height):
+        """Place a width x height rect; return (x, y) or None if it does not fit."""
+        w = width + self.padding
+        h = height + self.padding
+        best = None
+        for fx, fy, fw, fh in self.free:
+            if w <= fw and h <= fh:
+                leftover = min(fw - w, fh - h), max(fw - w, fh - h)
+                if best is None or leftover < best[0]:
+                    best = (leftover, fx, fy)
+        if best is None:
+            return None
+
+        _, x, y = best
+        placed = (x, y, w, h)
+        new_free = []
+        for free in self.free:
+            new_free.extend(self._split(free, placed))
+        self.free = [r for i, r in enumerate(new_free)
+                     if not any(j != i and self._contains(o, r) and (o != r or j < i)
+                                for j, o in enumerate(new_free))]
+        return x, y
+
+    @staticmethod
+    def _split(free, used):
+        fx, fy, fw, fh = free
+        ux, uy, uw, uh = used
+        if ux >= fx + fw or ux + uw <= fx or uy >= fy + fh or uy + uh <= fy:
+            return [free]
+        parts = []
+        if ux > fx:
+            parts.append((fx, fy, ux - fx, fh))
+        if ux + uw < fx + fw:
+            parts.append((ux + uw, fy, fx + fw - ux - uw, fh))
+        if uy > fy:
+            parts.append((fx, fy, fw, uy - fy))
+        if uy + uh < fy + fh:
+            parts.append((fx, uy + uh, fw, fy + fh - uy - uh))
+        return parts
+
+    @staticmethod
+    def _contains(outer, inner):
+        ox, oy, ow, oh = outer
+        ix, iy, iw, ih = inner
+        return ox <= ix and oy <= iy and ix + iw <= ox + ow and iy + ih <= oy + oh
+
+
+def _candidate_sizes(area, max_side, min_side):
+    """Power-of-two atlas sizes from smallest area up, squares before 2:1."""
+    sizes = []
+    side = 1
+    while side <= max_side:
+        for other in (side, side * 2):
+            if other <= max_side and side * other >= area and min(side, other) >= min_side:
+                sizes.append((other, side))
+        side *= 2
+    return sorted(set(sizes), key=lambda s: (s[0] * s[1], max(s) - min(s)))
+
+
+def pack_group(images, max_side=4096, padding=0):
+    """
+    Pack {image path: (width, height)} into as few atlas pages as possible.
+
+    Returns [(page_width, page_height, {path: (x, y)}), ...]. Images larger
+    than max_side get a page of their own.
+    """
+    remaining = sorted(images, key=lambda p: (-max(images[p]), -min(images[p]), p))
+    pages = []
+    while remaining:
+        area = sum(w * h for w, h in (images[p] for p in remaining))
+        biggest = max(max(images[p]) for p in remaining)
+        placed = None
+        for page_w, page_h in _candidate_sizes(area, max_side, min(biggest, max_side)):
+            packer = MaxRectsPacker(page_w, page_h, padding)
+            positions = {}
+            for path in remaining:
+                spot = packer.insert(*images[path])
+                if spot is None:
+                    break
+                positions[path] = spot
+            else:
+                placed = (page_w, page_h, positions)
+                break
+
+        if placed is None:
+            # Does not fit on one page: fill a max-size page and carry on
+            packer = MaxRectsPacker(max_side, max_side, padding)
+            positions = {}
+            for path in remaining:
+                spot = packer.insert(*images[path])
+                if spot is not None:
+                    positions[path] = spot
+            if not positions:
+                # Larger than max_side: its own page, scaled down by Unity
+                path = remaining[0]
+                positions = {path: (0, 0)}
+                placed = (*images[path], positions)
+            else:
+                placed = (max_side, max_side, positions)
+
+        pages.append(placed)
+        remaining = [p for p in remaining if p not in placed[2]]
+    return pages
+
+
+def collect_groups(resources_path, group_by):
+    """Return {group name: {key: image path}} from *Lessons_common.json."""
+    groups = defaultdict(dict)
+    for _name, _locale, key, value in iter_image_references(resources_path, "*Lessons_common.json"):
+        match = KEY_PATTERN.match(key)
+        if not match or not value.strip():
+            continue
+        group = match.group("lesson")
+        if group_by == "exercise":
+            group += "_" + match.group("exercise")
+        groups[group][key] = normalize_reference(value)
+    return dict(sorted(groups.items()))
+
+
+def build_atlases(resources_path, output_path, group_by="exercise", max_side=4096,
+                  padding=0, image_format="png", plan_only=False):
+    """Pack every group, write atlas images (unless plan_only) and return the sidecar."""
+    resources_path = Path(resources_path)
+    sizes = {}
+    missing = set()
+    atlases = {}
+    sprites = {}
+
+    for group, keys in collect_groups(resources_path, group_by).items():
+        images = {}
+        for path in set(keys.values()):
+            if path not in sizes and path not in missing:
+                try:
+                    size = image_size((resources_path / path).read_bytes())
+                except (OSError, ValueError):
+                    size = None
+                if size is None:
+                    missing.add(path)
+                else:
+                    sizes[path] = size
+            if path in sizes:
+                images[path] = sizes[path]
+        if not images:
+            continue
+
+        pages = []
+        locations = {}
+        for page_index, (page_w, page_h, positions) in enumerate(pack_group(images, max_side, padding)):
+            file_name = f"{group}_{page_index}.{image_format}"
+            pages.append({"file": file_name, "width": page_w, "height": page_h})
+            for path, (x, y) in positions.items():
+                locations[path] = (page_index, x, y, page_w, page_h)
+            if not plan_only:
+                _write_page(resources_path, output_path / file_name, page_w, page_h,
+                            positions, image_format)
+        atlases[group] = pages
+
+        for key, path in sorted(keys.items()):
+            if path not in locations:
+                continue
+            page_index, x, y, page_w, page_h = locations[path]
+            w, h = sizes[path]
+            sprites[key] = {
+                "atlas": group,
+                "page": page_index,
+                "rect": [x, y, w, h],
+                "uv": [round(x / page_w, 6), round(1 - (y + h) / page_h, 6),
+                       round((x + w) / page_w, 6), round(1 - y / page_h, 6)],
+            }
+
+    sidecar = {"version": SIDECAR_VERSION, "group_by": group_by,
+               "atlases": atlases, "sprites": sprites}
+    return sidecar, sorted(missing)
+
+
+def _write_page(resources_path, target, page_w, page_h, positions, image_format):
+    target.parent.mkdir(parents=True, exist_ok=True)
+    page = Image.new("RGBA" if image_format == "png" else "RGB", (page_w, page_h))
+    for path, (x, y) in positions.items():
+        with Image.open(resources_path / path) as img:
+            page.paste(img.convert(page.mode), (x, y))
+    if image_format == "png":
+        page.save(target, optimize=True)
+    else:
+        page.save(target, quality=95)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Pack slide images into per-exercise texture atlases')
+    parser.add_argument('--path', type=Path, default=RESOURCES_PATH,
+                        help='Resources folder')
+    parser.add_argument('--output', type=Path, default=OUTPUT_PATH,
+                        help='Folder for the atlas images and sidecar')
+    parser.add_argument('--group', choices=['exercise', 'lesson'], default='exercise',
+                        help='One atlas per exercise (default) or per lesson')
+    parser.add_argument('--max-size', type=int, default=4096,
+                        help='Maximum atlas side in pixels (default: 4096)')
+    parser.add_argument('--padding', type=int, default=0,
+                        help='Pixels between packed images (default: 0, see module docstring)')
+    parser.add_argument('--format', choices=['png', 'jpg'], default='png',
+                        help='Atlas image format (default: png, Unity recompresses on import)')
+    parser.add_argument('--plan-only', action='store_true',
+                        help='Only compute the layout and write the sidecar (no Pillow needed)')
+    args = parser.parse_args()
+
+    if not args.plan_only and Image is None:
+        print("Pillow is required to write atlas images (pip install pillow).")
+        print("Use --plan-only to compute the layout and sidecar without it.")
+        return 1
+
+    print("=" * 60)
+    print("Slide Atlas Build" + (" (plan only)" if args.plan_only else ""))
+    print("=" * 60)
+
+    sidecar, missing = build_atlases(args.path, args.output, args.group, args.max_size,
+                                     args.padding, args.format, args.plan_only)
+    args.output.mkdir(parents=True, exist_ok=True)
+    safe_json_dump(sidecar, args.output / SIDECAR_NAME)
+
+    pages = [page for group_pages in sidecar["atlases"].values() for page in group_pages]
+    placed = {(s["atlas"], s["page"], tuple(s["rect"])) for s in sidecar["sprites"].values()}
+    used = sum(rect[2] * rect[3] for _, _, rect in placed)
+    total = sum(p["width"] * p["height"] for p in pages)
+    print(f"Groups:  {len(sidecar['atlases'])} ({args.group})")
+    print(f"Pages:   {len(pages)}")
+    print(f"Sprites: {len(sidecar['sprites'])} keys")
+    if total:
+        print(f"Fill:    {used / total * 100:.1f}% of atlas area")
+    if missing:
+        print(f"\nSkipped {len(missing)} unreadable or missing images (see find_image_orphans.py)")
+    print(f"\nSidecar written to {args.output / SIDECAR_NAME}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,52 +4,50 @@ Check all JSON localization files for missing translations.
 Reports which keys are missing in which language codes.
 """
 
+import argparse
 import json
 import os
 from pathlib import Path
 from collections import defaultdict
 
-# Expected language codes based on pythonLessons.json
-EXPECTED_LANGUAGES = [
-    "en", "ja", "cs", "de", "nl", "da", "el", "fi", "fr", "it",
-    "ko", "no", "pl", "pt", "ro", "ru", "es", "sv", "tr"
-]
+from localization_layout import ALL_LANG_CODES
+from validation_cache import ValidationCache
+
+# Expected language codes (runtime locales plus uk/vi)
+EXPECTED_LANGUAGES = ALL_LANG_CODES
 
 # Base language to use as reference (English)
 BASE_LANG = "en"
 
-def check_json_file(filepath):
-    """Check a single JSON file for missing translations."""
-    print(f"\n{'='*60}")
-    print(f"Checking: {filepath.name}")
-    print(f"{'='*60}")
+# Bump when the checks below change so cached results are discarded
+CACHE_VERSION = 2
+
+def analyze_json_file(filepath):
+    """
+    Collect missing-translation data for a single JSON file.
 
+    Returns a result dict, or a dict with an "error" entry if the file
+    cannot be checked.
+    """
     try:
         with open(filepath, 'r', encoding='utf-8') as f:
             data = json.load(f)
     except json.JSONDecodeError as e:
-        print(f"  ERROR: Invalid JSON - {e}")
-        return None
+        return {"file": str(filepath.name), "error": f"Invalid JSON - {e}"}
     except FileNotFoundError:
-        print(f"  ERROR: File not found")
-        return None
+        return {"file": str(filepath.name), "error": "File not found"}
 
     # Get all language codes in the file
     file_languages = [k for k in data.keys() if isinstance(data.get(k), dict)]
-    print(f"  Languages found: {len(file_languages)}")
 
-    if BASE_LANG not in data:
-        print(f"  WARNING: Base language '{BASE_LANG}' not found!")
-        if "ja" in data:
-            print(f"  Using 'ja' as base instead")
-            base_lang = "ja"
-        else:
-            return None
-    else:
+    if BASE_LANG in data:
         base_lang = BASE_LANG
+    elif "ja" in data:
+        base_lang = "ja"
+    else:
+        return {"file": str(filepath.name), "languages": file_languages, "base_lang": None}
 
     base_keys = set(data[base_lang].keys())
-    print(f"  Total keys in '{base_lang}': {len(base_keys)}")
 
     missing_by_lang = {}
 
@@ -62,22 +60,62 @@ def check_json_file(filepath):
 
         if missing:
             missing_by_lang[lang] = sorted(list(missing))
-            print(f"  {lang}: Missing {len(missing)} keys")
 
     # Check for missing languages entirely
     missing_languages = set(EXPECTED_LANGUAGES) - set(file_languages)
-    if missing_languages:
-        print(f"  Missing language sections: {sorted(missing_languages)}")
 
     return {
         "file": str(filepath.name),
         "languages": file_languages,
+        "base_lang": base_lang,
         "base_key_count": len(base_keys),
         "missing_by_lang": missing_by_lang,
         "missing_languages": sorted(list(missing_languages))
     }
 
+def check_json_file(filepath, cache=None):
+    """Check a single JSON file for missing translations."""
+    print(f"\n{'='*60}")
+    print(f"Checking: {filepath.name}")
+    print(f"{'='*60}")
+
+    result = cache.lookup(filepath) if cache is not None else None
+    if result is None:
+        fingerprint = cache.fingerprint(filepath) if cache is not None else None
+        result = analyze_json_file(filepath)
+        if cache is not None:
+            cache.store(filepath, result, fingerprint)
+
+    if "error" in result:
+        print(f"  ERROR: {result['error']}")
+        return None
+
+    print(f"  Languages found: {len(result['languages'])}")
+
+    base_lang = result["base_lang"]
+    if base_lang != BASE_LANG:
+        print(f"  WARNING: Base language '{BASE_LANG}' not found!")
+        if base_lang is None:
+            return None
+        print(f"  Using '{base_lang}' as base instead")
+
+    print(f"  Total keys in '{base_lang}': {result['base_key_count']}")
+
+    for lang, missing in result["missing_by_lang"].items():
+        print(f"  {lang}: Missing {len(missing)} keys")
+
+    if result["missing_languages"]:
+        print(f"  Missing language sections: {result['missing_languages']}")
+
+    return result
+
 def main():
+    parser = argparse.ArgumentParser(description='Check localization files for missing translations')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Re-check every file, ignoring the validation cache')
+    args = parser.parse_args()
+
+    cache = ValidationCache("check_all_localization", CACHE_VERSION, enabled=not args.no_cache)
     resources_dir = Path(__file__).parent.parent / "Assets" / "Resources"
 
     json_files = list(resources_dir.glob("*.json"))
@@ -86,10 +124,12 @@ def main():
     results = []
 
     for json_file in sorted(json_files):
-        result = check_json_file(json_file)
+        result = check_json_file(json_file, cache)
         if result:
             results.append(result)
 
+    cache.save()
+
     # Summary
     print("\n" + "="*60)
     print("SUMMARY")
@@ -108,6 +148,7 @@ def main():
 
     print(f"\nTotal files with issues: {len(files_with_issues)}")
     print(f"Total missing key-language pairs: {total_missing}")
+    print(cache.summary())
 
     # Save detailed report
     report_path = Path(__file__).parent / "localization_report.json"
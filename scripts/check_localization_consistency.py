@@ -3,34 +3,38 @@ import json
 import os
 import re
 
+from localization_coverage import KeyIndex
+
 def check_localization(file_path):
     with open(file_path, 'r', encoding='utf-8') as f:
         data = json.load(f)
     
     languages = list(data.keys())
     master_lang = 'en' if 'en' in languages else languages[0]
-    master_keys = set(data[master_lang].keys())
+    index = KeyIndex()
+    columns = {lang: index.bitset(data[lang]) for lang in languages}
+    master_keys = columns[master_lang]
     
     print(f"File: {file_path}")
     print(f"Languages: {languages}")
-    print(f"Master keys count ({master_lang}): {len(master_keys)}")
+    print(f"Master keys count ({master_lang}): {master_keys.bit_count()}")
     
     missing_report = {}
     for lang in languages:
         if lang == master_lang:
             continue
         
-        current_keys = set(data[lang].keys())
-        missing = master_keys - current_keys
-        extra = current_keys - master_keys
+        current_keys = columns[lang]
+        missing = master_keys & ~current_keys
+        extra = current_keys & ~master_keys
         
         if missing or extra:
             missing_report[lang] = {
-                "missing_count": len(missing),
-                "extra_count": len(extra)
+                "missing_count": missing.bit_count(),
+                "extra_count": extra.bit_count()
             }
-            if len(missing) < 10:
-                missing_report[lang]["missing_keys"] = list(missing)
+            if missing.bit_count() < 10:
+                missing_report[lang]["missing_keys"] = index.members(missing)
                 
     if missing_report:
         print("Missing/Extra keys report:")
@@ -1,17 +1,41 @@
 #!/usr/bin/env python3
 """
 Check if the reference site lesson data matches the project's Japanese lesson data.
-Compares slide titles, slide content, and exercise code (correctCode, correctLines).
+Compares exercise titles, slide titles and slide content.
+
+Every compared value is reduced to a content hash first (titles stripped,
+slide content with whitespace runs collapsed to one space, as before), so
+matching values cost one dict lookup. Only mismatches get the full texts
+and a character-level diff (difflib opcodes on the normalized texts).
+
+Hashes are cached per file in .validation_cache/ (validation_cache.py):
+unchanged .ts files are not even parsed again unless one of their values
+differs from the project.
+
+Every difference is written as one JSON object per line (--output,
+default scripts/check_results.jsonl), followed by one "summary" line per
+language; the console shows the usual report with a few samples.
+
+Usage:
+    python check_reference_match.py [--language python] [--output results.jsonl]
 """
 
+import argparse
+import difflib
+import hashlib
 import json
-import re
-import os
+import sys
+import time
 from pathlib import Path
 
+from lesson_index import parse_key
+from ts_lesson_parser import load_ts_data
+from validation_cache import ValidationCache
+
 # Paths
 SENKOU_CODE_PATH = Path(r"C:\Work\git\senkou-code\data\lessons")
 PROJECT_RESOURCES_PATH = Path(r"C:\Work\MetaXR\ProgramShooting\Assets\Resources")
+OUTPUT_PATH = Path(__file__).parent / "check_results.jsonl"
 
 # All 20 programming languages
 LANGUAGES = [
@@ -20,48 +44,33 @@ LANGUAGES = [
     "lua", "perl", "haskell", "elixir", "assembly"
 ]
 
+# Bump when normalization or the extracted keys change
+CACHE_VERSION = 1
+
+# Difference types and the labels used in the matches list
+KIND_LABELS = {
+    'title': "Title",
+    'slide_title': "Slide title",
+    'slide_content': "Slide content",
+}
+
 def parse_ts_file(file_path):
-    """Parse TypeScript file and extract JSON data."""
-    if not file_path.exists():
-        return None
+    """Parse TypeScript file and extract lesson data."""
+    return load_ts_data(file_path)
 
-    with open(file_path, 'r', encoding='utf-8') as f:
-        content = f.read()
-
-    # Remove export statement and extract JSON
-    # Pattern: export const varName = { ... }
-    match = re.search(r'export\s+const\s+\w+\s*=\s*(\{[\s\S]*\})\s*;?\s*$', content)
-    if match:
-        json_str = match.group(1)
-        try:
-            # Try parsing as JSON
-            return json.loads(json_str)
-        except json.JSONDecodeError:
-            # Try to fix common issues
-            # Remove trailing commas before } or ]
-            json_str = re.sub(r',(\s*[}\]])', r'\1', json_str)
-            try:
-                return json.loads(json_str)
-            except:
-                pass
-    return None
+def reference_files(language, source_path=None):
+    """Return the TypeScript lesson files of a language (python.ts, python2.ts, ...)."""
+    source_path = Path(source_path or SENKOU_CODE_PATH)
+    files_to_check = [f"{language}.ts"] + [f"{language}{i}.ts" for i in range(2, 10)]
+    return [source_path / name for name in files_to_check if (source_path / name).exists()]
 
 def load_all_ts_files_for_language(language):
     """Load all TypeScript lesson files for a language (e.g., python.ts, python2.ts, etc.)."""
     all_data = []
-
-    # Check main file and numbered files
-    files_to_check = [f"{language}.ts"]
-    for i in range(2, 10):
-        files_to_check.append(f"{language}{i}.ts")
-
-    for filename in files_to_check:
-        file_path = SENKOU_CODE_PATH / filename
-        if file_path.exists():
-            data = parse_ts_file(file_path)
-            if data:
-                all_data.append(data)
-
+    for file_path in reference_files(language):
+        data = parse_ts_file(file_path)
+        if data:
+            all_data.append(data)
     return all_data
 
 def load_project_ja_file(language):
@@ -73,6 +82,86 @@ def load_project_ja_file(language):
     with open(file_path, 'r', encoding='utf-8') as f:
         return json.load(f)
 
+def normalize_value(key, text):
+    """Slide content: collapse whitespace runs. Everything else: strip."""
+    if parse_key(key)[4] == 'content':
+        return ' '.join(text.split())
+    return text.strip()
+
+def content_hash(key, text):
+    """Hash of the normalized value, as used for the hash-first comparison."""
+    return hashlib.blake2b(normalize_value(key, text).encode('utf-8'), digest_size=12).hexdigest()
+
+def reference_entries(lesson, language):
+    """
+    Return [(kind, key, text)] for one reference lesson, in exercise order.
+
+    Values that are empty in the reference are skipped, as they were never
+    compared.
+    """
+    # Extract lesson number from lessonId (e.g., "python-1" -> 1, "haskell-2" -> 2)
+    lesson_id = lesson.get('lessonId', '')
+    try:
+        lesson_idx = int(lesson_id.split('-')[-1])
+    except (ValueError, IndexError):
+        lesson_idx = 1  # Default to 1 if parsing fails
+
+    entries = []
+    for ex_idx, exercise in enumerate(lesson.get('exercises', []), 1):
+        prefix = f"{language}_lesson{lesson_idx}_ex{ex_idx}"
+        if exercise.get('title'):
+            entries.append(('title', f"{prefix}_title", exercise['title']))
+        for slide_idx, slide in enumerate(exercise.get('tutorialSlides', []), 1):
+            if slide.get('title'):
+                entries.append(('slide_title', f"{prefix}_slide{slide_idx}_title", slide['title']))
+            if slide.get('content'):
+                entries.append(('slide_content', f"{prefix}_slide{slide_idx}_content", slide['content']))
+    return entries
+
+def project_hashes(project_ja):
+    """Return {key: content hash} for the non-empty values of a project file."""
+    return {key: content_hash(key, value) for key, value in project_ja.items()
+            if isinstance(value, str) and value}
+
+def char_diff(ref_text, project_text):
+    """
+    Character-level diff of two normalized texts.
+
+    Returns difflib opcodes without the 'equal' runs, each extended with
+    the reference and project text of the changed range.
+    """
+    matcher = difflib.SequenceMatcher(None, ref_text, project_text, autojunk=False)
+    return [[tag, i1, i2, j1, j2, ref_text[i1:i2], project_text[j1:j2]]
+            for tag, i1, i2, j1, j2 in matcher.get_opcodes() if tag != 'equal']
+
+def make_difference(kind, key, ref_text, project_text):
+    """Build the difference record for a value whose hashes differ."""
+    if not project_text:
+        return {'type': f"missing_{kind}", 'key': key, 'ref': ref_text, 'project': '(missing)'}
+    return {
+        'type': kind,
+        'key': key,
+        'ref': ref_text,
+        'project': project_text,
+        'diff': char_diff(normalize_value(key, ref_text), normalize_value(key, project_text)),
+    }
+
+def compare_entries(entries, hashes, ref_texts, project_ja):
+    """
+    Compare [(kind, key, hash)] against project hashes.
+
+    ref_texts and project_ja are callables returning the {key: text} dicts;
+    they are only called when a value differs.
+    """
+    differences = []
+    matches = []
+    for kind, key, ref_hash in entries:
+        if hashes.get(key) == ref_hash:
+            matches.append(f"{KIND_LABELS[kind]}: {key}")
+            continue
+        differences.append(make_difference(kind, key, ref_texts()[key], project_ja().get(key, '')))
+    return differences, matches
+
 def compare_exercises(ref_data, project_ja, language):
     """Compare exercises between reference and project data."""
     differences = []
@@ -81,101 +170,93 @@ def compare_exercises(ref_data, project_ja, language):
     if not ref_data or not project_ja:
         return differences, matches
 
+    hashes = project_hashes(project_ja)
     for lesson in ref_data:
-        # Extract lesson number from lessonId (e.g., "python-1" -> 1, "haskell-2" -> 2)
-        lesson_id = lesson.get('lessonId', '')
-        try:
-            lesson_idx = int(lesson_id.split('-')[-1])
-        except (ValueError, IndexError):
-            lesson_idx = 1  # Default to 1 if parsing fails
-
-        exercises = lesson.get('exercises', [])
-
-        for ex_idx, exercise in enumerate(exercises, 1):
-            ref_title = exercise.get('title', '')
-            ref_slides = exercise.get('tutorialSlides', [])
-            ref_correct_code = exercise.get('correctCode', '')
-            ref_correct_lines = exercise.get('correctLines', [])
-
-            # Find corresponding keys in project
-            # Key pattern: {language}_lesson{N}_ex{M}_title
-            title_key = f"{language}_lesson{lesson_idx}_ex{ex_idx}_title"
-            project_title = project_ja.get(title_key, '')
-
-            # Compare title
-            if ref_title and project_title:
-                if ref_title.strip() != project_title.strip():
-                    differences.append({
-                        'type': 'title',
-                        'key': title_key,
-                        'ref': ref_title,
-                        'project': project_title
-                    })
-                else:
-                    matches.append(f"Title: {title_key}")
-            elif ref_title and not project_title:
-                differences.append({
-                    'type': 'missing_title',
-                    'key': title_key,
-                    'ref': ref_title,
-                    'project': '(missing)'
-                })
-
-            # Compare slides
-            for slide_idx, slide in enumerate(ref_slides, 1):
-                ref_slide_title = slide.get('title', '')
-                ref_slide_content = slide.get('content', '')
-
-                slide_title_key = f"{language}_lesson{lesson_idx}_ex{ex_idx}_slide{slide_idx}_title"
-                slide_content_key = f"{language}_lesson{lesson_idx}_ex{ex_idx}_slide{slide_idx}_content"
-
-                project_slide_title = project_ja.get(slide_title_key, '')
-                project_slide_content = project_ja.get(slide_content_key, '')
-
-                # Compare slide title
-                if ref_slide_title and project_slide_title:
-                    if ref_slide_title.strip() != project_slide_title.strip():
-                        differences.append({
-                            'type': 'slide_title',
-                            'key': slide_title_key,
-                            'ref': ref_slide_title,
-                            'project': project_slide_title
-                        })
-                    else:
-                        matches.append(f"Slide title: {slide_title_key}")
-                elif ref_slide_title and not project_slide_title:
-                    differences.append({
-                        'type': 'missing_slide_title',
-                        'key': slide_title_key,
-                        'ref': ref_slide_title,
-                        'project': '(missing)'
-                    })
-
-                # Compare slide content (normalize whitespace)
-                if ref_slide_content and project_slide_content:
-                    ref_normalized = re.sub(r'\s+', ' ', ref_slide_content.strip())
-                    proj_normalized = re.sub(r'\s+', ' ', project_slide_content.strip())
-
-                    if ref_normalized != proj_normalized:
-                        differences.append({
-                            'type': 'slide_content',
-                            'key': slide_content_key,
-                            'ref': ref_slide_content[:100] + '...' if len(ref_slide_content) > 100 else ref_slide_content,
-                            'project': project_slide_content[:100] + '...' if len(project_slide_content) > 100 else project_slide_content
-                        })
-                    else:
-                        matches.append(f"Slide content: {slide_content_key}")
-                elif ref_slide_content and not project_slide_content:
-                    differences.append({
-                        'type': 'missing_slide_content',
-                        'key': slide_content_key,
-                        'ref': ref_slide_content[:100] + '...',
-                        'project': '(missing)'
-                    })
+        entries = reference_entries(lesson, language)
+        texts = {key: text for _, key, text in entries}
+        lesson_differences, lesson_matches = compare_entries(
+            [(kind, key, content_hash(key, text)) for kind, key, text in entries],
+            hashes, lambda: texts, lambda: project_ja)
+        differences.extend(lesson_differences)
+        matches.extend(lesson_matches)
 
     return differences, matches
 
+def _lazy(load):
+    value = []
+
+    def get():
+        if not value:
+            value.append(load())
+        return value[0]
+    return get
+
+def compare_language(language, cache, source_path=None, resources_path=None):
+    """
+    Compare one language using cached hashes.
+
+    Returns None if either side is missing, else a dict with
+    ref_lessons / ref_exercises / differences / matches.
+    """
+    ts_files = reference_files(language, source_path)
+    project_path = Path(resources_path or PROJECT_RESOURCES_PATH) / f"{language}Lessons_ja.json"
+    if not ts_files or not project_path.exists():
+        return None
+
+    def load_project():
+        with open(project_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    project_ja = _lazy(load_project)
+    hashes = cache.lookup(project_path)
+    if hashes is None:
+        fingerprint = cache.fingerprint(project_path)
+        hashes = project_hashes(project_ja())
+        cache.store(project_path, hashes, fingerprint)
+
+    result = {'ref_lessons': 0, 'ref_exercises': 0, 'differences': [], 'matches': []}
+    for ts_path in ts_files:
+        cached = cache.lookup(ts_path)
+        lesson = _lazy(lambda path=ts_path: parse_ts_file(path))
+        if cached is None:
+            fingerprint = cache.fingerprint(ts_path)
+            if not lesson():
+                continue
+            entries = reference_entries(lesson(), language)
+            cached = {
+                'exercises': len(lesson().get('exercises', [])),
+                'entries': [[kind, key, content_hash(key, text)] for kind, key, text in entries],
+            }
+            cache.store(ts_path, cached, fingerprint)
+
+        ref_texts = _lazy(lambda: {key: text for _, key, text in reference_entries(lesson(), language)})
+        differences, matches = compare_entries(cached['entries'], hashes, ref_texts, project_ja)
+        result['ref_lessons'] += 1
+        result['ref_exercises'] += cached['exercises']
+        result['differences'].extend(differences)
+        result['matches'].extend(matches)
+    return result
+
+def _sample(text):
+    return f"{text[:60]}..." if len(text) > 60 else text
+
 def main():
+    parser = argparse.ArgumentParser(description='Compare reference lesson data with the project Japanese files')
+    parser.add_argument('--reference', type=Path, default=SENKOU_CODE_PATH,
+                        help='senkou-code data/lessons folder')
+    parser.add_argument('--resources', type=Path, default=PROJECT_RESOURCES_PATH,
+                        help='Project Resources folder')
+    parser.add_argument('--language', action='append', choices=LANGUAGES,
+                        help='Only compare this language (repeatable)')
+    parser.add_argument('--output', type=Path, default=OUTPUT_PATH,
+                        help=f'JSONL file for the differences (default: {OUTPUT_PATH.name})')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Re-hash every file, ignoring the validation cache')
+    args = parser.parse_args()
+
+    cache = ValidationCache("check_reference_match", CACHE_VERSION, enabled=not args.no_cache)
+    start = time.perf_counter()
+
     print("=" * 80)
     print("参考元サイト vs プロジェクト日本語データ 比較レポート")
     print("=" * 80)
@@ -185,51 +266,54 @@ def main():
     total_matches = 0
     language_summaries = []
 
-    for language in LANGUAGES:
-        print(f"\n{'='*40}")
-        print(f"言語: {language.upper()}")
-        print(f"{'='*40}")
-
-        # Load reference data
-        ref_data = load_all_ts_files_for_language(language)
-        if not ref_data:
-            print(f"  [WARNING] 参考元ファイルが見つかりません: {language}")
-            continue
-
-        # Load project Japanese data
-        project_ja = load_project_ja_file(language)
-        if not project_ja:
-            print(f"  [WARNING] プロジェクトJAファイルが見つかりません: {language}Lessons_ja.json")
-            continue
-
-        # Compare
-        differences, matches = compare_exercises(ref_data, project_ja, language)
-
-        total_differences += len(differences)
-        total_matches += len(matches)
-
-        # Summary
-        summary = {
-            'language': language,
-            'ref_lessons': len(ref_data),
-            'ref_exercises': sum(len(l.get('exercises', [])) for l in ref_data),
-            'differences': len(differences),
-            'matches': len(matches)
-        }
-        language_summaries.append(summary)
-
-        print(f"  参考元レッスン数: {summary['ref_lessons']}")
-        print(f"  参考元演習数: {summary['ref_exercises']}")
-        print(f"  一致: {len(matches)} 件")
-        print(f"  差異: {len(differences)} 件")
-
-        # Show first few differences
-        if differences:
-            print(f"\n  【差異サンプル (最大5件)】")
-            for i, diff in enumerate(differences[:5]):
-                print(f"  {i+1}. [{diff['type']}] {diff['key']}")
-                print(f"     参考元: {diff['ref'][:60]}..." if len(diff['ref']) > 60 else f"     参考元: {diff['ref']}")
-                print(f"     プロジェクト: {diff['project'][:60]}..." if len(diff['project']) > 60 else f"     プロジェクト: {diff['project']}")
+    with open(args.output, 'w', encoding='utf-8', newline='\n') as out:
+        for language in args.language or LANGUAGES:
+            print(f"\n{'='*40}")
+            print(f"言語: {language.upper()}")
+            print(f"{'='*40}")
+
+            if not reference_files(language, args.reference):
+                print(f"  [WARNING] 参考元ファイルが見つかりません: {language}")
+                continue
+
+            result = compare_language(language, cache, args.reference, args.resources)
+            if result is None:
+                print(f"  [WARNING] プロジェクトJAファイルが見つかりません: {language}Lessons_ja.json")
+                continue
+
+            differences = result['differences']
+            matches = result['matches']
+            total_differences += len(differences)
+            total_matches += len(matches)
+
+            # Summary
+            summary = {
+                'language': language,
+                'ref_lessons': result['ref_lessons'],
+                'ref_exercises': result['ref_exercises'],
+                'differences': len(differences),
+                'matches': len(matches)
+            }
+            language_summaries.append(summary)
+
+            for diff in differences:
+                out.write(json.dumps({'language': language, **diff}, ensure_ascii=False) + '\n')
+            out.write(json.dumps({'type': 'summary', **summary}, ensure_ascii=False) + '\n')
+
+            print(f"  参考元レッスン数: {summary['ref_lessons']}")
+            print(f"  参考元演習数: {summary['ref_exercises']}")
+            print(f"  一致: {len(matches)} 件")
+            print(f"  差異: {len(differences)} 件")
+
+            # Show first few differences
+            if differences:
+                print(f"\n  【差異サンプル (最大5件)】")
+                for i, diff in enumerate(differences[:5]):
+                    print(f"  {i+1}. [{diff['type']}] {diff['key']}")
+                    print(f"     参考元: {_sample(diff['ref'])}")
+                    print(f"     プロジェクト: {_sample(diff['project'])}")
+
+    cache.save()
 
     # Overall summary
     print("\n")
@@ -247,26 +331,20 @@ def main():
     for s in language_summaries:
         print(f"{s['language']:<15} {s['ref_lessons']:<10} {s['ref_exercises']:<8} {s['matches']:<8} {s['differences']:<8}")
     print("-" * 60)
+    print(cache.summary())
+    print(f"Elapsed: {time.perf_counter() - start:.2f}s")
+    print(f"Differences written to: {args.output}")
 
     # Determine overall status
     if total_differences == 0:
         print("\n結果: 全て一致しています")
+        return 0
     else:
         print(f"\n結果: {total_differences} 件の差異があります")
         print("注意: 差異がある場合、参考元サイトからデータを同期する必要があるかもしれません。")
+        return 1
 
 if __name__ == "__main__":
-    import sys
     import io
     sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
-
-    # Also write to file for better readability
-    output_file = Path(r"C:\Work\MetaXR\ProgramShooting\scripts\check_results.txt")
-    with open(output_file, 'w', encoding='utf-8') as f:
-        # Redirect output to file
-        old_stdout = sys.stdout
-        sys.stdout = f
-        main()
-        sys.stdout = old_stdout
-
-    print(f"Results written to: {output_file}")
+    sys.exit(main())
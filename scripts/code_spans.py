@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Shared tokenizer for code spans in lesson text.
+
+Slide contents mix prose with ``` fenced blocks and `inline code`. Language
+detection and "does this still need translating?" checks should only look
+at the prose: Japanese comments inside a code block are kept verbatim by
+the translators, so counting them makes an already translated value look
+untranslated forever, and long code blocks dilute the script ratios.
+
+One precompiled regex finds fences (an unterminated fence runs to the end
+of the text) and inline spans in a single scan. strip_code() results are
+memoized per value (keyed by the string's hash), so the mismatch report,
+the translation-needed checks and the post-translation verification reuse
+each other's work when they run in one process.
+
+The translators use the same scan to keep code away from the backend:
+protect_code() swaps every span for a short numbered placeholder, and
+restore_code() puts them back in one pass over the translation and then
+checks that the code spans of the result are byte-for-byte the original
+ones. Values that are only code never need to be sent at all.
+"""
+
+import re
+from functools import lru_cache
+
+CODE_SPAN_RE = re.compile(r'```.*?(?:```|\Z)|``[^`]+``|`[^`\n]+`', re.DOTALL)
+
+JAPANESE_RE = re.compile(r'[\u3040-\u309f\u30a0-\u30ff\u4e00-\u9fff]')
+
+# Placeholders sent in place of fenced blocks and inline code. Backends
+# sometimes add spaces or change case, so restoring accepts both.
+BLOCK_PLACEHOLDER = "CODEBLOCK{}ENDBLOCK"
+INLINE_PLACEHOLDER = "INLINECODE{}ENDINLINE"
+PLACEHOLDER_RE = re.compile(r'(?:CODEBLOCK\s*(\d+)\s*ENDBLOCK|INLINECODE\s*(\d+)\s*ENDINLINE)',
+                            re.IGNORECASE)
+
+
+class CodeSpanError(ValueError):
+    """Raised when a translation lost, duplicated or changed a code span."""
+
+
+def iter_code_spans(text):
+    """Yield (start, end) of every code span in text."""
+    for match in CODE_SPAN_RE.finditer(text):
+        yield match.span()
+
+
+@lru_cache(maxsize=65536)
+def strip_code(text):
+    """Return text with code spans replaced by a single space each."""
+    if '`' not in text:
+        return text
+    return CODE_SPAN_RE.sub(' ', text)
+
+
+def prose_only(text):
+    """strip_code() that also accepts None and non-strings (returns '')."""
+    if not isinstance(text, str):
+        return ''
+    return strip_code(text)
+
+
+def has_japanese(text, ignore_code=True):
+    """Check if text contains Japanese characters, outside code by default."""
+    if not isinstance(text, str) or not text:
+        return False
+    if ignore_code:
+        text = strip_code(text)
+    return bool(JAPANESE_RE.search(text))
+
+
+def code_spans(text):
+    """Return the code spans of text, in order."""
+    return CODE_SPAN_RE.findall(text)
+
+
+def protect_code(text):
+    """
+    Replace every code span by a numbered placeholder.
+
+    Returns (masked_text, spans); spans[n] is the code behind placeholder n.
+    """
+    spans = []
+
+    def save(match):
+        code = match.group(0)
+        placeholder = BLOCK_PLACEHOLDER if code.startswith('```') else INLINE_PLACEHOLDER
+        spans.append(code)
+        return placeholder.format(len(spans) - 1)
+
+    if '`' not in text:
+        return text, spans
+    return CODE_SPAN_RE.sub(save, text), spans
+
+
+def is_code_only(masked_text):
+    """True if a protected text has nothing left to translate."""
+    return not PLACEHOLDER_RE.sub('', masked_text).strip()
+
+
+def restore_code(translated, spans):
+    """
+    Put the code spans back into a translated masked text.
+
+    Raises CodeSpanError if a placeholder is missing, repeated or unknown,
+    or if the code spans of the result differ from the original ones.
+    """
+    if not spans:
+        if PLACEHOLDER_RE.search(translated):
+            raise CodeSpanError("unexpected code placeholder in translation")
+        return translated
+
+    used = [False] * len(spans)
+
+    def load(match):
+        index = int(match.group(1) or match.group(2))
+        if index >= len(spans) or used[index]:
+            raise CodeSpanError(f"unknown or repeated code placeholder {index}")
+        used[index] = True
+        return spans[index]
+
+    restored = PLACEHOLDER_RE.sub(load, translated)
+    if not all(used):
+        missing = [i for i, seen in enumerate(used) if not seen]
+        raise CodeSpanError(f"code placeholders missing from translation: {missing}")
+    if code_spans(restored) != spans:
+        raise CodeSpanError("code spans changed in translation")
+    return restored
+
+
+def cache_info():
+    """Hit/miss statistics of the strip_code cache."""
+    return strip_code.cache_info()
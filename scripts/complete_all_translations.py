@@ -1,21 +1,18 @@
 #!/usr/bin/env python3
 """
-Complete translation script using Google Translate API (googletrans library).
+Complete translation script using Google Translate (translation_backends, default: google).
 Translates all missing keys from English to all required languages.
 """
 
 import json
 import os
-import time
 from pathlib import Path
 from typing import Dict, Any
 
-try:
-    from googletrans import Translator
-    HAS_GOOGLETRANS = True
-except ImportError:
-    HAS_GOOGLETRANS = False
-    print("WARNING: googletrans not installed. Install with: pip install googletrans==4.0.0-rc1")
+from json_utils import safe_json_dump
+from translation_memory import get_memory
+from translation_backends import get_backend
+from translation_scheduler import run_concurrently
 
 # Target languages with their codes
 TARGET_LANGUAGES = {
@@ -44,30 +41,24 @@ TARGET_LANGUAGES = {
     "vi": "Vietnamese"
 }
 
-# Map for googletrans codes
-LANG_CODE_MAP = {
-    "zh-Hans": "zh-cn",
-    "zh-Hant": "zh-tw",
-    "no": "no"  # Norwegian
-}
-
 def get_translator():
-    if HAS_GOOGLETRANS:
-        return Translator()
-    return None
+    return get_backend(default='google')
 
 def translate_text(translator, text: str, dest_lang: str, src_lang: str = "en") -> str:
     """Translate text using Google Translate."""
     if not translator:
         return text  # Return original if no translator
     
-    # Map language codes
-    dest = LANG_CODE_MAP.get(dest_lang, dest_lang)
-    
+    memory = get_memory()
+    cached = memory.get(text, src_lang, dest_lang, translator.name)
+    if cached is not None:
+        return cached
+
     try:
-        result = translator.translate(text, dest=dest, src=src_lang)
-        time.sleep(0.1)  # Rate limiting
-        return result.text
+        # Language codes, pacing and retries are handled by the async backend
+        result = translator.translate(text, src_lang, dest_lang)
+        memory.put(text, src_lang, dest_lang, translator.name, result)
+        return result
     except Exception as e:
         print(f"    Translation error for {dest_lang}: {e}")
         return text  # Return original on error
@@ -83,8 +74,7 @@ def load_json(filepath: Path) -> Dict[str, Any]:
 
 def save_json(filepath: Path, data: Dict[str, Any]):
     """Save JSON file."""
-    with open(filepath, 'w', encoding='utf-8', newline='\n') as f:
-        json.dump(data, f, indent=4, ensure_ascii=False)
+    safe_json_dump(data, filepath, indent=4, newline='\n')
 
 def process_file(filepath: Path, translator):
     """Process a single JSON file to complete translations."""
@@ -130,22 +120,31 @@ def process_file(filepath: Path, translator):
         
         if missing_keys:
             print(f"  Translating {len(missing_keys)} keys to {lang}...")
-            
-            for i, key in enumerate(sorted(missing_keys)):
+
+            def translate_key(key):
                 base_value = data[base_lang][key]
-                
+
                 # Don't translate certain content types
                 if "_image" in key or key.endswith("_code"):
-                    translated = base_value
-                else:
-                    translated = translate_text(translator, base_value, lang, base_lang)
-                
-                data[lang][key] = translated
-                modified = True
-                
-                if (i + 1) % 50 == 0:
-                    print(f"    Translated {i + 1}/{len(missing_keys)} keys")
-            
+                    return base_value
+                return translate_text(translator, base_value, lang, base_lang)
+
+            results = {}
+
+            def on_result(key, translated):
+                results[key] = data[base_lang][key] if isinstance(translated, Exception) else translated
+                if len(results) % 50 == 0:
+                    print(f"    Translated {len(results)}/{len(missing_keys)} keys")
+
+            # Requests run concurrently; the backend bounds how many are in flight
+            keys = sorted(missing_keys)
+            run_concurrently(keys, translate_key,
+                             max_concurrency=translator.max_in_flight if translator else 1,
+                             on_result=on_result)
+            for key in keys:
+                data[lang][key] = results[key]
+            modified = True
+
             print(f"    Completed {len(missing_keys)} translations for {lang}")
     
     if modified:
@@ -198,6 +197,7 @@ def main():
     
     print("\n" + "="*60)
     print("Translation complete!")
+    print(get_memory().summary())
     print("="*60)
 
 if __name__ == "__main__":
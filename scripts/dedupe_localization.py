@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+"""
+Find duplicated localization values and move shared ones into `_common`.
+
+Many values are repeated across the Resources JSON files: code-only slide
+contents, fenced code blocks, image paths and untranslated placeholders.
+This script reports how much of the data is duplicated and rewrites the
+lesson files where that can be done without changing what the game sees:
+
+- promote: a key with the same value in every locale's `<base>_<locale>`
+  file moves into `<base>_common.json`
+- redundant: a locale copy equal to the value already in `_common` is
+  dropped (the common value applies anyway)
+
+Before anything is written, the merge LocalizationManager performs at
+startup (localization_layout.load_merged_locales) is run on the old and
+the new files and the effective dictionaries must be identical.
+
+With --fill-missing, keys are also promoted when some locales have no
+file for that course at all; those locales gain the shared value (today
+they show the raw key). The equivalence check then allows exactly those
+additions.
+
+Usage:
+    python dedupe_localization.py              # report only
+    python dedupe_localization.py --apply      # rewrite the files
+"""
+
+import argparse
+import json
+import sys
+from collections import defaultdict
+from pathlib import Path
+
+from json_utils import safe_json_dump
+from localization_layout import (BASE_FILE, LANG_CODES, LESSON_BASES, RESOURCES_PATH,
+                                 load_merged_locales)
+
+
+def _load(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _serialized_size(data):
+    # Lesson files are written with indent=2, see safe_json_dump
+    return len(json.dumps(data, ensure_ascii=False, indent=2).encode('utf-8'))
+
+
+def duplicate_report(resources_path):
+    """
+    Count repeated string values across every JSON file in Resources.
+
+    Returns (distinct values, values seen more than once, bytes spent on
+    the repeats, [(value, count), ...] most repeated first).
+    """
+    counts = defaultdict(int)
+    for path in sorted(Path(resources_path).glob("*.json")):
+        try:
+            data = _load(path)
+        except (OSError, ValueError):
+            continue
+        stack = [data]
+        while stack:
+            node = stack.pop()
+            if isinstance(node, dict):
+                stack.extend(node.values())
+            elif isinstance(node, list):
+                stack.extend(node)
+            elif isinstance(node, str):
+                counts[node] += 1
+
+    repeated = {value: n for value, n in counts.items() if n > 1}
+    wasted = sum((n - 1) * len(value.encode('utf-8')) for value, n in repeated.items())
+    top = sorted(repeated.items(), key=lambda item: (item[1] - 1) * len(item[0].encode('utf-8')),
+                 reverse=True)
+    return len(counts), len(repeated), wasted, top
+
+
+def plan_base(resources_path, base, runtime_locales, fill_missing=False):
+    """
+    Work out the rewrite for one lesson base.
+
+    Returns (files, promoted, redundant, filled) where files maps file
+    names to their rewritten data (only files that change), promoted and
+    redundant count moved/dropped locale entries, and filled maps locales
+    without a file to the set of keys they gain.
+    """
+    resources_path = Path(resources_path)
+    common_name = f"{base}_common.json"
+    common_path = resources_path / common_name
+    common = _load(common_path) if common_path.exists() else {}
+
+    locale_files = {}
+    for locale in LANG_CODES:
+        path = resources_path / f"{base}_{locale}.json"
+        if path.exists() and locale in runtime_locales:
+            locale_files[locale] = _load(path)
+    if not locale_files:
+        return {}, 0, 0, {}
+
+    missing = [l for l in runtime_locales if l not in locale_files]
+    if missing and not fill_missing:
+        shared_keys = set()
+    else:
+        shared_keys = set.intersection(*(set(d) for d in locale_files.values()))
+
+    new_common = dict(common)
+    new_locales = {locale: dict(data) for locale, data in locale_files.items()}
+    promoted = redundant = 0
+
+    for key in sorted(shared_keys):
+        values = {data[key] for data in locale_files.values()}
+        if len(values) != 1:
+            continue
+        new_common[key] = values.pop()
+        for data in new_locales.values():
+            del data[key]
+            promoted += 1
+
+    for data in new_locales.values():
+        for key in [k for k, v in data.items() if k in common and common[k] == v]:
+            del data[key]
+            redundant += 1
+
+    files = {}
+    if new_common != common:
+        files[common_name] = new_common
+    for locale, data in new_locales.items():
+        if data != locale_files[locale]:
+            files[f"{base}_{locale}.json"] = data
+
+    added = new_common.keys() - common.keys()
+    filled = {locale: set(added) for locale in missing} if added else {}
+    return files, promoted, redundant, filled
+
+
+def check_equivalence(before, after, allowed_additions=None):
+    """
+    Compare two merged {locale: {key: text}} results.
+
+    allowed_additions maps locales to keys they may gain. Returns a list
+    of differences that are not allowed (empty when equivalent).
+    """
+    allowed_additions = allowed_additions or {}
+    problems = []
+    for locale in sorted(before.keys() | after.keys()):
+        old = before.get(locale, {})
+        new = after.get(locale, {})
+        removed = old.keys() - new.keys()
+        added = new.keys() - old.keys() - allowed_additions.get(locale, set())
+        changed = [k for k in old.keys() & new.keys() if old[k] != new[k]]
+        if removed:
+            problems.append(f"{locale}: {len(removed)} keys lost (e.g. {sorted(removed)[0]})")
+        if added:
+            problems.append(f"{locale}: {len(added)} keys gained (e.g. {sorted(added)[0]})")
+        if changed:
+            problems.append(f"{locale}: {len(changed)} values changed (e.g. {sorted(changed)[0]})")
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Deduplicate localization values into _common files')
+    parser.add_argument('--path', type=Path, default=RESOURCES_PATH,
+                        help='Resources folder with the localization JSON files')
+    parser.add_argument('--apply', action='store_true',
+                        help='Write the rewritten files (default: report only)')
+    parser.add_argument('--fill-missing', action='store_true',
+                        help='Also promote keys when a locale has no file for the course')
+    parser.add_argument('--top', type=int, default=10,
+                        help='Number of most duplicated values to list (default: 10)')
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("Localization Deduplication")
+    print("=" * 60)
+
+    distinct, repeated, wasted, top = duplicate_report(args.path)
+    print(f"\nDistinct string values: {distinct}")
+    print(f"Values repeated:        {repeated}")
+    print(f"Bytes in repeats:       {wasted / 1024:.0f} KB")
+    if top and args.top:
+        print("\nMost duplicated values (by bytes):")
+        for value, count in top[:args.top]:
+            preview = value.replace('\n', '\\n')
+            if len(preview) > 50:
+                preview = preview[:47] + "..."
+            print(f"  {count:>6}x  {preview}")
+
+    base_data = _load(args.path / BASE_FILE)
+    runtime_locales = list(base_data)
+
+    overrides = {}
+    allowed = defaultdict(set)
+    total_promoted = total_redundant = 0
+    print(f"\n{'Course':<20} {'Promoted':>9} {'Redundant':>10}  Filled")
+    for base in LESSON_BASES:
+        files, promoted, redundant, filled = plan_base(
+            args.path, base, runtime_locales, args.fill_missing)
+        if not files:
+            continue
+        overrides.update(files)
+        total_promoted += promoted
+        total_redundant += redundant
+        for locale, keys in filled.items():
+            allowed[locale] |= keys
+        filled_text = ", ".join(f"{l}+{len(k)}" for l, k in filled.items()) or "-"
+        print(f"{base:<20} {promoted:>9} {redundant:>10}  {filled_text}")
+
+    if not overrides:
+        print("\nNothing to deduplicate without changing the effective text.")
+        if not args.fill_missing:
+            print("(Use --fill-missing to also promote keys for courses missing a locale file.)")
+        return 0
+
+    before_bytes = sum((args.path / name).stat().st_size
+                       for name in overrides if (args.path / name).exists())
+    after_bytes = sum(_serialized_size(data) for data in overrides.values())
+    print(f"\nEntries moved to _common: {total_promoted}")
+    print(f"Redundant entries dropped: {total_redundant}")
+    print(f"Files rewritten: {len(overrides)}")
+    print(f"Bytes saved: {(before_bytes - after_bytes) / 1024:.1f} KB "
+          f"({before_bytes} -> {after_bytes})")
+
+    print("\nChecking LocalizationManager merge equivalence...")
+    before = load_merged_locales(args.path)
+    after = load_merged_locales(args.path, overrides=overrides)
+    problems = check_equivalence(before, after, allowed)
+    if problems:
+        print("[NG] Rewrite would change the effective text:")
+        for problem in problems:
+            print(f"  - {problem}")
+        return 1
+    print("[OK] Effective dictionaries are identical"
+          + (" (apart from filled missing locales)" if allowed else ""))
+
+    if args.apply:
+        for name, data in overrides.items():
+            safe_json_dump(data, args.path / name)
+        print(f"\nWrote {len(overrides)} files")
+    else:
+        print("\nDry run - use --apply to write the files")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
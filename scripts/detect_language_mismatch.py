@@ -2,184 +2,290 @@
 """
 Detect language mismatches in lesson JSON files.
 Identifies values that don't match their language section.
+
+Reads the per-locale `<lang>Lessons_<locale>.json` files (and
+localizedText.json). Every value is classified by a single pass over its
+code points: the text is mapped through a precomputed table that turns
+each BMP code point into a one-letter Unicode block bucket (kana, CJK,
+Hangul, Cyrillic, Greek, Latin, ...), and the buckets are counted. All
+values of a file are bucketed with one str.translate call on the joined
+text, instead of one regex scan per script per value.
+
+Fenced and inline code is stripped first (code_spans.strip_code), so code
+blocks do not dilute the ratios; values that are only code are reported
+as 'code'. Use --include-code to classify the raw values.
+
+Per locale the report gives:
+- mismatched: text in a script the locale does not use (Japanese in the
+  German file, Hangul in the Japanese file, ...)
+- untranslated: for non-Latin locales, values with only Latin text; for
+  Latin locales, values identical to the course's English file (when the
+  course has one)
+
+Usage:
+    python detect_language_mismatch.py [--locale ja] [--json report.json]
 """
 
+import argparse
 import json
-import re
-import os
+import sys
+import time
+from collections import Counter, defaultdict
 from pathlib import Path
-from collections import defaultdict
-
-# Character ranges for language detection
-JAPANESE_PATTERN = re.compile(r'[\u3040-\u309F\u30A0-\u30FF\u4E00-\u9FAF]')
-KOREAN_PATTERN = re.compile(r'[\uAC00-\uD7AF\u1100-\u11FF]')
-CHINESE_PATTERN = re.compile(r'[\u4E00-\u9FFF]')
-CYRILLIC_PATTERN = re.compile(r'[\u0400-\u04FF]')
-ARABIC_PATTERN = re.compile(r'[\u0600-\u06FF]')
-THAI_PATTERN = re.compile(r'[\u0E00-\u0E7F]')
-GREEK_PATTERN = re.compile(r'[\u0370-\u03FF]')
-HEBREW_PATTERN = re.compile(r'[\u0590-\u05FF]')
-LATIN_EXTENDED_PATTERN = re.compile(r'[\u00C0-\u024F]')  # Accented Latin chars
-
-def detect_language(text):
-    """Detect the primary language of a text."""
-    if not text or len(text.strip()) == 0:
-        return 'empty'
 
-    # Skip if mostly code
-    code_indicators = ['std::', '#include', 'int ', 'void ', 'return ', '();', '{}', '[]']
-    if any(ind in text for ind in code_indicators):
-        # Still check for non-ASCII in non-code parts
-        pass
-
-    ja_count = len(JAPANESE_PATTERN.findall(text))
-    ko_count = len(KOREAN_PATTERN.findall(text))
-    cyrillic_count = len(CYRILLIC_PATTERN.findall(text))
-    thai_count = len(THAI_PATTERN.findall(text))
-    greek_count = len(GREEK_PATTERN.findall(text))
-    latin_ext_count = len(LATIN_EXTENDED_PATTERN.findall(text))
-
-    total_chars = len(text)
-
-    # Determine primary language based on character counts
-    if ja_count > 5 or (ja_count > 0 and ja_count / total_chars > 0.1):
-        return 'ja'
-    if ko_count > 5 or (ko_count > 0 and ko_count / total_chars > 0.1):
+from code_spans import strip_code
+from localization_layout import BASE_FILE, LESSON_BASES, RESOURCES_PATH
+
+# Unicode blocks -> bucket letter. Later ranges win where they overlap.
+SCRIPT_BLOCKS = [
+    ('a', 0x0041, 0x005A), ('a', 0x0061, 0x007A),   # ASCII letters
+    ('x', 0x00C0, 0x024F),                           # Latin-1 / Latin Extended
+    ('x', 0x1E00, 0x1EFF),                           # Latin Extended Additional
+    ('g', 0x0370, 0x03FF), ('g', 0x1F00, 0x1FFF),   # Greek
+    ('y', 0x0400, 0x052F),                           # Cyrillic
+    ('e', 0x0590, 0x05FF),                           # Hebrew
+    ('r', 0x0600, 0x06FF),                           # Arabic
+    ('t', 0x0E00, 0x0E7F),                           # Thai
+    ('k', 0x1100, 0x11FF), ('k', 0x3130, 0x318F),   # Hangul Jamo
+    ('k', 0xAC00, 0xD7AF),                           # Hangul syllables
+    ('h', 0x3040, 0x30FF), ('h', 0xFF66, 0xFF9F),   # Hiragana, Katakana
+    ('c', 0x3400, 0x4DBF), ('c', 0x4E00, 0x9FFF),   # CJK ideographs
+]
+OTHER_BUCKET = '.'
+SEPARATOR = '\0'
+
+
+def _build_bucket_table():
+    table = [OTHER_BUCKET] * 0x10000
+    for bucket, start, end in SCRIPT_BLOCKS:
+        for code in range(start, end + 1):
+            table[code] = bucket
+    table[ord(SEPARATOR)] = SEPARATOR
+    return table
+
+
+# str.translate leaves code points outside the table (non-BMP) unchanged
+_BUCKET_TABLE = _build_bucket_table()
+
+# Scripts each locale is written in; anything else is a mismatch.
+# Locales not listed use Latin script ('en').
+LOCALE_SCRIPTS = {
+    'ja': {'ja', 'zh'},
+    'zh-Hans': {'zh', 'ja'},
+    'zh-Hant': {'zh', 'ja'},
+    'ko': {'ko'},
+    'ru': {'ru'},
+    'uk': {'ru'},
+    'el': {'el'},
+}
+
+
+def script_histograms(values):
+    """Return a Counter of bucket letters for each value, in one translate pass."""
+    joined = SEPARATOR.join(v.replace(SEPARATOR, ' ') for v in values)
+    return [Counter(part) for part in joined.translate(_BUCKET_TABLE).split(SEPARATOR)]
+
+
+def classify(histogram, length):
+    """
+    Map a bucket histogram to a language code.
+
+    'ja' (kana, or kana plus kanji), 'zh' (ideographs without kana), 'ko',
+    'ru' (any Cyrillic), 'th', 'el', 'en' (Latin letters only), 'none'
+    (no letters at all).
+    """
+    kana = histogram.get('h', 0)
+    cjk = histogram.get('c', 0)
+    ja_count = kana + cjk
+    if ja_count > 5 or (ja_count > 0 and ja_count / length > 0.1):
+        return 'ja' if kana else 'zh'
+    ko_count = histogram.get('k', 0)
+    if ko_count > 5 or (ko_count > 0 and ko_count / length > 0.1):
         return 'ko'
-    if cyrillic_count > 5 or (cyrillic_count > 0 and cyrillic_count / total_chars > 0.1):
+    cyrillic = histogram.get('y', 0)
+    if cyrillic > 5 or (cyrillic > 0 and cyrillic / length > 0.1):
         return 'ru'  # Could be other Cyrillic languages
-    if thai_count > 3:
+    if histogram.get('t', 0) > 3:
         return 'th'
-    if greek_count > 3:
+    if histogram.get('g', 0) > 3:
         return 'el'
+    if histogram.get('a', 0) or histogram.get('x', 0):
+        return 'en'
+    return 'none'
+
+
+def detect_language(text, ignore_code=True):
+    """Detect the primary language of a text."""
+    if not text or len(text.strip()) == 0:
+        return 'empty'
+    return detect_languages([text], ignore_code)[0]
+
+
+def detect_languages(values, ignore_code=True):
+    """Detect the language of many values at once ('code' if only code)."""
+    texts = [strip_code(v) for v in values] if ignore_code else values
+    results = []
+    for histogram, value, text in zip(script_histograms(texts), values, texts):
+        if not value.strip():
+            results.append('empty')
+        elif not text.strip():
+            results.append('code')
+        else:
+            results.append(classify(histogram, len(text)))
+    return results
 
-    # If only ASCII, assume English
-    return 'en'
 
 def check_language_match(lang_code, detected_lang):
     """Check if detected language matches expected language code."""
-    # English section should not contain Japanese
-    if lang_code == 'en' and detected_lang == 'ja':
-        return False
-
-    # Japanese section should contain Japanese
-    if lang_code == 'ja' and detected_lang == 'en':
-        return False
-
-    # Korean section should contain Korean
-    if lang_code == 'ko' and detected_lang != 'ko' and detected_lang != 'en':
-        # Allow English for now since many are untranslated
-        pass
-
-    # For other languages, if they contain Japanese, it's wrong
-    if lang_code not in ['ja', 'zh-CN', 'zh-TW'] and detected_lang == 'ja':
-        return False
-
-    return True
-
-def analyze_file(filepath):
-    """Analyze a single lesson file for language mismatches."""
-    results = {
-        'file': filepath,
-        'mismatches': defaultdict(list),
-        'untranslated': defaultdict(int),
-        'summary': {}
-    }
-
-    with open(filepath, 'r', encoding='utf-8') as f:
-        data = json.load(f)
-
-    for lang_code, translations in data.items():
-        if lang_code == 'common':
+    if detected_lang in ('empty', 'none', 'code', 'en'):
+        # Latin text in a non-Latin locale is untranslated, not mismatched
+        return True
+    return detected_lang in LOCALE_SCRIPTS.get(lang_code, {'en'})
+
+
+def _load(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def locale_files(resources_path, base):
+    """Return {locale: path} for a course's per-locale files."""
+    files = {}
+    for path in sorted(Path(resources_path).glob(f"{base}_*.json")):
+        locale = path.stem[len(base) + 1:]
+        if locale != 'common':
+            files[locale] = path
+    return files
+
+
+def analyze_texts(lang_code, texts, reference=None, ignore_code=True):
+    """
+    Classify one locale's {key: text}.
+
+    reference is the English {key: text} used to spot untranslated values
+    in Latin-script locales. Returns the locale's stats.
+    """
+    keys = [k for k, v in texts.items() if isinstance(v, str)]
+    values = [texts[k] for k in keys]
+    stats = {'total': len(keys), 'untranslated': 0, 'mismatched': 0,
+             'mismatches': [], 'detected': Counter()}
+
+    latin_locale = lang_code not in LOCALE_SCRIPTS
+    for key, value, detected in zip(keys, values, detect_languages(values, ignore_code)):
+        stats['detected'][detected] += 1
+        if not check_language_match(lang_code, detected):
+            stats['mismatched'] += 1
+            stats['mismatches'].append({
+                'key': key,
+                'value': value[:100] + '...' if len(value) > 100 else value,
+                'detected': detected
+            })
+        elif lang_code == 'en':
             continue
-        if not isinstance(translations, dict):
+        elif latin_locale:
+            if detected == 'en' and reference is not None and reference.get(key) == value:
+                stats['untranslated'] += 1
+        elif detected == 'en':
+            stats['untranslated'] += 1
+
+    if latin_locale and lang_code != 'en' and reference is None:
+        # No English file to compare with
+        stats['untranslated'] = None
+    return stats
+
+
+def analyze_course(resources_path, base, locales=None, ignore_code=True):
+    """Return {locale: stats} for one lesson course."""
+    files = locale_files(resources_path, base)
+    reference = _load(files['en']) if 'en' in files else None
+    results = {}
+    for locale, path in files.items():
+        if locales and locale not in locales:
             continue
+        results[locale] = analyze_texts(locale, _load(path), reference, ignore_code)
+    return results
 
-        total_keys = 0
-        english_count = 0
-        mismatch_count = 0
-
-        for key, value in translations.items():
-            if not isinstance(value, str):
-                continue
-
-            total_keys += 1
-            detected = detect_language(value)
-
-            # Check for Japanese in English section
-            if lang_code == 'en' and detected == 'ja':
-                results['mismatches']['en'].append({
-                    'key': key,
-                    'value': value[:100] + '...' if len(value) > 100 else value,
-                    'detected': detected
-                })
-                mismatch_count += 1
-
-            # Check if non-English sections are actually in English
-            elif lang_code not in ['en'] and detected == 'en':
-                english_count += 1
-
-        if english_count > 0 and lang_code != 'en':
-            results['untranslated'][lang_code] = english_count
 
-        results['summary'][lang_code] = {
-            'total': total_keys,
-            'untranslated': english_count if lang_code != 'en' else 0,
-            'mismatched': mismatch_count
-        }
+def analyze_base_file(resources_path, locales=None, ignore_code=True):
+    """Return {locale: stats} for localizedText.json (nested by locale)."""
+    data = _load(Path(resources_path) / BASE_FILE)
+    reference = data.get('en')
+    return {locale: analyze_texts(locale, texts, reference, ignore_code)
+            for locale, texts in data.items()
+            if isinstance(texts, dict) and (not locales or locale in locales)}
 
-    return results
 
 def main():
-    resources_dir = Path(__file__).parent.parent / 'Assets' / 'Resources'
-    lesson_files = list(resources_dir.glob('*Lessons.json'))
+    parser = argparse.ArgumentParser(description='Detect language mismatches in localization files')
+    parser.add_argument('--path', type=Path, default=RESOURCES_PATH,
+                        help='Resources folder')
+    parser.add_argument('--locale', action='append',
+                        help='Only check this locale (repeatable)')
+    parser.add_argument('--json', type=Path,
+                        help='Also write the per-course, per-locale results to this file')
+    parser.add_argument('--include-code', action='store_true',
+                        help='Classify whole values, code blocks included')
+    parser.add_argument('--samples', type=int, default=5,
+                        help='Mismatched values to print per file (default: 5)')
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    ignore_code = not args.include_code
+    sources = {BASE_FILE: analyze_base_file(args.path, args.locale, ignore_code)}
+    for base in LESSON_BASES:
+        sources[base] = analyze_course(args.path, base, args.locale, ignore_code)
+    elapsed = time.perf_counter() - start
 
     print("=" * 80)
     print("Language Mismatch Detection Report")
     print("=" * 80)
 
-    all_results = []
+    totals = defaultdict(lambda: {'total': 0, 'untranslated': 0, 'mismatched': 0, 'compared': 0})
+    for source, locales in sources.items():
+        problems = [(locale, stats) for locale, stats in locales.items() if stats['mismatched']]
+        for locale, stats in locales.items():
+            total = totals[locale]
+            total['total'] += stats['total']
+            total['mismatched'] += stats['mismatched']
+            if stats['untranslated'] is not None:
+                total['untranslated'] += stats['untranslated']
+                total['compared'] += stats['total']
+        if not problems:
+            continue
 
-    for filepath in sorted(lesson_files):
-        print(f"\nAnalyzing: {filepath.name}")
+        print(f"\n{source}")
         print("-" * 40)
-
-        results = analyze_file(filepath)
-        all_results.append(results)
-
-        # Print mismatches in English section
-        if results['mismatches']['en']:
-            print(f"\n  [!] English section contains Japanese ({len(results['mismatches']['en'])} keys):")
-            for m in results['mismatches']['en'][:5]:  # Show first 5
-                print(f"      - {m['key']}: {m['value'][:60]}...")
-            if len(results['mismatches']['en']) > 5:
-                print(f"      ... and {len(results['mismatches']['en']) - 5} more")
-
-        # Print untranslated languages
-        untranslated = [(k, v) for k, v in results['untranslated'].items() if v > 0]
-        if untranslated:
-            print(f"\n  [!] Untranslated sections (still in English):")
-            for lang, count in sorted(untranslated, key=lambda x: -x[1]):
-                total = results['summary'][lang]['total']
-                pct = (count / total * 100) if total > 0 else 0
-                print(f"      - {lang}: {count}/{total} keys ({pct:.1f}%)")
+        for locale, stats in problems:
+            print(f"  [!] {locale}: {stats['mismatched']} values in another script:")
+            for m in stats['mismatches'][:args.samples]:
+                print(f"      - {m['key']} ({m['detected']}): {m['value'][:60]}")
+            if len(stats['mismatches']) > args.samples:
+                print(f"      ... and {len(stats['mismatches']) - args.samples} more")
 
     # Summary
     print("\n" + "=" * 80)
     print("SUMMARY")
     print("=" * 80)
+    print(f"\n{'Locale':<10} {'Values':>8} {'Mismatched':>11} {'Untranslated':>13} {'Ratio':>7}")
+    for locale, total in sorted(totals.items(), key=lambda item: item[0]):
+        if total['compared']:
+            ratio = f"{total['untranslated'] / total['compared'] * 100:.1f}%"
+            untranslated = str(total['untranslated'])
+        else:
+            ratio = untranslated = '-'
+        print(f"{locale:<10} {total['total']:>8} {total['mismatched']:>11} {untranslated:>13} {ratio:>7}")
+    print("\nUntranslated for Latin-script locales is measured against the course's")
+    print("English file; '-' means no course had one to compare with.")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(sources, f, ensure_ascii=False, indent=2)
+        print(f"\nReport written to {args.json}")
+
+    print(f"\nElapsed: {elapsed:.2f}s")
+    mismatched = sum(total['mismatched'] for total in totals.values())
+    return 1 if mismatched else 0
 
-    total_en_mismatches = sum(len(r['mismatches']['en']) for r in all_results)
-    print(f"\nTotal English keys with Japanese text: {total_en_mismatches}")
-
-    print("\nUntranslated sections by language:")
-    lang_totals = defaultdict(int)
-    for r in all_results:
-        for lang, count in r['untranslated'].items():
-            lang_totals[lang] += count
-
-    for lang, count in sorted(lang_totals.items(), key=lambda x: -x[1]):
-        print(f"  {lang}: {count} keys need translation")
 
 if __name__ == '__main__':
-    main()
+    sys.exit(main())
@@ -9,6 +9,9 @@ import sys
 import io
 from pathlib import Path
 
+from lesson_index import split_by_course
+from ts_lesson_parser import TSParseError, parse_ts_object
+
 # Fix Windows console encoding
 sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
 
@@ -25,71 +28,12 @@ LANGUAGES = [
     "lua", "perl", "haskell", "elixir"
 ]
 
-def extract_ts_object(content):
-    """Extract the JavaScript/TypeScript object from export statement"""
-    # Find the object content between { and the final }
-    match = re.search(r'export const \w+Data = (\{[\s\S]*\});?\s*$', content)
-    if match:
-        obj_str = match.group(1)
-        # Convert to valid JSON
-        # Replace single quotes with double quotes (careful with nested quotes)
-        # Handle property names without quotes
-
-        # First, fix the trailing issues
-        obj_str = obj_str.rstrip().rstrip(';')
-
-        return obj_str
-    return None
-
 def parse_ts_to_dict(ts_content):
     """Parse TypeScript object to Python dict"""
-    obj_str = extract_ts_object(ts_content)
-    if not obj_str:
-        return None
-
-    # Convert TS object literal to JSON
-    # 1. Add quotes to unquoted keys
-    # 2. Handle arrays properly
-    # 3. Handle nested objects
-
     try:
-        # Use a more robust approach - evaluate as JavaScript-like syntax
-        # First, try simple JSON5-like parsing
-
-        # Replace: key: value with "key": value
-        def fix_keys(match):
-            key = match.group(1)
-            return f'"{key}":'
-
-        # Fix unquoted keys
-        result = re.sub(r'(?<=[{,\s])(\w+)(?=\s*:)', fix_keys, obj_str)
-
-        # Replace single quotes with double quotes (but not in already double-quoted strings)
-        # This is tricky - let's handle it carefully
-        in_double_quote = False
-        in_single_quote = False
-        chars = list(result)
-        i = 0
-        while i < len(chars):
-            c = chars[i]
-            if c == '\\' and i + 1 < len(chars):
-                i += 2
-                continue
-            if c == '"' and not in_single_quote:
-                in_double_quote = not in_double_quote
-            elif c == "'" and not in_double_quote:
-                in_single_quote = not in_single_quote
-                chars[i] = '"'
-            i += 1
-
-        result = ''.join(chars)
-
-        # Remove trailing commas
-        result = re.sub(r',(\s*[}\]])', r'\1', result)
-
-        return json.loads(result)
-    except json.JSONDecodeError as e:
-        print(f"JSON parse error: {e}")
+        return parse_ts_object(ts_content)
+    except TSParseError as e:
+        print(f"TS parse error: {e}")
         return None
 
 def extract_keys_from_lesson(lang_prefix, lesson_data, lesson_num):
@@ -184,13 +128,13 @@ def main():
     print("ローカルファイル照合中...")
     print("=" * 70)
 
+    ref_by_course = split_by_course(all_reference_keys)
     results = {}
     checklist = []
 
     for lang in LANGUAGES:
         # Get all reference keys for this language
-        prefix = f"{lang}_"
-        ref_lang_keys = {k: v for k, v in all_reference_keys.items() if k.startswith(prefix)}
+        ref_lang_keys = ref_by_course.get(lang, {})
 
         # Load local file
         local_filename = f"{lang}Lessons_ja.json"
@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""
+Fake Gemini CLI for benchmarking the translation scripts offline.
+
+Reads a translate_with_gemini.py prompt from stdin and answers like the
+real CLI would, tagging each value with the target language instead of
+translating it. The answers come from the stub backend
+(translation_backends.StubBackend); use `--backend stub` to skip the
+subprocess altogether.
+
+Usage:
+    GEMINI_CLI="python scripts/fake_gemini.py" python scripts/translate_with_gemini.py --lang all
+
+Environment:
+    FAKE_GEMINI_LATENCY    seconds to sleep per call (default: 1.0)
+    FAKE_GEMINI_FAIL_RATE  probability of exiting with an error (default: 0)
+    FAKE_GEMINI_DROP_RATE  probability of leaving a language out of a
+                           multi-language reply (default: 0)
+"""
+
+import os
+import sys
+
+from translation_backends import StubBackend, TranslationBackendError
+
+
+def main():
+    prompt = sys.stdin.read()
+    # Every call is a new process, so failures are random rather than per attempt
+    backend = StubBackend(latency=float(os.environ.get('FAKE_GEMINI_LATENCY', '1.0')),
+                          fail_rate=float(os.environ.get('FAKE_GEMINI_FAIL_RATE', '0')),
+                          drop_rate=float(os.environ.get('FAKE_GEMINI_DROP_RATE', '0')),
+                          seed='random')
+    try:
+        print(backend.complete(prompt))
+    except TranslationBackendError:
+        print("Error: quota exceeded (fake)", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
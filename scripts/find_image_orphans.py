@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+"""
+Cross-reference slide image keys against the image files on disk.
+
+Builds an index of every `_image` reference in the Resources JSON files
+(`*_common`, per-locale lesson files and localizedText.json) and compares
+it with the files under SlideImages/ and illustrations/. Reports:
+
+- missing:    referenced paths with no file (these break on device);
+              paths that only differ in letter case are flagged too,
+              since Android file lookups are case-sensitive
+- orphaned:   image files nothing references (they still ship in the APK)
+- duplicated: keys defined with different paths in several files, and
+              image files with identical content
+
+Designed to run as a pre-commit hook: the directory listing is cached and
+only rescanned when a directory's mtime changes, and references and image
+hashes are only re-read from files that changed (validation_cache.py).
+
+Usage:
+    python find_image_orphans.py [--json report.json] [--fail-on-orphans]
+
+Exit code is 1 when a referenced image is missing.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+
+from slide_images import (IMAGE_DIRS, RESOURCES_PATH, iter_image_references,
+                          list_image_files, normalize_reference)
+from validation_cache import CACHE_DIR, ValidationCache, file_fingerprint
+
+CACHE_VERSION = 1
+LISTING_CACHE = CACHE_DIR / "image_listing.json"
+
+
+def _directory_mtimes(resources_path):
+    """Return {directory: mtime_ns} for every directory under IMAGE_DIRS."""
+    mtimes = {}
+    for top in IMAGE_DIRS:
+        stack = [str(resources_path / top)]
+        while stack:
+            directory = stack.pop()
+            try:
+                mtimes[directory] = os.stat(directory).st_mtime_ns
+                entries = os.scandir(directory)
+            except FileNotFoundError:
+                continue
+            with entries:
+                for entry in entries:
+                    if entry.is_dir():
+                        stack.append(entry.path)
+    return mtimes
+
+
+def cached_image_listing(resources_path, cache_path=LISTING_CACHE, use_cache=True):
+    """
+    Return {relative path: size} for all images, reusing the last listing.
+
+    A directory's mtime changes whenever an entry is added, removed or
+    renamed, so the cached listing is reused while every directory mtime
+    matches. Rewriting a file in place keeps its directory's mtime, so the
+    sizes can be stale; duplicate_files() checks each candidate against its
+    current mtime/size through the hash cache. Returns (listing, from_cache).
+    """
+    resources_path = Path(resources_path)
+    mtimes = _directory_mtimes(resources_path)
+
+    if use_cache:
+        try:
+            with open(cache_path, 'r', encoding='utf-8') as f:
+                cached = json.load(f)
+            if cached.get("version") == CACHE_VERSION and cached.get("dirs") == mtimes:
+                return cached["images"], True
+        except (OSError, ValueError, KeyError):
+            pass
+
+    images = list_image_files(resources_path)
+    if use_cache:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = cache_path.with_name(cache_path.name + ".tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({"version": CACHE_VERSION, "dirs": mtimes, "images": images}, f)
+        os.replace(tmp_path, cache_path)
+    return images, False
+
+
+def collect_references(resources_path, cache):
+    """
+    Return [(file name, locale or None, key, value), ...] for all JSON files.
+
+    Each file's references come from the cache unless the file changed.
+    """
+    references = []
+    for path in sorted(Path(resources_path).glob("*.json")):
+        result = cache.lookup(path)
+        if result is None:
+            fingerprint = cache.fingerprint(path)
+            result = [[locale, key, value] for _name, locale, key, value
+                      in iter_image_references(resources_path, path.name)]
+            cache.store(path, result, fingerprint)
+        references.extend((path.name, locale, key, value) for locale, key, value in result)
+    return references
+
+
+def duplicate_files(resources_path, images, cache):
+    """
+    Return lists of image paths with identical content (same size first).
+
+    Sizes come from the (possibly cached) listing and only narrow down the
+    candidates; each candidate's digest comes from the hash cache, which
+    re-hashes the file when its mtime or size no longer matches.
+    """
+    by_size = defaultdict(list)
+    for rel, size in images.items():
+        by_size[size].append(rel)
+
+    groups = defaultdict(list)
+    for candidates in by_size.values():
+        if len(candidates) < 2:
+            continue
+        for rel in candidates:
+            path = resources_path / rel
+            digest = cache.lookup(path)
+            if digest is None:
+                # The fingerprint's content hash is the digest we want
+                fingerprint = file_fingerprint(path)
+                digest = fingerprint[2]
+                cache.store(path, digest, fingerprint)
+            groups[digest].append(rel)
+    return sorted(sorted(members) for members in groups.values() if len(members) > 1)
+
+
+def build_report(resources_path, use_cache=True):
+    """Build the missing/orphaned/duplicated report as a dict."""
+    resources_path = Path(resources_path)
+    images, listing_cached = cached_image_listing(resources_path, use_cache=use_cache)
+    ref_cache = ValidationCache("find_image_orphans", version=CACHE_VERSION, enabled=use_cache)
+    hash_cache = ValidationCache("image_hashes", version=CACHE_VERSION, enabled=use_cache)
+
+    references = collect_references(resources_path, ref_cache)
+
+    index = defaultdict(list)
+    definitions = defaultdict(set)
+    for name, locale, key, value in references:
+        rel = normalize_reference(value)
+        where = f"{name}[{locale}]" if locale else name
+        index[rel].append(f"{where}:{key}")
+        definitions[key].add(rel)
+
+    lowered = {rel.lower(): rel for rel in images}
+    missing = []
+    case_mismatch = []
+    for rel in sorted(index):
+        if rel in images:
+            continue
+        actual = lowered.get(rel.lower())
+        if actual:
+            case_mismatch.append({"path": rel, "actual": actual, "used_by": index[rel]})
+        else:
+            missing.append({"path": rel, "used_by": index[rel]})
+
+    orphaned = [rel for rel in images if rel not in index]
+    conflicting = {key: sorted(paths) for key, paths in sorted(definitions.items())
+                   if len(paths) > 1}
+    identical = duplicate_files(resources_path, images, hash_cache)
+
+    ref_cache.save()
+    hash_cache.save()
+
+    return {
+        "images": len(images),
+        "references": len(references),
+        "listing_cached": listing_cached,
+        "json_cache": ref_cache.summary(),
+        "missing": missing,
+        "case_mismatch": case_mismatch,
+        "orphaned": orphaned,
+        "orphaned_bytes": sum(images[rel] for rel in orphaned),
+        "conflicting_keys": conflicting,
+        "identical_files": identical,
+    }
+
+
+def _print_list(title, items, limit):
+    print(f"\n{title}: {len(items)}")
+    for item in items[:limit]:
+        print(f"  {item}")
+    if len(items) > limit:
+        print(f"  ... and {len(items) - limit} more")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Find missing and orphaned slide images')
+    parser.add_argument('--path', type=Path, default=RESOURCES_PATH,
+                        help='Resources folder')
+    parser.add_argument('--json', type=Path,
+                        help='Also write the full report to this JSON file')
+    parser.add_argument('--limit', type=int, default=20,
+                        help='Entries to print per list (default: 20)')
+    parser.add_argument('--fail-on-orphans', action='store_true',
+                        help='Exit with 1 when orphaned images exist')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Rescan and re-read everything')
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    report = build_report(args.path, use_cache=not args.no_cache)
+    elapsed = time.perf_counter() - start
+
+    print("=" * 60)
+    print("Slide Image Reference Check")
+    print("=" * 60)
+    print(f"Images on disk: {report['images']}"
+          + (" (cached listing)" if report['listing_cached'] else ""))
+    print(f"References:     {report['references']}")
+    print(report['json_cache'])
+
+    _print_list("Missing", [f"{m['path']}  <- {m['used_by'][0]}" for m in report['missing']],
+                args.limit)
+    _print_list("Case mismatch", [f"{m['path']} (file is {m['actual']})"
+                                  for m in report['case_mismatch']], args.limit)
+    _print_list(f"Orphaned ({report['orphaned_bytes'] / 1024 / 1024:.1f} MB)",
+                report['orphaned'], args.limit)
+    _print_list("Keys with conflicting paths",
+                [f"{key}: {', '.join(paths)}" for key, paths in report['conflicting_keys'].items()],
+                args.limit)
+    _print_list("Identical image files",
+                [f"{len(group)} copies: {group[0]}, ..." for group in report['identical_files']],
+                args.limit)
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"\nReport written to {args.json}")
+
+    print(f"\nElapsed: {elapsed:.2f}s")
+
+    if report['missing'] or report['case_mismatch']:
+        return 1
+    if args.fail_on_orphans and report['orphaned']:
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
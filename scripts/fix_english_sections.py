@@ -5,19 +5,12 @@ Uses Claude to translate Japanese to English.
 """
 
 import json
-import re
 import os
 from pathlib import Path
 from collections import defaultdict
 
-# Character ranges for language detection
-JAPANESE_PATTERN = re.compile(r'[\u3040-\u309F\u30A0-\u30FF\u4E00-\u9FAF]')
-
-def has_japanese(text):
-    """Check if text contains Japanese characters."""
-    if not text or not isinstance(text, str):
-        return False
-    return bool(JAPANESE_PATTERN.search(text))
+from code_spans import has_japanese
+from json_utils import safe_json_dump
 
 def extract_japanese_keys(filepath):
     """Extract keys from English section that contain Japanese."""
@@ -46,8 +39,7 @@ def apply_translations(filepath, translations):
 
     data['en'] = en_section
 
-    with open(filepath, 'w', encoding='utf-8') as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+    safe_json_dump(data, filepath, indent=2)
 
     print(f"Updated {len(translations)} keys in {filepath}")
 
@@ -72,8 +64,7 @@ def main():
 
         # Output for translation
         output_file = filepath.parent / f"{filepath.stem}_en_fixes.json"
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(japanese_keys, f, ensure_ascii=False, indent=2)
+        safe_json_dump(japanese_keys, output_file, indent=2)
 
         print(f"Exported to: {output_file}")
         print("\nSample keys:")
@@ -15,6 +15,8 @@ import json
 import re
 from pathlib import Path
 
+from json_utils import atomic_write_text
+
 RESOURCES_PATH = Path(r"C:\Work\MetaXR\ProgramShooting\Assets\Resources")
 
 
@@ -146,8 +148,7 @@ def validate_and_fix_file(filepath):
         # Try again
         try:
             json.loads(fixed)
-            with open(filepath, 'w', encoding='utf-8') as f:
-                f.write(fixed)
+            atomic_write_text(filepath, fixed)
             return True, "Fixed"
         except json.JSONDecodeError as e:
             return False, f"{e.msg} at line {e.lineno}, col {e.colno}"
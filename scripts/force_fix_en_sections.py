@@ -1,25 +1,17 @@
 import json
 import os
-import subprocess
 import re
 
+from json_utils import safe_json_dump
+from translation_backends import TranslationBackendError, get_backend
+
 def call_gemini_fix(text):
     """日本語を含むテキストを完璧な英語に修正する"""
     prompt = f"Fix the following text to be perfect English for a programming tutorial. If it contains Japanese, translate it to natural English. Return ONLY the fixed English text.\n\nText: {text}"
     
     try:
-        process = subprocess.Popen(
-            'gemini --model gemini-2.0-flash-exp',
-            stdin=subprocess.PIPE,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True,
-            encoding='utf-8',
-            shell=True
-        )
-        stdout, stderr = process.communicate(input=prompt, timeout=60)
-        return stdout.strip()
-    except Exception as e:
+        return get_backend(default='gemini-cli', model='gemini-2.0-flash-exp', timeout=60).complete(prompt)
+    except TranslationBackendError as e:
         print(f"Error: {e}")
         return text
 
@@ -52,8 +44,7 @@ def process_files():
                 modified = True
         
         if modified:
-            with open(file_path, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
+            safe_json_dump(data, file_path, indent=2)
             print(f"Saved {filename}")
 
 if __name__ == "__main__":
@@ -1,11 +1,14 @@
 
 import json
 import os
-import subprocess
 import time
 import re
 import sys
 
+from code_spans import has_japanese
+from json_utils import safe_json_dump
+from translation_backends import TranslationBackendError, get_backend
+
 # Master language list from localizedText.json
 TARGET_LANGUAGES = ['en', 'ja', 'cs', 'de', 'nl', 'da', 'el', 'fi', 'fr', 'it', 'ko', 'no', 'pl', 'pt', 'ro', 'ru', 'es', 'sv', 'tr', 'zh-Hans', 'zh-Hant']
 
@@ -20,24 +23,9 @@ LANG_NAME_MAP = {
 
 def call_gemini(prompt):
     try:
-        # Use shell=True on Windows to better handle batch files and encodings
-        # Use stdin to pass the prompt to avoid command line length limits and encoding issues
-        result = subprocess.run(
-            ['gemini.cmd'],
-            input=prompt,
-            capture_output=True,
-            text=True,
-            encoding='utf-8',
-            timeout=180,
-            shell=True
-        )
-        output = result.stdout.strip()
-        # Clean up Gemini CLI noise
-        lines = output.split('\n')
-        # Skip the first few lines if they are about cached credentials or command echo
-        filtered_lines = [l for l in lines if 'cached credentials' not in l.lower() and l.strip()]
-        return '\n'.join(filtered_lines).strip()
-    except Exception as e:
+        # No --model: the CLI's own default, as before the backend registry
+        return get_backend(default='gemini-cli', model=None, timeout=180).complete(prompt)
+    except TranslationBackendError as e:
         print(f"  Error calling Gemini: {e}")
         return None
 
@@ -83,11 +71,6 @@ Output ({target_lang_name} JSON):"""
     
     return {}
 
-def has_japanese(text):
-    if not isinstance(text, str):
-        return False
-    return bool(re.search(r'[\u3040-\u309f\u30a0-\u30ff\u4e00-\u9fff]', text))
-
 def process_file(file_path, batch_size=10):
     print(f"\nProcessing {file_path}...")
     with open(file_path, 'r', encoding='utf-8') as f:
@@ -153,8 +136,7 @@ def process_file(file_path, batch_size=10):
                 updated = True
                 
                 # Intermediate save
-                with open(file_path, 'w', encoding='utf-8') as f:
-                    json.dump(data, f, ensure_ascii=False, indent=4)
+                safe_json_dump(data, file_path, indent=4)
             else:
                 print("FAILED")
                 time.sleep(2) # Wait a bit before next attempt
@@ -162,8 +144,7 @@ def process_file(file_path, batch_size=10):
             time.sleep(0.5) # Rate limiting
 
     if updated:
-        with open(file_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=4)
+        safe_json_dump(data, file_path, indent=4)
     
     print(f"Finished {file_path}")
 
@@ -1,14 +1,17 @@
 #!/usr/bin/env python3
 """
-Full translation script using deep-translator.
+Full translation script using Google Translate (translation_backends, default: google).
 Processes all JSON files and translates missing keys.
 """
 
 import json
 import sys
-import time
 from pathlib import Path
-from deep_translator import GoogleTranslator
+
+from json_utils import safe_json_dump
+from translation_memory import get_memory
+from translation_backends import get_backend
+from translation_scheduler import run_concurrently
 
 TARGET_LANGUAGES = [
     "cs", "de", "nl", "da", "el", "fi", "fr", "it",
@@ -16,27 +19,36 @@ TARGET_LANGUAGES = [
     "zh-Hans", "zh-Hant", "uk", "vi"
 ]
 
-# Google Translate language codes
-LANG_MAP = {
-    "zh-Hans": "zh-CN",
-    "zh-Hant": "zh-TW",
-    "no": "no",
-}
-
 def translate(text, target_lang, source_lang="en"):
-    """Translate text using Google Translate."""
+    """Translate text using Google Translate, checking the translation memory first."""
     if not text or len(text) < 2:
         return text
-    
-    target = LANG_MAP.get(target_lang, target_lang)
-    source = LANG_MAP.get(source_lang, source_lang)
-    
+
+    memory = get_memory()
+    backend_name = get_backend(default='google').name
+    cached = memory.get(text, source_lang, target_lang, backend_name)
+    if cached is not None:
+        return cached
+
+    result, ok = translate_uncached(text, target_lang, source_lang)
+    if ok:
+        memory.put(text, source_lang, target_lang, backend_name, result)
+    return result
+
+def translate_uncached(text, target_lang, source_lang="en"):
+    """
+    Translate text using Google Translate.
+
+    Returns (text, ok); ok is False when any part fell back to the original.
+    """
+    translator = get_backend(default='google')
+
     try:
         # Split long text into chunks (max 5000 chars for Google Translate)
         if len(text) > 4500:
             # Keep original for very long texts with code
             if "```" in text or "print(" in text or "def " in text:
-                return text
+                return text, False
             chunks = []
             current = ""
             for line in text.split("\n"):
@@ -50,22 +62,21 @@ def translate(text, target_lang, source_lang="en"):
                 chunks.append(current)
             
             translated_chunks = []
+            ok = True
             for chunk in chunks:
                 try:
-                    result = GoogleTranslator(source=source, target=target).translate(chunk)
+                    result = translator.translate(chunk, source_lang, target_lang)
                     translated_chunks.append(result)
-                    time.sleep(0.1)
-                except:
+                except Exception:
                     translated_chunks.append(chunk)
-            return "\n".join(translated_chunks)
+                    ok = False
+            return "\n".join(translated_chunks), ok
         
-        result = GoogleTranslator(source=source, target=target).translate(text)
-        time.sleep(0.05)
-        return result
+        # Pacing and retries are handled by the async backend
+        return translator.translate(text, source_lang, target_lang), True
     except Exception as e:
         print(f"  Translation error ({target_lang}): {e}")
-        time.sleep(0.5)
-        return text
+        return text, False
 
 def process_file(filepath, dry_run=False):
     """Process a single JSON file."""
@@ -120,30 +131,36 @@ def process_file(filepath, dry_run=False):
         if dry_run:
             continue
         
-        count = 0
-        for key in sorted(missing):
+        def translate_key(key):
             base_value = data[base_lang][key]
-            
+
             # Skip non-translatable content
             if "_image" in key or key.endswith("_code"):
-                translated = base_value
+                return base_value
             elif base_value.startswith("/") or base_value.startswith("http"):
-                translated = base_value
-            else:
-                translated = translate(base_value, lang, base_lang)
-            
-            data[lang][key] = translated
-            modified = True
-            count += 1
-            
-            if count % 20 == 0:
-                print(f"    {count}/{len(missing)}")
-        
+                return base_value
+            return translate(base_value, lang, base_lang)
+
+        results = {}
+
+        def on_result(key, translated):
+            results[key] = data[base_lang][key] if isinstance(translated, Exception) else translated
+            if len(results) % 20 == 0:
+                print(f"    {len(results)}/{len(missing)}")
+
+        # Requests run concurrently; the backend bounds how many are in flight
+        keys = sorted(missing)
+        run_concurrently(keys, translate_key, max_concurrency=get_backend(default='google').max_in_flight,
+                         on_result=on_result)
+        for key in keys:
+            data[lang][key] = results[key]
+        modified = True
+        count = len(keys)
+
         print(f"    Done: {count} keys")
     
     if modified and not dry_run:
-        with open(filepath, 'w', encoding='utf-8', newline='\n') as f:
-            json.dump(data, f, indent=4, ensure_ascii=False)
+        safe_json_dump(data, filepath, indent=4, newline='\n')
         print(f"  Saved!")
     
     return modified
@@ -191,5 +208,7 @@ def main():
                 import traceback
                 traceback.print_exc()
 
+    print(get_memory().summary())
+
 if __name__ == "__main__":
     main()
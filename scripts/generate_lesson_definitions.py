@@ -0,0 +1,362 @@
+#!/usr/bin/env python3
+"""
+Generate data-driven lesson definitions instead of C# code.
+
+LessonManager.cs used to carry every course as a generated
+`Initialize{Language}Lessons()` method (731 `new Exercise` blocks), so
+Unity recompiled the scripts whenever a lesson changed. This script writes
+the lessons as one compact JSON file per course instead:
+
+    Assets/Resources/LessonDefinitions/<language>.json
+
+    {"version": 1, "language": "python", "lessons": [
+      {"titleKey": "python_lesson1_title", "exercises": [
+        {"titleKey": "python_lesson1_ex1_title",
+         "slideKeyPrefix": "python_lesson1_ex1", "slideCount": 4,
+         "correctLines": ["print('Hello, World!')"],
+         "comments": [{"lineIndex": 0, "commentPrefix": "#",
+                       "localizationKey": "python_lesson1_ex1_comment1"}],
+         "expectedOutput": ["Hello, World!"]}]}]}
+
+Field names match the serializable Lesson / Exercise / LocalizedComment
+classes, so LessonDefinitions.cs deserializes a course directly and only
+when that course is opened. The compiled methods are only built with the
+LESSON_CODE_FALLBACK scripting define.
+
+Sources:
+- default: the senkou-code TypeScript lessons (--reference DIR). Where an
+  exercise has no expectedOutput there, the value already in the course
+  file is kept, so hand-filled outputs survive a rebuild.
+- --from-lesson-manager: the compiled Initialize*Lessons methods in
+  LessonManager.cs (how the files were first created)
+
+Usage:
+    python generate_lesson_definitions.py                  # write files
+    python generate_lesson_definitions.py --check          # compare only
+    python generate_lesson_definitions.py --reference C:/Work/git/senkou-code/data/lessons
+"""
+
+import argparse
+import json
+import re
+import sys
+from pathlib import Path
+
+from generate_lesson_manager import (DEFINITIONS_PATH, LESSON_MANAGER_PATH, METHOD_NAMES, SOURCE_BASE,
+                                     extract_comments, get_correct_lines, get_expected_output,
+                                     get_source_files, parse_ts_file)
+from json_utils import atomic_write_text
+
+DEFINITIONS_VERSION = 1
+
+# Python lessons live in InitializeDefaultExercise (InitializePythonLessons calls it)
+METHOD_LANGUAGES = {name: language for language, name in METHOD_NAMES.items()}
+METHOD_LANGUAGES['DefaultExercise'] = 'python'
+del METHOD_LANGUAGES['Python']
+
+_METHOD_RE = re.compile(r'^    private void Initialize(\w+?)(?:Lessons)?\(\)\n    \{\n(.*?)^    \}$',
+                        re.MULTILINE | re.DOTALL)
+
+_TOKEN_RE = re.compile(r'''
+    (?P<skip>\s+|//[^\n]*)
+  | (?P<string>"(?:[^"\\]|\\.)*")
+  | (?P<number>\d+)
+  | (?P<ident>[A-Za-z_]\w*)
+  | (?P<punct>[{}()<>.,;=])
+  | (?P<other>.)
+''', re.DOTALL | re.VERBOSE)
+
+_CS_ESCAPES = {'n': '\n', 't': '\t', 'r': '\r', '0': '\0', '"': '"', "'": "'", '\\': '\\'}
+
+
+def unescape_csharp_string(literal):
+    """Decode a regular C# string literal (including the quotes)."""
+    def replace(match):
+        seq = match.group(1)
+        if seq[0] == 'u':
+            return chr(int(seq[1:], 16))
+        return _CS_ESCAPES.get(seq, '\\' + seq)
+    return re.sub(r'\\(u[0-9a-fA-F]{4}|.)', replace, literal[1:-1])
+
+
+def _tokenize(text):
+    tokens = []
+    pos = 0
+    while pos < len(text):
+        match = _TOKEN_RE.match(text, pos)
+        pos = match.end()
+        kind = match.lastgroup
+        if kind == 'skip':
+            continue
+        value = match.group()
+        if kind == 'string':
+            value = unescape_csharp_string(value)
+        elif kind == 'number':
+            value = int(value)
+        tokens.append((kind, value))
+    return tokens
+
+
+def _parse_initializer(tokens, pos):
+    """
+    Parse `{ name = value, ... }` starting at the opening brace.
+
+    Values are strings, ints, `new List<T>()`, `new List<T> { ... }` or
+    nested `new T { ... }`. Returns (dict, position after the closing brace).
+    """
+    assert tokens[pos] == ('punct', '{')
+    result = {}
+    pos += 1
+    while tokens[pos] != ('punct', '}'):
+        name = tokens[pos][1]
+        assert tokens[pos + 1] == ('punct', '='), f"expected '=' after {name}"
+        result[name], pos = _parse_value(tokens, pos + 2)
+        if tokens[pos] == ('punct', ','):
+            pos += 1
+    return result, pos + 1
+
+
+def _parse_value(tokens, pos):
+    kind, value = tokens[pos]
+    if kind in ('string', 'number'):
+        return value, pos + 1
+    if value != 'new':
+        raise ValueError(f"Unsupported initializer value {value!r}")
+    pos += 1
+    if tokens[pos][1] != 'List':
+        # new LocalizedComment { ... }
+        return _parse_initializer(tokens, pos + 1)
+    # new List<T>() or new List<T> { a, b }
+    while tokens[pos] != ('punct', '>'):
+        pos += 1
+    pos += 1
+    if tokens[pos] == ('punct', '('):
+        pos += 2
+    items = []
+    if pos < len(tokens) and tokens[pos] == ('punct', '{'):
+        pos += 1
+        while tokens[pos] != ('punct', '}'):
+            item, pos = _parse_value(tokens, pos)
+            items.append(item)
+            if tokens[pos] == ('punct', ','):
+                pos += 1
+        pos += 1
+    return items, pos
+
+
+def _exercise_definition(fields):
+    return {
+        "titleKey": fields.get("titleKey", ""),
+        "slideKeyPrefix": fields.get("slideKeyPrefix", ""),
+        "slideCount": fields.get("slideCount", 1),
+        "correctLines": fields.get("correctLines", []),
+        "comments": [{"lineIndex": c.get("lineIndex", 0),
+                      "commentPrefix": c.get("commentPrefix", "#"),
+                      "localizationKey": c.get("localizationKey", "")}
+                     for c in fields.get("comments", [])],
+        "expectedOutput": fields.get("expectedOutput", []),
+    }
+
+
+def _lesson_statements(tokens):
+    """Yield (statement kind, variable, data) for the lesson building statements."""
+    pos = 0
+    while pos < len(tokens):
+        window = [value for _kind, value in tokens[pos:pos + 6]]
+        if window[:1] == ['var'] and window[2:5] == ['=', 'new', 'Lesson']:
+            fields, pos = _parse_initializer(tokens, pos + 5)
+            yield 'lesson', window[1], fields
+        elif window[1:6] == ['.', 'exercises', '.', 'Add', '('] and tokens[pos + 6][1] == 'new':
+            fields, pos = _parse_initializer(tokens, pos + 8)
+            yield 'exercise', window[0], fields
+        elif window[:4] == ['lessons', '.', 'Add', '(']:
+            yield 'add', window[4], None
+            pos += 5
+        else:
+            pos += 1
+
+
+def extract_from_lesson_manager(cs_path=LESSON_MANAGER_PATH):
+    """Return {language: [lesson definition, ...]} from LessonManager.cs."""
+    with open(cs_path, 'r', encoding='utf-8-sig') as f:
+        text = f.read().replace('\r\n', '\n')
+
+    courses = {}
+    for match in _METHOD_RE.finditer(text):
+        language = METHOD_LANGUAGES.get(match.group(1))
+        if language is None:
+            continue
+        variables = {}
+        lessons = []
+        for kind, variable, fields in _lesson_statements(_tokenize(match.group(2))):
+            if kind == 'lesson':
+                variables[variable] = {"titleKey": fields.get("titleKey", ""), "exercises": []}
+            elif kind == 'exercise':
+                variables[variable]["exercises"].append(_exercise_definition(fields))
+            elif variable in variables:
+                lessons.append(variables[variable])
+        if lessons:
+            courses[language] = lessons
+    return courses
+
+
+def build_from_reference(source_base, language, existing_outputs=None):
+    """
+    Build the lesson definitions of one course from senkou-code .ts files.
+
+    existing_outputs ({titleKey: lines}) fills in expectedOutput for
+    exercises whose reference has none.
+    """
+    existing_outputs = existing_outputs or {}
+    lessons = []
+    for lesson_idx, source_file in enumerate(get_source_files(Path(source_base), language)):
+        source_data = parse_ts_file(source_file)
+        if source_data is None:
+            continue
+        lesson_num = lesson_idx + 1
+        exercises = []
+        for ex_idx, exercise in enumerate(source_data.get('exercises', [])):
+            prefix = f"{language}_lesson{lesson_num}_ex{ex_idx + 1}"
+            correct_lines = get_correct_lines(exercise)
+            exercises.append({
+                "titleKey": f"{prefix}_title",
+                "slideKeyPrefix": prefix,
+                # +1 for the "Let's try it" slide
+                "slideCount": len(exercise.get('tutorialSlides', [])) + 1,
+                "correctLines": correct_lines,
+                "comments": [{"lineIndex": c['lineIndex'], "commentPrefix": c['prefix'],
+                              "localizationKey": f"{prefix}_comment{c['commentNum']}"}
+                             for c in extract_comments(correct_lines, language)],
+                "expectedOutput": get_expected_output(exercise) or existing_outputs.get(f"{prefix}_title", []),
+            })
+        lessons.append({"titleKey": f"{language}_lesson{lesson_num}_title", "exercises": exercises})
+    return lessons
+
+
+def expected_outputs(lessons):
+    """Return {exercise titleKey: expectedOutput} for the exercises that have one."""
+    return {exercise["titleKey"]: exercise["expectedOutput"]
+            for lesson in lessons for exercise in lesson["exercises"] if exercise["expectedOutput"]}
+
+
+def serialize_course(language, lessons):
+    """Compact JSON text for one course file."""
+    data = {"version": DEFINITIONS_VERSION, "language": language, "lessons": lessons}
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':'))
+
+
+def load_course(output_path, language):
+    """Return the lessons stored in a course file, or None if it is missing."""
+    try:
+        with open(Path(output_path) / f"{language}.json", 'r', encoding='utf-8') as f:
+            return json.load(f).get("lessons")
+    except FileNotFoundError:
+        return None
+
+
+def check_courses(output_path, courses):
+    """Return a list of courses whose file is missing or differs."""
+    problems = []
+    for language, lessons in courses.items():
+        stored = load_course(output_path, language)
+        if stored is None:
+            problems.append(f"{language}: no definitions file")
+        elif stored != lessons:
+            problems.append(f"{language}: definitions file is out of date")
+    return problems
+
+
+def write_courses(output_path, courses):
+    """
+    Write one file per course, skipping unchanged ones.
+
+    Returns {language: (lessons, exercises, bytes, changed)}.
+    """
+    output_path = Path(output_path)
+    output_path.mkdir(parents=True, exist_ok=True)
+    written = {}
+    for language, lessons in courses.items():
+        text = serialize_course(language, lessons)
+        target = output_path / f"{language}.json"
+        changed = not target.exists() or target.read_text(encoding='utf-8') != text
+        if changed:
+            atomic_write_text(target, text)
+        exercises = sum(len(lesson["exercises"]) for lesson in lessons)
+        written[language] = (len(lessons), exercises, len(text.encode('utf-8')), changed)
+    return written
+
+
+def build_courses(source_base, output_path, languages):
+    """Build {language: lessons} from the reference, keeping stored expectedOutput."""
+    courses = {}
+    for language in languages:
+        existing = expected_outputs(load_course(output_path, language) or [])
+        lessons = build_from_reference(source_base, language, existing)
+        if lessons:
+            courses[language] = lessons
+        else:
+            print(f"No source files for {language}")
+    return courses
+
+
+def update_definitions(source_base, output_path, languages):
+    """Rebuild the given courses from the reference and rewrite their files."""
+    courses = build_courses(source_base, output_path, languages)
+    for language, (_, _, _, changed) in write_courses(output_path, courses).items():
+        print(f"  LessonDefinitions/{language}.json {'updated' if changed else 'unchanged'}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate per-course lesson definition files')
+    parser.add_argument('--reference', type=Path, default=SOURCE_BASE,
+                        help='senkou-code data/lessons folder to build from')
+    parser.add_argument('--from-lesson-manager', action='store_true',
+                        help='Extract the lessons from the compiled methods in LessonManager.cs instead')
+    parser.add_argument('--lesson-manager', type=Path, default=LESSON_MANAGER_PATH,
+                        help='LessonManager.cs for --from-lesson-manager')
+    parser.add_argument('--output', type=Path, default=DEFINITIONS_PATH,
+                        help='Folder for the <language>.json files')
+    parser.add_argument('--language', action='append',
+                        help='Only this course (repeatable)')
+    parser.add_argument('--check', action='store_true',
+                        help='Only compare the existing files, exit 1 when out of date')
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("Lesson Definitions")
+    print("=" * 60)
+
+    if args.from_lesson_manager:
+        courses = extract_from_lesson_manager(args.lesson_manager)
+        if args.language:
+            courses = {l: courses[l] for l in args.language if l in courses}
+    elif not args.reference.is_dir():
+        print(f"[NG] Reference lessons not found: {args.reference}")
+        print("     Pass --reference DIR (or --from-lesson-manager)")
+        return 1
+    else:
+        courses = build_courses(args.reference, args.output, args.language or list(METHOD_NAMES))
+
+    if args.check:
+        problems = check_courses(args.output, courses)
+        for problem in problems:
+            print(f"[NG] {problem}")
+        if not problems:
+            print(f"[OK] {len(courses)} courses up to date")
+        return 1 if problems else 0
+
+    stats = write_courses(args.output, courses)
+    for language, (lessons, exercises, size, changed) in stats.items():
+        print(f"  {language:<12} {lessons:>2} lessons {exercises:>4} exercises {size / 1024:>7.1f} KB"
+              f"{'' if changed else '  (unchanged)'}")
+    total_lessons = sum(s[0] for s in stats.values())
+    total_exercises = sum(s[1] for s in stats.values())
+    total_bytes = sum(s[2] for s in stats.values())
+
+    print(f"\nWrote {len(courses)} courses, {total_lessons} lessons, {total_exercises} exercises "
+          f"({total_bytes / 1024:.0f} KB) to {args.output}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,29 +1,73 @@
 #!/usr/bin/env python3
 """
-Generate LessonManager.cs code from senkou-code source data
+Generate lesson data from senkou-code source data
+
+The game loads Assets/Resources/LessonDefinitions/<language>.json
+(generate_lesson_definitions.py); those files are rebuilt for every
+regenerated language. The Initialize{Language}Lessons methods are only a
+fallback compiled with the LESSON_CODE_FALLBACK define; --splice also
+refreshes them in LessonManager.cs, between `// <generated:lang>` /
+`// </generated:lang>` markers.
+
+Generation is incremental: each language's .ts inputs are hashed (state in
+.validation_cache/lesson_manager_inputs.json) and only languages whose
+inputs changed are regenerated (pass --force to rebuild all). With
+--splice, unchanged languages are spliced from their existing
+scripts/generated/<lang>_lessons.cs, so a run without --splice never
+leaves LessonManager.cs behind.
 """
+import argparse
+import hashlib
 import json
 import re
+import sys
 from pathlib import Path
 
+from json_utils import atomic_write_text, safe_json_dump
+from ts_lesson_parser import load_ts_data
+from validation_cache import CACHE_DIR
+
+PROJECT_ROOT = Path(__file__).parent.parent
+SOURCE_BASE = Path('C:/Work/git/senkou-code/data/lessons')
+OUTPUT_DIR = Path(__file__).parent / 'generated'
+LESSON_MANAGER_PATH = PROJECT_ROOT / 'Assets' / 'Scripts' / 'LessonManager.cs'
+DEFINITIONS_PATH = PROJECT_ROOT / 'Assets' / 'Resources' / 'LessonDefinitions'
+STATE_PATH = CACHE_DIR / 'lesson_manager_inputs.json'
+STATE_VERSION = 1
+
+# Languages whose methods are generated (the rest are maintained by hand)
+GENERATED_LANGUAGES = [
+    'bash', 'csharp', 'elixir', 'go', 'haskell', 'kotlin',
+    'lua', 'perl', 'php', 'ruby', 'rust', 'sql', 'swift'
+]
+
+# Map language to method name
+METHOD_NAMES = {
+    'python': 'Python',
+    'javascript': 'JavaScript',
+    'typescript': 'TypeScript',
+    'java': 'Java',
+    'c': 'C',
+    'cpp': 'Cpp',
+    'csharp': 'CSharp',
+    'go': 'Go',
+    'rust': 'Rust',
+    'ruby': 'Ruby',
+    'php': 'PHP',
+    'swift': 'Swift',
+    'kotlin': 'Kotlin',
+    'bash': 'Bash',
+    'sql': 'SQL',
+    'lua': 'Lua',
+    'perl': 'Perl',
+    'haskell': 'Haskell',
+    'elixir': 'Elixir',
+    'assembly': 'Assembly'
+}
+
 def parse_ts_file(filepath):
     """Parse TypeScript file and extract JSON data"""
-    with open(filepath, 'r', encoding='utf-8') as f:
-        content = f.read()
-
-    json_start = content.find('{')
-    if json_start == -1:
-        return None
-    json_str = content[json_start:].rstrip()
-
-    if json_str.endswith(';'):
-        json_str = json_str[:-1]
-
-    try:
-        return json.loads(json_str)
-    except json.JSONDecodeError as e:
-        print(f"  Warning: Failed to parse {filepath}: {e}")
-        return None
+    return load_ts_data(filepath)
 
 def get_source_files(source_base, language):
     """Get all source files for a language"""
@@ -59,8 +103,8 @@ def escape_csharp_string(s):
     s = s.replace('\t', '\\t')
     return s
 
-def extract_correct_lines(exercise, language):
-    """Extract correct lines from exercise data"""
+def get_correct_lines(exercise):
+    """Return the correct lines of an exercise as plain strings"""
     correct_lines = exercise.get('correctLines', [])
     if not correct_lines:
         # Fallback to correctCode
@@ -78,9 +122,20 @@ def extract_correct_lines(exercise, language):
             continue
         if line is None:
             line = ''
-        result.append(escape_csharp_string(str(line)))
+        result.append(str(line))
     return result
 
+def get_expected_output(exercise):
+    """Return the expected output of an exercise as a list of lines"""
+    expected = exercise.get('expectedOutput') or []
+    if isinstance(expected, str):
+        expected = expected.rstrip('\n').split('\n')
+    return [str(line) for line in expected]
+
+def extract_correct_lines(exercise, language):
+    """Extract correct lines from exercise data"""
+    return [escape_csharp_string(line) for line in get_correct_lines(exercise)]
+
 def extract_comments(correct_lines, language):
     """Extract comment info from correct lines"""
     comment_prefix = get_comment_prefix(language)
@@ -96,34 +151,17 @@ def extract_comments(correct_lines, language):
             })
     return comments
 
-def generate_method_for_language(language, source_files, source_base):
-    """Generate Initialize{Language}Lessons method"""
-
-    # Map language to method name
-    method_names = {
-        'python': 'Python',
-        'javascript': 'JavaScript',
-        'typescript': 'TypeScript',
-        'java': 'Java',
-        'c': 'C',
-        'cpp': 'Cpp',
-        'csharp': 'CSharp',
-        'go': 'Go',
-        'rust': 'Rust',
-        'ruby': 'Ruby',
-        'php': 'PHP',
-        'swift': 'Swift',
-        'kotlin': 'Kotlin',
-        'bash': 'Bash',
-        'sql': 'SQL',
-        'lua': 'Lua',
-        'perl': 'Perl',
-        'haskell': 'Haskell',
-        'elixir': 'Elixir',
-        'assembly': 'Assembly'
-    }
-
-    method_name = method_names.get(language, language.capitalize())
+def generate_method_for_language(language, source_files, source_base, existing_outputs=None):
+    """
+    Generate Initialize{Language}Lessons method
+
+    expectedOutput comes from the reference exercise; where it has none,
+    the value in existing_outputs ({titleKey: lines}, the hand-filled
+    output in the course's LessonDefinitions file) is kept.
+    """
+    existing_outputs = existing_outputs or {}
+
+    method_name = METHOD_NAMES.get(language, language.capitalize())
 
     lines = []
     lines.append(f'    private void Initialize{method_name}Lessons()')
@@ -179,8 +217,14 @@ def generate_method_for_language(language, source_files, source_base):
             else:
                 lines.append('            comments = new List<LocalizedComment>(),')
 
-            # expectedOutput (empty for now)
-            lines.append('            expectedOutput = new List<string>()')
+            # expectedOutput
+            title_key = f'{language}_lesson{lesson_num}_ex{ex_num}_title'
+            expected = get_expected_output(exercise) or existing_outputs.get(title_key, [])
+            if expected:
+                expected_str = ', '.join(f'"{escape_csharp_string(line)}"' for line in expected)
+                lines.append(f'            expectedOutput = new List<string> {{ {expected_str} }}')
+            else:
+                lines.append('            expectedOutput = new List<string>()')
             lines.append('        });')
             lines.append('')
 
@@ -194,33 +238,154 @@ def generate_method_for_language(language, source_files, source_base):
     return '\n'.join(lines)
 
 
+def hash_inputs(source_files):
+    """Hash a language's .ts inputs together with this generator's own source"""
+    h = hashlib.blake2b(digest_size=16)
+    h.update(Path(__file__).read_bytes())
+    for source_file in source_files:
+        h.update(source_file.name.encode('utf-8') + b'\0')
+        h.update(source_file.read_bytes())
+    return h.hexdigest()
+
+def load_state(state_path=STATE_PATH):
+    """Load {language: input hash} from the last run"""
+    try:
+        with open(state_path, 'r', encoding='utf-8') as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if state.get('version') != STATE_VERSION:
+        return {}
+    return state.get('languages', {})
+
+def save_state(languages, state_path=STATE_PATH):
+    state_path.parent.mkdir(parents=True, exist_ok=True)
+    safe_json_dump({'version': STATE_VERSION, 'languages': languages}, state_path)
+
+def marker_lines(language):
+    """Begin/end marker comments around a generated method in LessonManager.cs"""
+    return (f'    // <generated:{language}> generate_lesson_manager.py - do not edit by hand',
+            f'    // </generated:{language}>')
+
+def splice_method(content, language, code):
+    """
+    Put a generated method into LessonManager.cs source text.
+
+    Replaces the block between the language's markers. Without markers,
+    an existing Initialize{Name}Lessons method is replaced in place and
+    wrapped in markers; otherwise the block goes before the last
+    #endregion. Returns (new content, how it was placed).
+    """
+    begin, end = marker_lines(language)
+    block = f'{begin}\n{code}\n{end}'
+
+    start = content.find(begin)
+    if start != -1:
+        stop = content.find(end, start)
+        if stop == -1:
+            raise ValueError(f"LessonManager.cs has no end marker for {language}")
+        return content[:start] + block + content[stop + len(end):], 'replaced'
+
+    method_name = METHOD_NAMES.get(language, language.capitalize())
+    match = re.search(rf'^    private void Initialize{method_name}Lessons\(\)\n    \{{\n.*?^    \}}$',
+                      content, re.MULTILINE | re.DOTALL)
+    if match:
+        # Take a preceding /// summary along, the generated code has none
+        start = match.start()
+        summary = re.search(r'(?:^    ///[^\n]*\n)+\Z', content[:start], re.MULTILINE)
+        if summary:
+            start = summary.start()
+        return content[:start] + block + content[match.end():], 'marked'
+
+    insert_pos = content.rfind('#endregion')
+    if insert_pos == -1:
+        insert_pos = content.rfind('}')
+    line_start = content.rfind('\n', 0, insert_pos) + 1
+    return content[:line_start] + block + '\n\n' + content[line_start:], 'inserted'
+
+def update_lesson_manager(lesson_manager, methods):
+    """Splice {language: code} into LessonManager.cs, writing only if it changed"""
+    with open(lesson_manager, 'r', encoding='utf-8', newline='') as f:
+        original = f.read()
+    newline = '\r\n' if '\r\n' in original else '\n'
+    content = original.replace('\r\n', '\n')
+
+    placed = {}
+    for language, code in methods.items():
+        content, placed[language] = splice_method(content, language, code)
+
+    content = content.replace('\n', newline)
+    if content != original:
+        atomic_write_text(lesson_manager, content, newline='')
+    return placed, content != original
+
 def main():
-    source_base = Path('C:/Work/git/senkou-code/data/lessons')
-    output_dir = Path('C:/Work/MetaXR/ProgramShooting/scripts/generated')
-    output_dir.mkdir(exist_ok=True)
-
-    # Languages to generate (excluding existing ones that are already in LessonManager.cs)
-    new_languages = [
-        'bash', 'csharp', 'elixir', 'go', 'haskell', 'kotlin',
-        'lua', 'perl', 'php', 'ruby', 'rust', 'sql', 'swift'
-    ]
-
-    for language in new_languages:
-        source_files = get_source_files(source_base, language)
+    parser = argparse.ArgumentParser(description='Regenerate LessonManager.cs lesson methods from senkou-code data')
+    parser.add_argument('--source', type=Path, default=SOURCE_BASE,
+                        help='senkou-code data/lessons folder')
+    parser.add_argument('--output', type=Path, default=OUTPUT_DIR,
+                        help='Folder for the generated <language>_lessons.cs files')
+    parser.add_argument('--lesson-manager', type=Path, default=LESSON_MANAGER_PATH,
+                        help='LessonManager.cs to update')
+    parser.add_argument('--definitions', type=Path, default=DEFINITIONS_PATH,
+                        help='LessonDefinitions folder to rebuild for regenerated languages')
+    parser.add_argument('--language', action='append',
+                        help='Only this language (repeatable)')
+    parser.add_argument('--force', action='store_true',
+                        help='Regenerate even if the inputs did not change')
+    parser.add_argument('--splice', action='store_true',
+                        help='Also update the LESSON_CODE_FALLBACK methods in LessonManager.cs')
+    args = parser.parse_args()
+
+    args.output.mkdir(parents=True, exist_ok=True)
+    state = load_state()
+    changed = {}
+    # --splice also needs the unchanged languages: their hash may have been
+    # recorded by a run without --splice, so LessonManager.cs can lag behind
+    to_splice = {}
+
+    from generate_lesson_definitions import expected_outputs, load_course, update_definitions
+
+    for language in args.language or GENERATED_LANGUAGES:
+        source_files = get_source_files(args.source, language)
         if not source_files:
             print(f"No source files for {language}")
             continue
 
-        print(f"Generating {language}...")
-        code = generate_method_for_language(language, source_files, source_base)
-
-        output_file = output_dir / f'{language}_lessons.cs'
-        with open(output_file, 'w', encoding='utf-8') as f:
-            f.write(code)
-
-        print(f"  Written to {output_file}")
+        output_file = args.output / f'{language}_lessons.cs'
+        digest = hash_inputs(source_files)
+        if not args.force and state.get(language) == digest and output_file.exists():
+            print(f"  {language}: unchanged")
+            if args.splice:
+                to_splice[language] = output_file.read_text(encoding='utf-8')
+            continue
 
-    print("\nDone! Check scripts/generated/ for the generated code.")
+        print(f"Generating {language}...")
+        # Hand-filled expectedOutput, kept where the reference has none
+        existing = expected_outputs(load_course(args.definitions, language) or [])
+        code = generate_method_for_language(language, source_files, args.source, existing)
+        previous = output_file.read_text(encoding='utf-8') if output_file.exists() else None
+        if code != previous:
+            atomic_write_text(output_file, code)
+            print(f"  Written to {output_file}")
+        changed[language] = code
+        if args.splice:
+            to_splice[language] = code
+        state[language] = digest
+
+    if changed:
+        update_definitions(args.source, args.definitions, list(changed))
+
+    if to_splice:
+        placed, written = update_lesson_manager(args.lesson_manager, to_splice)
+        for language, how in placed.items():
+            print(f"  LessonManager.cs: {language} {how}")
+        if not written:
+            print("  LessonManager.cs already up to date")
+
+    save_state(state)
+    print(f"\nDone! {len(changed)} language(s) regenerated.")
+    return 0
 
 if __name__ == '__main__':
-    main()
+    sys.exit(main())
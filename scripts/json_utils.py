@@ -6,7 +6,9 @@ Provides sanitization and validation to prevent JSON corruption.
 """
 
 import json
+import os
 import re
+import tempfile
 
 
 def sanitize_text_for_json(text):
@@ -72,27 +74,72 @@ def validate_json_file(filepath):
         return False, str(e), None
 
 
-def safe_json_dump(data, filepath, indent=2):
+def safe_json_dump(data, filepath, indent=2, sort_keys=False, newline=None):
     """
-    Safely write JSON to file with validation.
+    Safely and atomically write JSON to file.
+
+    The document is encoded straight into a temporary file next to the
+    target, which is fsynced and then renamed over it, so the target is
+    either the old file or the complete new one. The encoder only emits
+    valid JSON (NaN/Infinity and circular references are rejected), so no
+    separate validation pass is needed. Output is identical to
+    json.dumps(data, ensure_ascii=False, indent=indent); sort_keys=True
+    gives a canonical key order.
+
+    Raises ValueError if the data cannot be serialized to valid JSON; the
+    target file is left untouched in that case.
+    """
+    encoder = json.JSONEncoder(ensure_ascii=False, indent=indent, sort_keys=sort_keys,
+                               allow_nan=False)
+
+    def write_chunks(f):
+        try:
+            for chunk in encoder.iterencode(data):
+                f.write(chunk)
+        except (TypeError, ValueError) as e:
+            raise ValueError(f"Failed to serialize data: {e}")
+
+    _atomic_write(filepath, write_chunks, newline)
 
-    Raises ValueError if the data cannot be serialized to valid JSON.
+
+def atomic_write_text(filepath, text, newline=None):
     """
-    # First, try to serialize to string to catch any issues
-    try:
-        json_str = json.dumps(data, ensure_ascii=False, indent=indent)
-    except (TypeError, ValueError) as e:
-        raise ValueError(f"Failed to serialize data: {e}")
+    Write text to a file atomically.
 
-    # Validate by parsing it back
-    try:
-        json.loads(json_str)
-    except json.JSONDecodeError as e:
-        raise ValueError(f"Serialized JSON is invalid: {e}")
+    The text goes to a temporary file in the same directory, which then
+    replaces the target, so readers never see a half-written file.
+    """
+    _atomic_write(filepath, lambda f: f.write(text), newline)
 
-    # Write to file
-    with open(filepath, 'w', encoding='utf-8') as f:
-        f.write(json_str)
+
+def _atomic_write(filepath, write, newline=None):
+    """Run write(f) on a temp file in the target's directory, fsync, then rename."""
+    directory = os.path.dirname(os.path.abspath(filepath))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.tmp-', suffix='.json')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8', newline=newline) as f:
+            write(f)
+            f.flush()
+            os.fsync(f.fileno())
+        _copy_file_mode(filepath, tmp_path)
+        os.replace(tmp_path, filepath)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def _copy_file_mode(filepath, tmp_path):
+    """Give the temporary file the target's permissions (mkstemp uses 0600)."""
+    try:
+        mode = os.stat(filepath).st_mode & 0o777
+    except FileNotFoundError:
+        umask = os.umask(0)
+        os.umask(umask)
+        mode = 0o666 & ~umask
+    os.chmod(tmp_path, mode)
 
 
 def sanitize_translation_dict(translations):
@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""
+Structured index of every localization key in Assets/Resources.
+
+Lesson keys follow one grammar:
+
+    {course}_lesson{L}_title
+    {course}_lesson{L}_ex{E}_{field}            (title, description, comment1, ...)
+    {course}_lesson{L}_ex{E}_slide{S}_{field}   (title, content, image)
+
+Instead of every checker regex-matching every key again, build_index()
+parses each key once into a columnar table: one array per column (file,
+locale, course, lesson, exercise, slide, field, key), with strings stored
+once in lookup tables and referenced by integer id. Rows are grouped by
+(course, lesson, exercise) and by key, so a query such as "all slides of
+python lesson 3 ex 4 in every locale" touches only the matching rows.
+
+Parsed keys are cached per file in .validation_cache/lesson_index.json
+(validation_cache.py), so only files whose content hash changed are
+re-read and re-parsed.
+
+Usage:
+    index = build_index()
+    for row in index.rows("python", lesson=3, exercise=4, slide=None):
+        print(row.locale, row.key)
+    structure = index.exercise_structure("python", "ja")
+"""
+
+import json
+import re
+from array import array
+from collections import defaultdict, namedtuple
+from pathlib import Path
+
+from localization_layout import BASE_FILE, RESOURCES_PATH
+from validation_cache import ValidationCache
+
+CACHE_VERSION = 1
+
+KEY_PATTERN = re.compile(
+    r'^(?P<course>[a-z]+)_lesson(?P<lesson>\d+)'
+    r'(?:_ex(?P<exercise>\d+)(?:_slide(?P<slide>\d+))?)?_(?P<field>.+)$')
+
+LESSON_FILE_PATTERN = re.compile(r'^(?P<course>[a-z]+)Lessons_(?P<locale>[A-Za-z-]+)\.json$')
+
+Row = namedtuple('Row', 'file locale course lesson exercise slide field key')
+
+
+def parse_key(key):
+    """
+    Split a key into (course, lesson, exercise, slide, field).
+
+    Numbers are 0 where the key has no such part; course is None for keys
+    outside the lesson grammar (UI strings in localizedText.json).
+    """
+    match = KEY_PATTERN.match(key)
+    if match is None:
+        return None, 0, 0, 0, key
+    return (match.group('course'), int(match.group('lesson')),
+            int(match.group('exercise') or 0), int(match.group('slide') or 0),
+            match.group('field'))
+
+
+def course_of_key(key):
+    """Return the course a key belongs to (the part before the first '_')."""
+    return parse_key(key)[0] or key.partition('_')[0]
+
+
+def split_by_course(mapping):
+    """
+    Group {key: value} into {course: {key: value}} in one pass.
+
+    Replaces one `k.startswith(f"{lang}_")` scan over all keys per course.
+    """
+    grouped = defaultdict(dict)
+    for key, value in mapping.items():
+        grouped[course_of_key(key)][key] = value
+    return dict(grouped)
+
+
+def index_files(resources_path=RESOURCES_PATH):
+    """Return [(path, locale or None)] for the files the index covers."""
+    resources_path = Path(resources_path)
+    files = [(resources_path / BASE_FILE, None)]
+    for path in sorted(resources_path.glob("*Lessons_*.json")):
+        match = LESSON_FILE_PATTERN.match(path.name)
+        if match:
+            files.append((path, match.group('locale')))
+    return files
+
+
+def _parse_file(path, locale):
+    """Return the cached per-file result: {locale: [keys]} in file order."""
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    if locale is not None:
+        return {locale: list(data)}
+    # localizedText.json is nested by locale
+    return {section: list(texts) for section, texts in data.items() if isinstance(texts, dict)}
+
+
+class _StringTable:
+    def __init__(self):
+        self.ids = {}
+        self.values = []
+
+    def id(self, value):
+        i = self.ids.get(value)
+        if i is None:
+            i = self.ids[value] = len(self.values)
+            self.values.append(value)
+        return i
+
+
+class LessonIndex:
+    """Columnar table of parsed keys with (course, lesson, exercise) and key lookups."""
+
+    def __init__(self):
+        self.files = _StringTable()
+        self.locales = _StringTable()
+        self.courses = _StringTable()
+        self.fields = _StringTable()
+        self.keys = _StringTable()
+        self.courses.id(None)
+        self.file_col = array('H')
+        self.locale_col = array('H')
+        self.course_col = array('H')
+        self.lesson_col = array('H')
+        self.exercise_col = array('H')
+        self.slide_col = array('H')
+        self.field_col = array('I')
+        self.key_col = array('I')
+        self._parsed = {}
+        self._by_exercise = defaultdict(lambda: array('I'))
+        self._by_key = defaultdict(lambda: array('I'))
+
+    def __len__(self):
+        return len(self.key_col)
+
+    def add_file(self, name, sections):
+        """Append the rows of one file ({locale: [keys]})."""
+        file_id = self.files.id(name)
+        for locale, keys in sections.items():
+            locale_id = self.locales.id(locale)
+            for key in keys:
+                key_id = self.keys.id(key)
+                parsed = self._parsed.get(key_id)
+                if parsed is None:
+                    course, lesson, exercise, slide, field = parse_key(key)
+                    parsed = self._parsed[key_id] = (self.courses.id(course), lesson, exercise,
+                                                     slide, self.fields.id(field))
+                course_id, lesson, exercise, slide, field_id = parsed
+                row = len(self.key_col)
+                self.file_col.append(file_id)
+                self.locale_col.append(locale_id)
+                self.course_col.append(course_id)
+                self.lesson_col.append(lesson)
+                self.exercise_col.append(exercise)
+                self.slide_col.append(slide)
+                self.field_col.append(field_id)
+                self.key_col.append(key_id)
+                self._by_exercise[(course_id, lesson, exercise)].append(row)
+                self._by_key[key_id].append(row)
+
+    def row(self, i):
+        """Return row i as a Row of plain values."""
+        return Row(self.files.values[self.file_col[i]], self.locales.values[self.locale_col[i]],
+                   self.courses.values[self.course_col[i]], self.lesson_col[i],
+                   self.exercise_col[i], self.slide_col[i],
+                   self.fields.values[self.field_col[i]], self.keys.values[self.key_col[i]])
+
+    def rows(self, course, lesson=None, exercise=None, slide=None, field=None, locale=None):
+        """
+        Yield the rows of a course, narrowed by any of the other columns.
+
+        With lesson and exercise given only that exercise's rows are
+        visited. exercise=0 selects lesson-level keys (lesson titles).
+        """
+        course_id = self.courses.ids.get(course)
+        if course_id is None:
+            return
+        if lesson is not None and exercise is not None:
+            candidates = [self._by_exercise.get((course_id, lesson, exercise), ())]
+        else:
+            candidates = [rows for (c, l, e), rows in self._by_exercise.items()
+                          if c == course_id and (lesson is None or l == lesson)
+                          and (exercise is None or e == exercise)]
+        locale_id = self.locales.ids.get(locale) if locale is not None else None
+        field_id = self.fields.ids.get(field) if field is not None else None
+        if (locale is not None and locale_id is None) or (field is not None and field_id is None):
+            return
+        for group in candidates:
+            for i in group:
+                if slide is not None and self.slide_col[i] != slide:
+                    continue
+                if locale_id is not None and self.locale_col[i] != locale_id:
+                    continue
+                if field_id is not None and self.field_col[i] != field_id:
+                    continue
+                yield self.row(i)
+
+    def locations(self, key):
+        """Return the rows of every file/locale defining key."""
+        key_id = self.keys.ids.get(key)
+        if key_id is None:
+            return []
+        return [self.row(i) for i in self._by_key.get(key_id, ())]
+
+    def exercise_structure(self, course, locale):
+        """
+        Return {lesson: {exercise: {field: True}}} for one course and locale.
+
+        Slide fields are named "slide{N}_{field}" as in the keys, matching
+        what validate_lesson_data used to build with its own regex.
+        """
+        exercises = defaultdict(lambda: defaultdict(dict))
+        for row in self.rows(course, locale=locale):
+            if not row.exercise:
+                continue
+            field = f"slide{row.slide}_{row.field}" if row.slide else row.field
+            exercises[row.lesson][row.exercise][field] = True
+        return exercises
+
+
+def build_index(resources_path=RESOURCES_PATH, use_cache=True):
+    """Build the index, re-parsing only files whose content changed."""
+    cache = ValidationCache("lesson_index", CACHE_VERSION, enabled=use_cache)
+    index = LessonIndex()
+    for path, locale in index_files(resources_path):
+        sections = cache.lookup(path)
+        if sections is None:
+            fingerprint = cache.fingerprint(path)
+            try:
+                sections = _parse_file(path, locale)
+            except (OSError, ValueError):
+                continue
+            cache.store(path, sections, fingerprint)
+        index.add_file(path.name, sections)
+    cache.save()
+    index.cache_summary = cache.summary()
+    return index
+
+
+if __name__ == "__main__":
+    import time
+    start = time.perf_counter()
+    idx = build_index()
+    print(f"{len(idx)} rows, {len(idx.keys.values)} keys, {len(idx.files.values)} files "
+          f"in {time.perf_counter() - start:.2f}s ({idx.cache_summary})")
@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+Key coverage matrix for every course and locale.
+
+Every key gets an integer id, and every (course, locale) file becomes a
+bitset (a Python int with bit `id` set for each key it defines). Missing
+and extra keys for a whole course are then a handful of big-int AND /
+AND-NOT operations and int.bit_count() calls, instead of building and
+diffing Python sets pair by pair.
+
+Coverage follows LocalizationManager's merge: keys in `<course>_common.json`
+count as present in every locale. The expected key set of a course is the
+reference locale's file plus `_common` (ja by default: Japanese is the
+primary content and most courses have no English file).
+
+Output is one matrix, rows = courses (plus localizedText.json),
+columns = locales, cells = coverage %. --csv writes the matrix, --json
+the per-cell counts with sample missing keys.
+
+Usage:
+    python localization_coverage.py [--reference ja] [--csv coverage.csv] [--json coverage.json]
+"""
+
+import argparse
+import csv
+import json
+import sys
+import time
+from pathlib import Path
+
+from localization_layout import ALL_LANG_CODES, BASE_FILE, LESSON_BASES, RESOURCES_PATH
+
+
+class KeyIndex:
+    """Assigns stable integer ids to keys and converts key sets to bitsets."""
+
+    def __init__(self):
+        self.ids = {}
+        self.keys = []
+
+    def bitset(self, keys):
+        """Return an int with the bit of every key set (new keys get ids)."""
+        ids = self.ids
+        for key in keys:
+            if key not in ids:
+                ids[key] = len(self.keys)
+                self.keys.append(key)
+        bits = bytearray((len(self.keys) + 7) // 8)
+        for key in keys:
+            i = ids[key]
+            bits[i >> 3] |= 1 << (i & 7)
+        return int.from_bytes(bits, 'little')
+
+    def members(self, bitset, limit=None):
+        """Return the keys in a bitset, in id order (at most limit)."""
+        result = []
+        data = bitset.to_bytes((bitset.bit_length() + 7) // 8, 'little')
+        for byte_index, byte in enumerate(data):
+            while byte:
+                low = byte & -byte
+                result.append(self.keys[byte_index * 8 + low.bit_length() - 1])
+                if limit is not None and len(result) >= limit:
+                    return result
+                byte ^= low
+        return result
+
+
+def _load(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def load_columns(resources_path, index, locales=ALL_LANG_CODES):
+    """
+    Read every localization file into bitsets.
+
+    Returns {course: {"common": bits, "locales": {locale: bits}}}; the base
+    file appears as a course whose sections are its locales.
+    """
+    resources_path = Path(resources_path)
+    courses = {}
+
+    base = _load(resources_path / BASE_FILE)
+    courses[BASE_FILE] = {
+        "common": 0,
+        "locales": {locale: index.bitset(texts) for locale, texts in base.items()
+                    if isinstance(texts, dict)},
+    }
+
+    for course in LESSON_BASES:
+        common_path = resources_path / f"{course}_common.json"
+        columns = {}
+        for locale in locales:
+            path = resources_path / f"{course}_{locale}.json"
+            if path.exists():
+                columns[locale] = index.bitset(_load(path))
+        courses[course] = {
+            "common": index.bitset(_load(common_path)) if common_path.exists() else 0,
+            "locales": columns,
+        }
+    return courses
+
+
+def coverage_matrix(courses, index, reference="ja", locales=ALL_LANG_CODES, samples=5):
+    """
+    Compute {course: {"expected": n, "reference": locale, "locales": {locale: cell}}}.
+
+    Each cell has present / missing / extra counts, coverage (0-100, None
+    without a reference) and a few missing keys.
+    """
+    matrix = {}
+    for course, data in courses.items():
+        columns = data["locales"]
+        common = data["common"]
+        ref_locale = reference if reference in columns else next(iter(columns), None)
+        expected = (columns[ref_locale] if ref_locale else 0) | common
+        expected_count = expected.bit_count()
+
+        cells = {}
+        for locale in locales:
+            have = columns.get(locale, 0) | common
+            missing = expected & ~have
+            extra = have & ~expected
+            present = expected_count - missing.bit_count()
+            cells[locale] = {
+                "file": locale in columns,
+                "present": present,
+                "missing": missing.bit_count(),
+                "extra": extra.bit_count(),
+                "coverage": round(present / expected_count * 100, 1) if expected_count else None,
+                "missing_keys": index.members(missing, samples),
+            }
+        matrix[course] = {"reference": ref_locale, "expected": expected_count, "locales": cells}
+    return matrix
+
+
+def write_csv(matrix, locales, path):
+    """Rows = courses, columns = locales, cells = coverage %."""
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(["course", "reference", "expected"] + list(locales))
+        for course, row in matrix.items():
+            writer.writerow([course, row["reference"], row["expected"]]
+                            + ["" if row["locales"][l]["coverage"] is None else row["locales"][l]["coverage"]
+                               for l in locales])
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compute the course x locale key coverage matrix')
+    parser.add_argument('--path', type=Path, default=RESOURCES_PATH,
+                        help='Resources folder')
+    parser.add_argument('--reference', default='ja',
+                        help='Locale whose keys each course is expected to have (default: ja)')
+    parser.add_argument('--csv', type=Path,
+                        help='Write the coverage matrix as CSV')
+    parser.add_argument('--json', type=Path,
+                        help='Write per-cell counts and sample missing keys as JSON')
+    parser.add_argument('--samples', type=int, default=5,
+                        help='Missing keys to keep per cell (default: 5)')
+    args = parser.parse_args()
+
+    locales = ALL_LANG_CODES
+    start = time.perf_counter()
+    index = KeyIndex()
+    courses = load_columns(args.path, index, locales)
+    loaded = time.perf_counter()
+    matrix = coverage_matrix(courses, index, args.reference, locales, args.samples)
+    computed = time.perf_counter()
+
+    print("=" * 60)
+    print("Localization Key Coverage")
+    print("=" * 60)
+    print(f"Keys indexed: {len(index.keys)}  Courses: {len(matrix)}  Locales: {len(locales)}")
+    print(f"Load: {loaded - start:.2f}s  Matrix: {(computed - loaded) * 1000:.1f}ms")
+
+    header = f"\n{'course':<22}" + "".join(f"{l[:7]:>8}" for l in locales)
+    print(header)
+    incomplete = 0
+    for course, row in matrix.items():
+        cells = []
+        for locale in locales:
+            cell = row["locales"][locale]
+            if cell["coverage"] is None:
+                cells.append("-")
+                continue
+            if cell["missing"]:
+                incomplete += 1
+            cells.append(f"{cell['coverage']:.1f}" + ("" if cell["file"] else "*"))
+        name = course.replace("Lessons", "").replace(".json", "")
+        print(f"{name:<22}" + "".join(c.rjust(8) for c in cells))
+    print("\n* = no file for that locale (only _common keys)")
+    print(f"Cells with missing keys: {incomplete}")
+
+    if args.csv:
+        write_csv(matrix, locales, args.csv)
+        print(f"\nMatrix written to {args.csv}")
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({"locales": locales, "courses": matrix}, f, ensure_ascii=False, indent=2)
+        print(f"Details written to {args.json}")
+
+    return 1 if incomplete else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Python mirror of how LocalizationManager.cs assembles its string tables.
+
+At startup LocalizationManager loads localizedText.json, then for every
+lesson base name applies `<base>_common` to every language and afterwards
+`<base>_<locale>` to that language. Later writes win. The build and
+analysis scripts use load_merged_locales() to reproduce exactly what the
+game ends up with, without going through Unity.
+
+Keep LESSON_BASES and LANG_CODES in sync with LocalizationManager.cs.
+"""
+
+import json
+from pathlib import Path
+
+RESOURCES_PATH = Path(__file__).parent.parent / "Assets" / "Resources"
+
+# Same order as lessonFiles in LocalizationManager.LoadLocalizationData()
+LESSON_BASES = [
+    "pythonLessons", "javascriptLessons", "typescriptLessons", "javaLessons",
+    "cLessons", "cppLessons", "csharpLessons", "assemblyLessons",
+    "goLessons", "rustLessons", "rubyLessons", "phpLessons",
+    "swiftLessons", "kotlinLessons", "bashLessons", "sqlLessons",
+    "luaLessons", "perlLessons", "haskellLessons", "elixirLessons"
+]
+
+# Same order as langCodes in LocalizationManager.LoadLocalizationData()
+LANG_CODES = [
+    "en", "ja", "cs", "de", "nl", "da", "el", "fi", "fr", "it",
+    "ko", "no", "pl", "pt", "ro", "ru", "es", "sv", "tr", "zh-Hans", "zh-Hant"
+]
+
+# Locales with lesson files that LocalizationManager does not load (yet)
+EXTRA_LANG_CODES = ["uk", "vi"]
+
+# Every locale the checking scripts expect a translation for
+ALL_LANG_CODES = LANG_CODES + EXTRA_LANG_CODES
+
+BASE_FILE = "localizedText.json"
+
+
+def _load_json(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def source_files(resources_path=RESOURCES_PATH):
+    """Return every JSON file LocalizationManager reads, in load order."""
+    resources_path = Path(resources_path)
+    files = [resources_path / BASE_FILE]
+    for base in LESSON_BASES:
+        for suffix in ["common"] + LANG_CODES:
+            path = resources_path / f"{base}_{suffix}.json"
+            if path.exists():
+                files.append(path)
+    return files
+
+
+def load_merged_locales(resources_path=RESOURCES_PATH, locales=None, overrides=None):
+    """
+    Return {locale: {key: text}} exactly as LocalizationManager builds it.
+
+    `locales` limits the result to the given locales (the merge is still
+    done in the runtime's order). `overrides` maps a file name such as
+    "pythonLessons_common.json" to data to use instead of the file on disk,
+    so a proposed rewrite can be checked before it is written.
+    """
+    resources_path = Path(resources_path)
+    overrides = overrides or {}
+
+    def read(name):
+        if name in overrides:
+            return overrides[name]
+        path = resources_path / name
+        if not path.exists():
+            return None
+        return _load_json(path)
+
+    base = read(BASE_FILE) or {}
+    wanted = set(locales) if locales is not None else None
+    merged = {locale: dict(texts) for locale, texts in base.items()
+              if wanted is None or locale in wanted}
+
+    for base_name in LESSON_BASES:
+        common = read(f"{base_name}_common.json")
+        if common:
+            for texts in merged.values():
+                texts.update(common)
+
+        for locale in LANG_CODES:
+            if locale not in merged:
+                continue
+            data = read(f"{base_name}_{locale}.json")
+            if data:
+                merged[locale].update(data)
+
+    return merged
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Local mock of the Google Translate endpoint, for offline benchmarks.
+
+Answers GET or POST /translate_a/single the way the real endpoint does
+([[["translation", "source", ...]], None, "sl"]), with the text tagged by
+the target language instead of translated. Connections are kept alive,
+so async_translation's connection pool is exercised as well.
+
+Usage:
+    python mock_translate_server.py --port 8765 --latency 0.2
+    TRANSLATE_ENDPOINT=http://127.0.0.1:8765/translate_a/single python translate_single_file.py ...
+
+    # Sequential one-connection-per-call baseline vs AsyncTranslator
+    python mock_translate_server.py --benchmark 200 --latency 0.05
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import sys
+import threading
+import time
+import urllib.request
+from urllib.parse import parse_qs, urlencode, urlsplit
+
+from async_translation import AsyncTranslator
+
+
+class MockTranslateServer:
+    """Asyncio HTTP/1.1 server answering like translate_a/single."""
+
+    def __init__(self, host="127.0.0.1", port=0, latency=0.0, fail_rate=0.0):
+        self.host = host
+        self.port = port
+        self.latency = latency
+        self.fail_rate = fail_rate
+        self.requests = 0
+        self.connections = 0
+        self._server = None
+
+    async def start(self):
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    @property
+    def endpoint(self):
+        return f"http://{self.host}:{self.port}/translate_a/single"
+
+    async def _handle(self, reader, writer):
+        self.connections += 1
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, target, _ = request_line.decode("latin-1").split(" ", 2)
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get("content-length", 0)))
+
+                status, payload = await self._respond(method, target, body)
+                writer.write((f"HTTP/1.1 {status} {'OK' if status == 200 else 'Error'}\r\n"
+                              f"Content-Type: application/json; charset=utf-8\r\n"
+                              f"Content-Length: {len(payload)}\r\n\r\n").encode("ascii") + payload)
+                await writer.drain()
+                if headers.get("connection", "").lower() == "close":
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def _respond(self, method, target, body):
+        self.requests += 1
+        parts = urlsplit(target)
+        params = parse_qs(parts.query)
+        if method == "POST":
+            params.update(parse_qs(body.decode("utf-8")))
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        if parts.path != "/translate_a/single":
+            return 404, b'{"error": "not found"}'
+        if random.random() < self.fail_rate:
+            return 429, b'{"error": "too many requests (mock)"}'
+
+        text = params.get("q", [""])[0]
+        source = params.get("sl", ["auto"])[0]
+        target_lang = params.get("tl", ["en"])[0]
+        data = [[[f"[{target_lang}] {text}", text, None, None]], None, source]
+        return 200, json.dumps(data, ensure_ascii=False).encode("utf-8")
+
+    def close(self):
+        if self._server is not None:
+            self._server.close()
+
+
+def serve_in_thread(**kwargs):
+    """Start a MockTranslateServer on its own loop thread and return it."""
+    loop = asyncio.new_event_loop()
+    threading.Thread(target=loop.run_forever, name="mock-translate", daemon=True).start()
+    return asyncio.run_coroutine_threadsafe(MockTranslateServer(**kwargs).start(), loop).result()
+
+
+def sequential_baseline(endpoint, texts, src, dest):
+    """One urllib request (and connection) per text, like the old scripts."""
+    for text in texts:
+        query = urlencode({"client": "gtx", "dt": "t", "sl": src, "tl": dest, "q": text})
+        with urllib.request.urlopen(f"{endpoint}?{query}") as response:
+            json.loads(response.read().decode("utf-8"))
+
+
+def benchmark(count, latency, in_flight, rate):
+    server = serve_in_thread(latency=latency)
+    texts = [f"テキスト {i}" for i in range(count)]
+
+    print("=" * 60)
+    print(f"Mock translate benchmark: {count} texts, {latency * 1000:.0f} ms latency")
+    print("=" * 60)
+
+    start = time.perf_counter()
+    sequential_baseline(server.endpoint, texts, "ja", "en")
+    sequential = time.perf_counter() - start
+    baseline_connections = server.connections
+    print(f"Sequential:  {sequential:6.2f}s  {count / sequential:7.1f} texts/s  "
+          f"({baseline_connections} connections)")
+
+    translator = AsyncTranslator(endpoint=server.endpoint, max_in_flight=in_flight,
+                                 rate_per_host=rate, burst=in_flight)
+    start = time.perf_counter()
+    results = translator.translate_many(texts, "ja", "en")
+    concurrent = time.perf_counter() - start
+    failures = sum(isinstance(r, Exception) for r in results)
+    print(f"Async:       {concurrent:6.2f}s  {count / concurrent:7.1f} texts/s  "
+          f"({translator.connections_opened} connections, {in_flight} in flight, {rate:g}/s)")
+    translator.close()
+
+    ok = failures == 0 and results[0] == f"[en] {texts[0]}"
+    print(f"\n[{'OK' if ok else 'NG'}] {count - failures}/{count} translated, "
+          f"speedup x{sequential / concurrent:.1f}")
+    return 0 if ok else 1
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Mock Google Translate endpoint for offline benchmarks')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency', type=float, default=0.1,
+                        help='Seconds to wait before each answer (default: 0.1)')
+    parser.add_argument('--fail-rate', type=float, default=0.0,
+                        help='Probability of answering 429 (default: 0)')
+    parser.add_argument('--benchmark', type=int, metavar='N',
+                        help='Translate N texts sequentially and with AsyncTranslator, then exit')
+    parser.add_argument('--in-flight', type=int, default=16,
+                        help='Concurrent requests for --benchmark (default: 16)')
+    parser.add_argument('--rate', type=float, default=1000.0,
+                        help='Requests per second for --benchmark (default: 1000)')
+    args = parser.parse_args()
+
+    if args.benchmark:
+        return benchmark(args.benchmark, args.latency, args.in_flight, args.rate)
+
+    async def serve():
+        server = await MockTranslateServer(args.host, args.port, args.latency, args.fail_rate).start()
+        print(f"Serving {server.endpoint} (Ctrl+C to stop)")
+        await asyncio.Event().wait()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
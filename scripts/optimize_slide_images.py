@@ -0,0 +1,376 @@
+#!/usr/bin/env python3
+"""
+Slide image optimization pipeline.
+
+Everything under Assets/Resources ships in the APK, referenced or not.
+This script:
+
+1. Groups duplicate images under SlideImages/ and illustrations/:
+   - byte-identical files (same content hash)
+   - pixel-identical files (same image data, different metadata or
+     compression)
+   - perceptually identical files (same difference hash), when Pillow
+     is installed
+2. Picks one canonical path per group and rewrites the `_image` keys in
+   `*Lessons_common.json` to point at it
+3. Recompresses images losslessly: drops metadata segments from JPEG
+   data (Exif/XMP, Photoshop and C2PA blocks; JFIF, ICC and Adobe
+   segments are kept) and re-deflates PNG image data at level 9. The
+   decoded pixels are unchanged, which is checked before writing.
+4. Reports images that no lesson or localization file references
+
+Usage:
+    python optimize_slide_images.py                 # report only
+    python optimize_slide_images.py --apply         # rewrite keys, recompress
+    python optimize_slide_images.py --list-unreferenced
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import struct
+import sys
+import tempfile
+import zlib
+from collections import defaultdict
+from pathlib import Path
+
+from json_utils import safe_json_dump
+from slide_images import (RESOURCES_PATH, image_format, iter_image_references,
+                          iter_jpeg_segments, iter_png_chunks, list_image_files,
+                          normalize_reference)
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+# JPEG segments that affect decoding or colour and must survive stripping
+KEEP_JPEG_APP = {0xE0, 0xE2, 0xEE}  # JFIF, ICC profile, Adobe colour transform
+JPEG_COMMENT = 0xFE
+
+# PNG chunks that affect how pixels are displayed
+KEEP_PNG_CHUNKS = {b"IHDR", b"PLTE", b"tRNS", b"gAMA", b"cHRM", b"sRGB", b"iCCP", b"sBIT"}
+
+
+def pixel_digest(data):
+    """
+    Hash the parts of an image that determine its pixels.
+
+    JPEG: quantization/Huffman tables, frame and scan data (not APPn/COM).
+    PNG: header, palette, transparency and the decompressed image data.
+    Returns None for unknown formats.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    fmt = image_format(data)
+    if fmt == "jpeg":
+        for marker, payload in iter_jpeg_segments(data):
+            if 0xE0 <= marker <= 0xEF or marker == JPEG_COMMENT:
+                continue
+            digest.update(bytes([marker]))
+            digest.update(payload)
+    elif fmt == "png":
+        idat = zlib.decompressobj()
+        for kind, payload in iter_png_chunks(data):
+            if kind == b"IDAT":
+                digest.update(idat.decompress(payload))
+            elif kind in (b"IHDR", b"PLTE", b"tRNS"):
+                digest.update(kind + payload)
+        digest.update(idat.flush())
+    else:
+        return None
+    return digest.hexdigest()
+
+
+def perceptual_hash(path, size=8):
+    """Return a 64-bit difference hash of the image, or None without Pillow."""
+    if Image is None:
+        return None
+    try:
+        with Image.open(path) as img:
+            gray = img.convert("L").resize((size + 1, size), Image.LANCZOS)
+            pixels = list(gray.getdata())
+    except (OSError, ValueError):
+        return None
+    bits = 0
+    for row in range(size):
+        for col in range(size):
+            left = pixels[row * (size + 1) + col]
+            right = pixels[row * (size + 1) + col + 1]
+            bits = (bits << 1) | (left > right)
+    return bits
+
+
+def strip_jpeg(data):
+    """Return JPEG data without metadata segments."""
+    out = bytearray(b"\xff\xd8")
+    for marker, payload in iter_jpeg_segments(data):
+        if marker == 0xDA:
+            out += b"\xff\xda" + payload
+        elif (0xE0 <= marker <= 0xEF and marker not in KEEP_JPEG_APP) or marker == JPEG_COMMENT:
+            continue
+        else:
+            out += struct.pack(">BBH", 0xFF, marker, len(payload) + 2) + payload
+    return bytes(out)
+
+
+def _png_chunk(kind, payload):
+    crc = zlib.crc32(kind + payload) & 0xFFFFFFFF
+    return struct.pack(">I", len(payload)) + kind + payload + struct.pack(">I", crc)
+
+
+def recompress_png(data):
+    """Return PNG data with ancillary chunks dropped and IDAT re-deflated."""
+    chunks = []
+    idat = bytearray()
+    for kind, payload in iter_png_chunks(data):
+        if kind == b"IDAT":
+            idat += payload
+        elif kind in KEEP_PNG_CHUNKS:
+            chunks.append((kind, payload))
+
+    compressor = zlib.compressobj(9, zlib.DEFLATED, 15, 9)
+    packed = compressor.compress(zlib.decompress(bytes(idat))) + compressor.flush()
+
+    out = bytearray(data[:8])
+    for kind, payload in chunks:
+        out += _png_chunk(kind, payload)
+    out += _png_chunk(b"IDAT", packed)
+    out += _png_chunk(b"IEND", b"")
+    return bytes(out)
+
+
+def optimize_image(data):
+    """
+    Return losslessly smaller image bytes, or None if nothing was gained.
+
+    Raises ValueError if the result would decode to different pixels.
+    """
+    fmt = image_format(data)
+    if fmt == "jpeg":
+        optimized = strip_jpeg(data)
+    elif fmt == "png":
+        optimized = recompress_png(data)
+    else:
+        return None
+    if len(optimized) >= len(data):
+        return None
+    if pixel_digest(optimized) != pixel_digest(data):
+        raise ValueError("optimized image decodes differently")
+    return optimized
+
+
+def write_image(path, data):
+    """Replace an image file atomically, keeping its permissions."""
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix='.tmp-')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.chmod(tmp_path, os.stat(path).st_mode & 0o777)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+
+class _UnionFind:
+    def __init__(self):
+        self.parent = {}
+
+    def find(self, item):
+        self.parent.setdefault(item, item)
+        while self.parent[item] != item:
+            self.parent[item] = self.parent[self.parent[item]]
+            item = self.parent[item]
+        return item
+
+    def union(self, a, b):
+        self.parent[self.find(a)] = self.find(b)
+
+
+def find_duplicate_groups(resources_path, images, use_perceptual=True, max_distance=0):
+    """
+    Group images that are byte-, pixel- or perceptually identical.
+
+    Returns (groups, stats) where groups is a list of sorted path lists
+    with more than one member.
+    """
+    by_bytes = defaultdict(list)
+    by_pixels = defaultdict(list)
+    hashes = {}
+    for rel in images:
+        path = resources_path / rel
+        data = path.read_bytes()
+        by_bytes[hashlib.blake2b(data, digest_size=16).hexdigest()].append(rel)
+        try:
+            digest = pixel_digest(data)
+        except (ValueError, zlib.error, struct.error):
+            digest = None
+        if digest:
+            by_pixels[digest].append(rel)
+        if use_perceptual:
+            phash = perceptual_hash(path)
+            if phash is not None:
+                hashes[rel] = phash
+
+    uf = _UnionFind()
+    stats = {"bytes": 0, "pixels": 0, "perceptual": 0}
+    for kind, table in (("bytes", by_bytes), ("pixels", by_pixels)):
+        for members in table.values():
+            for other in members[1:]:
+                if uf.find(other) != uf.find(members[0]):
+                    uf.union(other, members[0])
+                    stats[kind] += 1
+
+    if hashes:
+        items = sorted(hashes.items())
+        for i, (rel_a, hash_a) in enumerate(items):
+            for rel_b, hash_b in items[i + 1:]:
+                if bin(hash_a ^ hash_b).count("1") <= max_distance and \
+                        uf.find(rel_a) != uf.find(rel_b):
+                    uf.union(rel_a, rel_b)
+                    stats["perceptual"] += 1
+
+    groups = defaultdict(list)
+    for rel in images:
+        groups[uf.find(rel)].append(rel)
+    return [sorted(members) for members in groups.values() if len(members) > 1], stats
+
+
+def choose_canonical(members, reference_counts):
+    """Prefer the most referenced path, then illustrations/, then the shortest."""
+    return min(members, key=lambda rel: (-reference_counts.get(rel, 0),
+                                          not rel.startswith("illustrations/"),
+                                          len(rel), rel))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Deduplicate and losslessly recompress slide images')
+    parser.add_argument('--path', type=Path, default=RESOURCES_PATH,
+                        help='Resources folder')
+    parser.add_argument('--apply', action='store_true',
+                        help='Rewrite _image keys and recompress images (default: report only)')
+    parser.add_argument('--no-perceptual', action='store_true',
+                        help='Skip perceptual matching')
+    parser.add_argument('--max-distance', type=int, default=0,
+                        help='Max difference-hash bit distance for perceptual matches (default: 0)')
+    parser.add_argument('--list-unreferenced', action='store_true',
+                        help='Print every unreferenced image')
+    args = parser.parse_args()
+    resources_path = args.path
+
+    print("=" * 60)
+    print("Slide Image Optimization")
+    print("=" * 60)
+
+    images = list_image_files(resources_path)
+    total_bytes = sum(images.values())
+    print(f"Images: {len(images)} ({total_bytes / 1024 / 1024:.1f} MB)")
+
+    references = list(iter_image_references(resources_path))
+    reference_counts = defaultdict(int)
+    for _name, _locale, _key, value in references:
+        reference_counts[normalize_reference(value)] += 1
+
+    # 1. Duplicates
+    use_perceptual = not args.no_perceptual
+    if use_perceptual and Image is None:
+        print("Perceptual matching skipped (Pillow not installed)")
+        use_perceptual = False
+    groups, stats = find_duplicate_groups(resources_path, images, use_perceptual, args.max_distance)
+
+    canonical = {}
+    redundant_bytes = 0
+    for members in groups:
+        keep = choose_canonical(members, reference_counts)
+        for rel in members:
+            canonical[rel] = keep
+            if rel != keep:
+                redundant_bytes += images[rel]
+
+    print(f"\nDuplicate groups: {len(groups)}")
+    print(f"  byte-identical matches:       {stats['bytes']}")
+    print(f"  pixel-identical matches:      {stats['pixels']}")
+    print(f"  perceptually identical:       {stats['perceptual']}")
+    print(f"  redundant copies:             {sum(len(g) - 1 for g in groups)} "
+          f"({redundant_bytes / 1024 / 1024:.1f} MB)")
+
+    # 2. Rewrite _image keys in *Lessons_common.json
+    rewrites = defaultdict(dict)
+    for name, locale, key, value in iter_image_references(resources_path, "*Lessons_common.json"):
+        if locale is not None:
+            continue  # only flat keys are rewritten
+        rel = normalize_reference(value)
+        target = canonical.get(rel, rel)
+        if target != rel:
+            rewrites[name][key] = "/" + target
+    rewrite_count = sum(len(keys) for keys in rewrites.values())
+    print(f"\n_image keys to rewrite: {rewrite_count} in {len(rewrites)} files")
+
+    # Paths still referenced after the rewrite. Only the _image keys of
+    # *Lessons_common.json move to the canonical path; references from
+    # localizedText.json and per-locale files keep pointing at their copy.
+    referenced = set()
+    for name, locale, key, value in references:
+        rewritten = rewrites.get(name, {}).get(key) if locale is None else None
+        referenced.add(normalize_reference(rewritten) if rewritten else normalize_reference(value))
+
+    # 3. Lossless recompression
+    optimized = {}
+    failed = []
+    for rel in images:
+        if canonical.get(rel, rel) != rel and rel not in referenced:
+            continue  # a duplicate that will no longer be referenced
+        data = (resources_path / rel).read_bytes()
+        try:
+            result = optimize_image(data)
+        except (ValueError, zlib.error, struct.error) as e:
+            failed.append(f"{rel}: {e}")
+            continue
+        if result is not None:
+            optimized[rel] = result
+    saved = sum(images[rel] - len(data) for rel, data in optimized.items())
+    print(f"\nLossless recompression: {len(optimized)} images, "
+          f"{saved / 1024 / 1024:.1f} MB saved")
+    for problem in failed:
+        print(f"  [NG] {problem}")
+
+    # 4. Unreferenced images (after the rewrite)
+    unreferenced = [rel for rel in images if rel not in referenced]
+    unreferenced_bytes = sum(images[rel] for rel in unreferenced)
+    missing = sorted(rel for rel in reference_counts if rel not in images)
+    print(f"\nUnreferenced images: {len(unreferenced)} "
+          f"({unreferenced_bytes / 1024 / 1024:.1f} MB)")
+    by_dir = defaultdict(int)
+    for rel in unreferenced:
+        by_dir[rel.rsplit("/", 1)[0]] += 1
+    for directory, count in sorted(by_dir.items()):
+        print(f"  {directory}/: {count}")
+    if args.list_unreferenced:
+        for rel in unreferenced:
+            print(f"    {rel}")
+    if missing:
+        print(f"Referenced but missing: {len(missing)} (see find_image_orphans.py)")
+
+    if not args.apply:
+        print("\nDry run - use --apply to rewrite keys and recompress images")
+        return 0
+
+    for name, keys in rewrites.items():
+        path = resources_path / name
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        data.update(keys)
+        safe_json_dump(data, path)
+    for rel, data in optimized.items():
+        write_image(resources_path / rel, data)
+    print(f"\nRewrote {len(rewrites)} JSON files, recompressed {len(optimized)} images")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
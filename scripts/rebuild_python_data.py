@@ -1,5 +1,6 @@
 import os
-import re
+
+from ts_lesson_parser import load_lesson
 
 def esc(s):
     if not s: return ""
@@ -9,63 +10,6 @@ def esc(s):
     s = s.replace(q, b+q)
     return s
 
-def get_ex(c):
-    start_match = re.search(r'exercises\s*:\s*\[', c)
-    if not start_match:
-        start_match = re.search(r'["\']exercises["\']\s*:\s*\[', c)
-    if not start_match: return []
-    
-    start_pos = start_match.end()
-    txt = c[start_pos:]
-    
-    res = []
-    depth = 0
-    in_dq = False
-    in_sq = False
-    in_bt = False
-    bs = chr(92)
-    dq = chr(34)
-    sq = chr(39)
-    bt = chr(96)
-    current_ex_start = -1
-    i = 0
-    length = len(txt)
-    while i < length:
-        char = txt[i]
-        escaped = False
-        if i > 0 and txt[i-1] == bs:
-            bc = 0
-            k = i - 1
-            while k >= 0 and txt[k] == bs:
-                bc += 1
-                k -= 1
-            if bc % 2 == 1: escaped = True
-        if not escaped:
-            if in_dq:
-                if char == dq: in_dq = False
-            elif in_sq:
-                if char == sq: in_sq = False
-            elif in_bt:
-                if char == bt: in_bt = False
-            else:
-                if char == dq: in_dq = True
-                elif char == sq: in_sq = True
-                elif char == bt: in_bt = True
-                elif char == "{":
-                    if depth == 0: current_ex_start = i
-                    depth += 1
-                elif char == "}":
-                    depth -= 1
-                    if depth == 0 and current_ex_start != -1:
-                        res.append(txt[current_ex_start:i+1])
-                        current_ex_start = -1
-                elif char == "[": depth += 1
-                elif char == "]":
-                    if depth == 0: break
-                    depth -= 1
-        i += 1
-    return res
-
 def parse_it():
     base = "C:/Work/git/senkou-code/data/lessons"
     all_data = []
@@ -74,44 +18,33 @@ def parse_it():
         p = os.path.join(base, fn)
         if not os.path.exists(p): continue
         print("File: " + fn)
-        with open(p, "r", encoding="utf-8") as f:
-            exs = get_ex(f.read())
-            print("  Items: " + str(len(exs)))
-            ls = []
-            for e in exs:
-                d = {}
-                bs = chr(92)
-                
-                mt = re.search(r'title\s*:\s*(["\'])(.*?)\1', e)
-                if mt: d["title"] = mt.group(2)
-                
-                ml = re.search(r'correctLines\s*:\s*\[(.*?)\]', e, re.DOTALL)
-                if ml:
-                    content = ml.group(1)
-                    pat = r'(["\''"])(\1)'
-                    matches = re.findall(pat, content, re.DOTALL)
-                    d["lines"] = [m[1] for m in matches]
-                
-                if "lines" not in d:
-                    mc = re.search(r'code\s*:\s*`([^`]*)`', e, re.DOTALL)
-                    if not mc: mc = re.search(r'code\s*:\s*(["\'])(.*?)\1', e, re.DOTALL)
-                    if mc:
-                        content = mc.group(1) if len(mc.groups()) == 1 else mc.group(2)
-                        d["lines"] = content.replace(chr(13), "").split(chr(10))
-                
-                mc = re.search(r'comments\s*:\s*\[(.*?)\]', e, re.DOTALL)
-                if mc:
-                    d["comments"] = []
-                    parts = re.findall(r'line\s*:\s*(\d+).*?text\s*:\s*(["\'])(.*?)\2', mc.group(1), re.DOTALL)
-                    for ln, q, txt in parts:
-                        d["comments"].append({"line": int(ln), "text": txt})
-                
-                mt = re.search(r'expected_output\s*:\s*(["\'])(.*?)\1', e, re.DOTALL)
-                if mt:
-                    d["out"] = mt.group(2).replace(bs + "n", chr(10)).split(chr(10))
-                
-                ls.append(d)
-            all_data.append(ls)
+        lesson = load_lesson(p)
+        exs = lesson.exercises if lesson else []
+        print("  Items: " + str(len(exs)))
+        ls = []
+        for e in exs:
+            d = {}
+            if e.title: d["title"] = e.title
+
+            if e.correct_lines:
+                d["lines"] = [l for l in e.correct_lines if isinstance(l, str)]
+            else:
+                code = e.raw.get("code") or e.correct_code
+                if code:
+                    d["lines"] = code.replace(chr(13), "").split(chr(10))
+
+            if isinstance(e.raw.get("comments"), list):
+                d["comments"] = []
+                for c in e.raw["comments"]:
+                    if isinstance(c, dict) and "line" in c and "text" in c:
+                        d["comments"].append({"line": int(c["line"]), "text": c["text"]})
+
+            out = e.raw.get("expected_output")
+            if isinstance(out, str):
+                d["out"] = out.split(chr(10))
+
+            ls.append(d)
+        all_data.append(ls)
     return all_data
 
 def make_cs(data):
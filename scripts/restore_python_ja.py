@@ -1,6 +1,8 @@
 import json
 import re
 
+from json_utils import safe_json_dump
+
 def restore_python_ja():
     # 1. Load current JSON
     json_path = 'Assets/Resources/pythonLessons.json'
@@ -38,8 +40,7 @@ def restore_python_ja():
     # For now, I will write a small script that specifically replaces core content
     # to ensure the 'source' for translation is valid Japanese.
     
-    with open(json_path, 'w', encoding='utf-8') as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
+    safe_json_dump(data, json_path, indent=2)
 
 if __name__ == "__main__":
     restore_python_ja()
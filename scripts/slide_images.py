@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Shared helpers for the slide image tools.
+
+Slide illustrations live under Assets/Resources/SlideImages and
+Assets/Resources/illustrations. Lesson files reference them through
+`*_slideN_image` keys whose values are Resources-relative paths such as
+"/illustrations/common/pencil.png".
+
+Note that most of these ".png" files are actually JPEG data; use
+image_format() rather than the extension when the encoding matters.
+"""
+
+import json
+import os
+import struct
+from pathlib import Path
+
+RESOURCES_PATH = Path(__file__).parent.parent / "Assets" / "Resources"
+
+IMAGE_DIRS = ["SlideImages", "illustrations"]
+IMAGE_EXTENSIONS = {".png", ".jpg", ".jpeg"}
+IMAGE_KEY_SUFFIX = "_image"
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+JPEG_SIGNATURE = b"\xff\xd8"
+
+
+def list_image_files(resources_path=RESOURCES_PATH):
+    """
+    Return {relative path: size} for every image under IMAGE_DIRS.
+
+    Paths are Resources-relative with forward slashes
+    ("illustrations/common/pencil.png"). Uses a single os.scandir walk
+    instead of checking paths one by one.
+    """
+    resources_path = Path(resources_path)
+    images = {}
+    for top in IMAGE_DIRS:
+        stack = [resources_path / top]
+        while stack:
+            try:
+                entries = list(os.scandir(stack.pop()))
+            except FileNotFoundError:
+                continue
+            for entry in entries:
+                if entry.is_dir():
+                    stack.append(entry.path)
+                elif os.path.splitext(entry.name)[1].lower() in IMAGE_EXTENSIONS:
+                    rel = Path(entry.path).relative_to(resources_path).as_posix()
+                    images[rel] = entry.stat().st_size
+    return dict(sorted(images.items()))
+
+
+def normalize_reference(value):
+    """Turn an `_image` value ("/illustrations/a.png") into a relative path."""
+    return value.strip().lstrip("/").replace("\\", "/")
+
+
+def iter_image_references(resources_path=RESOURCES_PATH, pattern="*.json"):
+    """
+    Yield (file name, locale or None, key, value) for every `_image` key.
+
+    Handles both flat lesson files and the nested {locale: {key: value}}
+    layout of localizedText.json.
+    """
+    for path in sorted(Path(resources_path).glob(pattern)):
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            continue
+        if not isinstance(data, dict):
+            continue
+        for key, value in data.items():
+            if isinstance(value, dict):
+                for sub_key, sub_value in value.items():
+                    if sub_key.endswith(IMAGE_KEY_SUFFIX) and isinstance(sub_value, str):
+                        yield path.name, key, sub_key, sub_value
+            elif key.endswith(IMAGE_KEY_SUFFIX) and isinstance(value, str):
+                yield path.name, None, key, value
+
+
+def image_format(data):
+    """Return "png", "jpeg" or None from the file signature."""
+    if data.startswith(PNG_SIGNATURE):
+        return "png"
+    if data.startswith(JPEG_SIGNATURE):
+        return "jpeg"
+    return None
+
+
+def image_size(data):
+    """Return (width, height) of PNG or baseline/progressive JPEG data, or None."""
+    fmt = image_format(data)
+    if fmt == "png" and len(data) >= 24:
+        return struct.unpack(">II", data[16:24])
+    if fmt == "jpeg":
+        for marker, payload in iter_jpeg_segments(data):
+            if marker in (0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7,
+                          0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF):
+                height, width = struct.unpack(">HH", payload[1:5])
+                return width, height
+    return None
+
+
+def iter_png_chunks(data):
+    """Yield (chunk type, chunk data) for PNG bytes."""
+    pos = len(PNG_SIGNATURE)
+    while pos + 8 <= len(data):
+        length, kind = struct.unpack(">I4s", data[pos:pos + 8])
+        yield kind, data[pos + 8:pos + 8 + length]
+        pos += 12 + length
+        if kind == b"IEND":
+            return
+
+
+def iter_jpeg_segments(data):
+    """
+    Yield (marker, payload) for the header segments of JPEG bytes.
+
+    Stops at the first SOS: the final item is (0xDA, everything after
+    the SOS marker), i.e. the scan header, entropy-coded data and EOI.
+    """
+    pos = 2
+    while pos + 4 <= len(data):
+        if data[pos] != 0xFF:
+            raise ValueError(f"Bad JPEG marker at offset {pos}")
+        marker = data[pos + 1]
+        if marker == 0xFF:
+            # Fill byte
+            pos += 1
+            continue
+        if marker == 0xDA:
+            yield marker, data[pos + 2:]
+            return
+        length = struct.unpack(">H", data[pos + 2:pos + 4])[0]
+        yield marker, data[pos + 4:pos + 2 + length]
+        pos += 2 + length
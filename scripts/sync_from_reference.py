@@ -13,10 +13,12 @@ Usage:
 """
 
 import json
-import re
 import argparse
 from pathlib import Path
 
+from json_utils import safe_json_dump
+from ts_lesson_parser import load_ts_data
+
 SENKOU_CODE_PATH = Path(r"C:\Work\git\senkou-code\data\lessons")
 PROJECT_RESOURCES_PATH = Path(r"C:\Work\MetaXR\ProgramShooting\Assets\Resources")
 
@@ -26,65 +28,9 @@ LANGUAGES = [
     "lua", "perl", "haskell", "elixir", "assembly"
 ]
 
-def sanitize_json_string(json_str):
-    """Sanitize JSON string to handle special characters from TypeScript files."""
-    # Valid JSON escape characters: " \ / b f n r t u
-    # Any backslash followed by other characters needs to be escaped
-
-    # Handle actual tab characters inside strings -> \t
-    def replace_tabs_in_strings(m):
-        return m.group(0).replace('\t', '\\t')
-    json_str = re.sub(r'"[^"\\]*(?:\\.[^"\\]*)*"', replace_tabs_in_strings, json_str)
-
-    # Escape backslashes before invalid escape characters
-    # Match backslash NOT followed by valid escape chars: " \ / b f n r t u
-    # We need to be careful not to double-escape already valid sequences
-    def fix_invalid_escapes(m):
-        s = m.group(0)
-        result = []
-        i = 0
-        while i < len(s):
-            if s[i] == '\\' and i + 1 < len(s):
-                next_char = s[i + 1]
-                # Valid JSON escapes
-                if next_char in '"\\\/bfnrtu':
-                    result.append(s[i:i+2])
-                    i += 2
-                else:
-                    # Invalid escape - add extra backslash
-                    result.append('\\\\')
-                    result.append(next_char)
-                    i += 2
-            else:
-                result.append(s[i])
-                i += 1
-        return ''.join(result)
-
-    # Apply fix to all string values
-    json_str = re.sub(r'"[^"]*(?:\\.[^"]*)*"', fix_invalid_escapes, json_str)
-
-    return json_str
-
-
 def parse_ts_file(file_path):
-    """Parse TypeScript file and extract JSON data."""
-    if not file_path.exists():
-        return None
-
-    with open(file_path, 'r', encoding='utf-8') as f:
-        content = f.read()
-
-    match = re.search(r'export\s+const\s+\w+\s*=\s*(\{[\s\S]*\})\s*;?\s*$', content)
-    if match:
-        json_str = match.group(1)
-        json_str = re.sub(r',(\s*[}\]])', r'\1', json_str)
-        # Sanitize special characters
-        json_str = sanitize_json_string(json_str)
-        try:
-            return json.loads(json_str)
-        except json.JSONDecodeError as e:
-            print(f"  Warning: JSON parse error in {file_path.name}: {e}")
-    return None
+    """Parse TypeScript file and extract lesson data."""
+    return load_ts_data(file_path)
 
 def load_all_ts_files_for_language(language):
     """Load all TypeScript lesson files for a language."""
@@ -201,11 +147,9 @@ def sync_language(language, dry_run=False):
     updated_common = dict(sorted(updated_common.items()))
 
     # Write files
-    with open(ja_file, 'w', encoding='utf-8') as f:
-        json.dump(updated_ja, f, ensure_ascii=False, indent=2)
+    safe_json_dump(updated_ja, ja_file, indent=2)
 
-    with open(common_file, 'w', encoding='utf-8') as f:
-        json.dump(updated_common, f, ensure_ascii=False, indent=2)
+    safe_json_dump(updated_common, common_file, indent=2)
 
     print(f"  Updated {ja_file.name} ({len(updated_ja)} keys)")
     print(f"  Updated {common_file.name} ({len(updated_common)} keys)")
@@ -7,6 +7,9 @@ import sys
 import io
 from pathlib import Path
 
+from json_utils import safe_json_dump
+from lesson_index import split_by_course
+
 sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
 
 LOCAL_DIR = Path("C:/Work/MetaXR/ProgramShooting/Assets/Resources")
@@ -27,12 +30,12 @@ def main():
         all_ref_keys = json.load(f)
     print(f"参考サイトキー数: {len(all_ref_keys)}")
 
+    ref_by_course = split_by_course(all_ref_keys)
     total_added = 0
     total_updated = 0
 
     for lang in LANGUAGES:
-        prefix = f"{lang}_"
-        ref_lang_keys = {k: v for k, v in all_ref_keys.items() if k.startswith(prefix)}
+        ref_lang_keys = ref_by_course.get(lang, {})
 
         local_filename = f"{lang}Lessons_ja.json"
         local_path = LOCAL_DIR / local_filename
@@ -60,8 +63,7 @@ def main():
         sorted_data = dict(sorted(local_data.items()))
 
         # Write back
-        with open(local_path, 'w', encoding='utf-8') as f:
-            json.dump(sorted_data, f, ensure_ascii=False, indent=2)
+        safe_json_dump(sorted_data, local_path, indent=2)
 
         print(f"[OK] {local_filename}: +{added} keys, ~{updated} updated")
         total_added += added
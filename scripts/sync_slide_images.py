@@ -3,23 +3,20 @@
 参考サイトのレッスンファイル(.ts)からスライドイラストパスを抽出し、
 UnityプロジェクトのJSONファイルを更新するスクリプト
 
-JSONの構造:
-{
-    "en": {
-        "key1": "value1",
-        "key2": "value2"
-    },
-    "ja": {
-        "key1": "値1",
-        "key2": "値2"
+画像パスは全言語で共通なので、各コースの共通ファイルに書き込む:
+    <language>Lessons_common.json
+    {
+        "python_lesson1_ex1_slide1_image": "/illustrations/...",
+        ...
     }
-}
 """
 import os
 import re
 import json
 from pathlib import Path
 
+from json_utils import safe_json_dump
+
 # パス設定
 SENKOU_LESSONS_DIR = Path(r"C:\Work\git\senkou-code\data\lessons")
 UNITY_RESOURCES_DIR = Path(r"C:\Work\MetaXR\ProgramShooting\Assets\Resources")
@@ -91,40 +88,53 @@ def extract_slide_images_from_ts(ts_file_path):
 
     return result
 
-def update_unity_json(json_path, image_updates):
-    """UnityのJSONファイルを更新（各言語セクションの中に追加）"""
-    with open(json_path, 'r', encoding='utf-8') as f:
-        data = json.load(f)
+def update_unity_json(language, image_updates):
+    """Unityの共通JSONファイル(<language>Lessons_common.json)を更新
 
-    updated_count = 0
+    画像パスは全言語共通なので _common にだけ書き込み、
+    各言語ファイルに残っている同じキーは削除する（_common を上書きしてしまうため）
+    """
+    common_path = UNITY_RESOURCES_DIR / f"{language}Lessons_common.json"
+    data = {}
+    if common_path.exists():
+        with open(common_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
 
-    # 各言語セクション（en, ja等）に対して更新
-    for lang_code in data.keys():
-        if not isinstance(data[lang_code], dict):
-            continue
+    updated_count = 0
 
-        for key, new_value in image_updates.items():
-            if key in data[lang_code]:
-                if data[lang_code][key] != new_value:
-                    print(f"  [{lang_code}] 更新: {key}")
-                    print(f"    旧: {data[lang_code][key]}")
-                    print(f"    新: {new_value}")
-                    data[lang_code][key] = new_value
-                    updated_count += 1
-            else:
-                # 新しいキーを追加
-                data[lang_code][key] = new_value
+    for key, new_value in image_updates.items():
+        if key in data:
+            if data[key] != new_value:
+                print(f"  更新: {key}")
+                print(f"    旧: {data[key]}")
+                print(f"    新: {new_value}")
+                data[key] = new_value
                 updated_count += 1
-                if lang_code == "en":  # 1回だけ表示
-                    print(f"  追加: {key} = {new_value}")
+        else:
+            # 新しいキーを追加
+            data[key] = new_value
+            updated_count += 1
+            print(f"  追加: {key} = {new_value}")
 
     if updated_count > 0:
-        with open(json_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=4)
+        safe_json_dump(data, common_path)
         print(f"  {updated_count}件更新しました")
     else:
         print(f"  更新なし")
 
+    # 各言語ファイルから重複した _image キーを削除
+    for lang_path in sorted(UNITY_RESOURCES_DIR.glob(f"{language}Lessons_*.json")):
+        if lang_path == common_path:
+            continue
+        with open(lang_path, 'r', encoding='utf-8') as f:
+            lang_data = json.load(f)
+        stale = [key for key in image_updates if key in lang_data]
+        if stale:
+            for key in stale:
+                del lang_data[key]
+            safe_json_dump(lang_data, lang_path)
+            print(f"  {lang_path.name}: 重複キー {len(stale)}件を削除")
+
     return updated_count
 
 def main():
@@ -133,11 +143,6 @@ def main():
     for language, ts_files in LANGUAGE_MAPPING.items():
         print(f"\n=== {language} ===")
 
-        json_file = UNITY_RESOURCES_DIR / f"{language}Lessons.json"
-        if not json_file.exists():
-            print(f"  JSONファイルが存在しません: {json_file}")
-            continue
-
         all_image_updates = {}
 
         for ts_file in ts_files:
@@ -149,7 +154,7 @@ def main():
             all_image_updates.update(image_updates)
 
         if all_image_updates:
-            updates = update_unity_json(json_file, all_image_updates)
+            updates = update_unity_json(language, all_image_updates)
             total_updates += updates
 
     print(f"\n合計 {total_updates} 件更新しました")
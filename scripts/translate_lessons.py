@@ -6,7 +6,9 @@ Translate Japanese lesson content to English.
 import json
 import glob
 import os
-import re
+
+from code_spans import protect_code, restore_code
+from json_utils import safe_json_dump
 
 # 翻訳辞書
 TRANSLATIONS = {
@@ -221,36 +223,13 @@ TITLE_TRANSLATIONS = {
 }
 
 
-def protect_code_blocks(text):
-    """Protect code blocks from translation."""
-    code_blocks = []
-
-    def save_block(match):
-        code_blocks.append(match.group(0))
-        return f"<<<CODEBLOCK{len(code_blocks)-1}>>>"
-
-    # Protect fenced code blocks
-    result = re.sub(r'```[\s\S]*?```', save_block, text)
-    # Protect inline code
-    result = re.sub(r'`[^`]+`', save_block, result)
-
-    return result, code_blocks
-
-
-def restore_code_blocks(text, code_blocks):
-    """Restore protected code blocks."""
-    for i, block in enumerate(code_blocks):
-        text = text.replace(f"<<<CODEBLOCK{i}>>>", block)
-    return text
-
-
 def translate_text(text):
     """Translate Japanese text to English."""
     if not text:
         return text
 
     # Protect code blocks
-    result, code_blocks = protect_code_blocks(text)
+    result, code_blocks = protect_code(text)
 
     # Apply translations (longer phrases first to avoid partial matches)
     sorted_translations = sorted(TRANSLATIONS.items(), key=lambda x: -len(x[0]))
@@ -258,7 +237,7 @@ def translate_text(text):
         result = result.replace(ja, en)
 
     # Restore code blocks
-    result = restore_code_blocks(result, code_blocks)
+    result = restore_code(result, code_blocks)
 
     return result
 
@@ -298,8 +277,7 @@ def process_file(filepath):
 
     data['en'] = en_data
 
-    with open(filepath, 'w', encoding='utf-8') as f:
-        json.dump(data, f, ensure_ascii=False, indent=4)
+    safe_json_dump(data, filepath, indent=4)
 
     return translated
 
@@ -5,10 +5,12 @@ Translate a single JSON file with progress tracking.
 
 import json
 import sys
-import time
 from pathlib import Path
 
-from googletrans import Translator
+from json_utils import safe_json_dump
+from translation_memory import get_memory
+from translation_backends import get_backend
+from translation_scheduler import run_concurrently
 
 TARGET_LANGUAGES = [
     "en", "ja", "cs", "de", "nl", "da", "el", "fi", "fr", "it",
@@ -16,20 +18,19 @@ TARGET_LANGUAGES = [
     "zh-Hans", "zh-Hant", "uk", "vi"
 ]
 
-LANG_CODE_MAP = {
-    "zh-Hans": "zh-cn",
-    "zh-Hant": "zh-tw",
-}
-
 def translate_text(translator, text, dest_lang, src_lang="en"):
-    dest = LANG_CODE_MAP.get(dest_lang, dest_lang)
+    memory = get_memory()
+    cached = memory.get(text, src_lang, dest_lang, translator.name)
+    if cached is not None:
+        return cached
+
     try:
-        result = translator.translate(text, dest=dest, src=src_lang)
-        time.sleep(0.05)  # Rate limiting
-        return result.text
+        # Pacing and retries are handled by the async backend
+        result = translator.translate(text, src_lang, dest_lang)
+        memory.put(text, src_lang, dest_lang, translator.name, result)
+        return result
     except Exception as e:
         print(f"  Error translating to {dest_lang}: {e}")
-        time.sleep(1)
         return text
 
 def process_file(filepath):
@@ -43,7 +44,7 @@ def process_file(filepath):
     base_keys = set(data[base_lang].keys())
     print(f"Base language: {base_lang}, Total keys: {len(base_keys)}")
     
-    translator = Translator()
+    translator = get_backend(default='google')
     modified = False
     
     # Ensure all target languages exist
@@ -65,32 +66,39 @@ def process_file(filepath):
             continue
             
         print(f"\nTranslating {len(missing_keys)} keys to {lang}...")
-        
-        for i, key in enumerate(sorted(missing_keys)):
+
+        def translate_key(key):
             base_value = data[base_lang][key]
-            
+
             # Skip image paths and code content
             if "_image" in key or base_value.startswith("/"):
-                translated = base_value
+                return base_value
             elif len(base_value) > 3000:
                 # For very long text, keep original
-                translated = base_value
-            else:
-                translated = translate_text(translator, base_value, lang, base_lang)
-            
-            data[lang][key] = translated
-            modified = True
-            
-            if (i + 1) % 25 == 0:
-                print(f"  Progress: {i + 1}/{len(missing_keys)}")
-        
+                return base_value
+            return translate_text(translator, base_value, lang, base_lang)
+
+        results = {}
+
+        def on_result(key, translated):
+            results[key] = data[base_lang][key] if isinstance(translated, Exception) else translated
+            if len(results) % 25 == 0:
+                print(f"  Progress: {len(results)}/{len(missing_keys)}")
+
+        # Requests run concurrently; the backend bounds how many are in flight
+        keys = sorted(missing_keys)
+        run_concurrently(keys, translate_key, max_concurrency=translator.max_in_flight, on_result=on_result)
+        for key in keys:
+            data[lang][key] = results[key]
+        modified = True
+
         print(f"  Completed: {len(missing_keys)} translations for {lang}")
     
     if modified:
-        with open(filepath, 'w', encoding='utf-8', newline='\n') as f:
-            json.dump(data, f, indent=4, ensure_ascii=False)
+        safe_json_dump(data, filepath, indent=4, newline='\n')
         print(f"\nSaved: {filepath}")
-    
+
+    print(get_memory().summary())
     return modified
 
 if __name__ == "__main__":
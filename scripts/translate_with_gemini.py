@@ -7,12 +7,17 @@ Supports all JSON files in Resources folder: *Lessons.json and localizedText.jso
 import json
 import glob
 import os
-import subprocess
 import sys
-import time
 import re
 import argparse
 
+from code_spans import CodeSpanError, has_japanese, is_code_only, protect_code, restore_code
+from translation_journal import TranslationJournal
+from translation_memory import get_memory
+from translation_backends import TranslationBackendError, available_backends, get_backend
+from translation_batches import MEASURES, join_sections, pack_batches, split_oversized
+from translation_scheduler import AdaptiveRateLimiter, retry_with_backoff, run_concurrently
+
 # Import JSON utilities for sanitization and validation
 try:
     from json_utils import sanitize_text_for_json, sanitize_translation_dict, safe_json_dump, validate_json_file
@@ -56,57 +61,73 @@ LANGUAGE_NAMES = {
 # ソース言語（日本語）以外の全言語
 ALL_TARGET_LANGUAGES = [lang for lang in LANGUAGE_NAMES.keys() if lang != 'ja']
 
+# 翻訳バックエンド（--backend / TRANSLATION_BACKEND、未指定なら gemini-cli）
+# 翻訳メモリ上のバックエンド名は backend().name
+BACKEND = None
+
+# コードはプレースホルダーに置き換えて送る (code_spans.protect_code)
+CODE_INSTRUCTION = ("Keep placeholders like CODEBLOCK0ENDBLOCK and INLINECODE0ENDINLINE exactly as they are "
+                    "(they stand for code).")
+
+
+def backend():
+    """Return the translation backend selected for this run."""
+    return get_backend(BACKEND, default='gemini-cli')
 
-def call_gemini(prompt):
-    """Call Gemini CLI with the given prompt in non-interactive mode."""
-    # 利用したいモデルを指定
-    model_name = "gemini-2.5-flash-lite"
 
+def call_gemini(prompt):
+    """Send a prompt to the backend; returns None if the call failed."""
     try:
-        # Popenを使用して標準入出力を制御
-        # Windows環境ではshell=Trueが必要な場合がある
-        process = subprocess.Popen(
-            f'gemini --model {model_name}',
-            stdin=subprocess.PIPE,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True,
-            encoding='utf-8',
-            shell=True
-        )
-
-        # inputとしてpromptを流し込み、入力を閉じる(非対話実行)
-        # タイムアウトはcommunicateの引数で設定
-        stdout, stderr = process.communicate(input=prompt, timeout=300)
-
-        if process.returncode != 0:
-            print(f"CLI Error: {stderr}")
-            return None
-
-        # ツールが出力する「Loaded cached...」「Ready...」などのログを除去
-        clean_output = stdout.strip()
-
-        return clean_output
-
-    except subprocess.TimeoutExpired:
-        process.kill()
-        print("Error: Gemini CLI timeout")
-        return None
-    except Exception as e:
-        print(f"Error calling Gemini: {e}")
+        return backend().complete(prompt)
+    except TranslationBackendError as e:
+        print(f"Error calling {backend().name}: {e}")
         return None
 
 
 def translate_batch(texts, target_lang, context="programming tutorial"):
-    """Translate a batch of Japanese texts to the target language."""
+    """
+    Translate a batch of Japanese texts to the target language.
+
+    Texts already in the translation memory are answered locally; only the
+    rest are sent to Gemini. Returns {} if the Gemini call fails.
+    """
     if not texts:
         return {}
 
+    memory = get_memory()
+    results = {}
+    pending = {}
+    for key, text in texts.items():
+        cached = memory.get(text, 'ja', target_lang, backend().name)
+        if cached is None:
+            pending[key] = text
+        else:
+            results[key] = cached
+
+    if not pending:
+        return results
+
+    translated = request_batch(pending, target_lang, context)
+    if not translated:
+        return {}
+
+    for key, value in translated.items():
+        if key in pending and value:
+            memory.put(pending[key], 'ja', target_lang, backend().name, value)
+    results.update(translated)
+    return results
+
+
+def request_batch(texts, target_lang, context="programming tutorial"):
+    """Send a batch of Japanese texts to Gemini and parse the JSON reply."""
     target_lang_name = LANGUAGE_NAMES.get(target_lang, target_lang)
+    masked, spans, results = protect_texts(texts)
+    if not masked:
+        return results
 
     # Create prompt for batch translation
     prompt = f"""Translate the following Japanese programming tutorial texts to {target_lang_name}.
-Keep all code blocks (```...```) and inline code (`...`) exactly as they are.
+{CODE_INSTRUCTION}
 Keep markdown formatting (# headers, bullet points, etc.).
 Keep all variable names, function names, and technical terms in their original form.
 Return ONLY the translations in the same JSON format.
@@ -114,62 +135,207 @@ Return ONLY the translations in the same JSON format.
 Context: {context}
 
 Input JSON:
-{json.dumps(texts, ensure_ascii=False, indent=2)}
+{json.dumps(masked, ensure_ascii=False, indent=2)}
 
 Output the translated JSON only, no explanation:"""
 
-    result = call_gemini(prompt)
+    parsed = parse_json_reply(call_gemini(prompt))
+    if not parsed:
+        return {}
+    results.update(restore_texts(parsed, spans))
+    return results
+
+
+def protect_texts(texts):
+    """
+    Replace the code in a batch by placeholders (code_spans.protect_code).
+
+    Returns (masked, spans, code_only): values that are only code are not
+    sent; they are their own translation.
+    """
+    masked = {}
+    spans = {}
+    code_only = {}
+    for key, text in texts.items():
+        protected, key_spans = protect_code(text)
+        if is_code_only(protected):
+            code_only[key] = text
+        else:
+            masked[key] = protected
+            spans[key] = key_spans
+    return masked, spans, code_only
 
-    if result:
-        # Try to parse JSON from result
+
+def restore_texts(translated, spans):
+    """
+    Put the code back into translated values.
+
+    Values for unknown keys, non-strings and values whose code did not
+    come back byte-for-byte are dropped (and so retried by the caller).
+    """
+    restored = {}
+    for key, value in translated.items():
+        if key not in spans or not isinstance(value, str):
+            continue
         try:
-            # Find JSON in the response
-            json_match = re.search(r'\{[\s\S]*\}', result)
-            if json_match:
-                parsed = json.loads(json_match.group())
-                # Sanitize all values to prevent JSON corruption
-                if HAS_JSON_UTILS:
-                    sanitized, issues = sanitize_translation_dict(parsed)
-                    if issues:
-                        for key, issue in issues:
-                            if issue != "sanitized":
-                                print(f"    Warning: {key} - {issue}")
-                    return sanitized
-                else:
-                    return {k: sanitize_text_for_json(v) if isinstance(v, str) else v for k, v in parsed.items()}
-        except json.JSONDecodeError as e:
-            print(f"    Warning: Failed to parse Gemini JSON response: {e}")
+            restored[key] = restore_code(value, spans[key])
+        except CodeSpanError as e:
+            print(f"    Warning: {key} - {e}")
+    return restored
+
+
+def parse_json_reply(result):
+    """Return the JSON object in a Gemini reply, or None if there is none."""
+    if not result:
+        return None
+    try:
+        # Find JSON in the response
+        json_match = re.search(r'\{[\s\S]*\}', result)
+        if json_match:
+            parsed = json.loads(json_match.group())
+            if isinstance(parsed, dict):
+                return sanitize_values(parsed)
+    except json.JSONDecodeError as e:
+        print(f"    Warning: Failed to parse Gemini JSON response: {e}")
+    return None
+
+
+def sanitize_values(parsed):
+    """Sanitize the string values of a reply to prevent JSON corruption."""
+    if HAS_JSON_UTILS:
+        sanitized, issues = sanitize_translation_dict(parsed)
+        if issues:
+            for key, issue in issues:
+                if issue != "sanitized":
+                    print(f"    Warning: {key} - {issue}")
+        return sanitized
+    return {k: sanitize_text_for_json(v) if isinstance(v, str) else v for k, v in parsed.items()}
+
+
+def translate_batch_multi(texts, target_langs, context="programming tutorial"):
+    """
+    Translate a batch of Japanese texts to several target languages in one call.
+
+    Returns {lang: {key: text}}. Values already in the translation memory
+    are answered locally. Locales the reply left out (or answered with
+    something other than a string) are simply missing keys, for the caller
+    to retry per locale. Returns None if the Gemini call or the JSON parse
+    failed as a whole.
+    """
+    memory = get_memory()
+    results = {lang: {} for lang in target_langs}
+    pending = {}
+    pending_langs = []
+    for lang in target_langs:
+        for key, text in texts.items():
+            cached = memory.get(text, 'ja', lang, backend().name)
+            if cached is None:
+                pending[key] = text
+                if lang not in pending_langs:
+                    pending_langs.append(lang)
+            else:
+                results[lang][key] = cached
 
-    return {}
+    if not pending:
+        return results
+
+    translated = request_batch_multi(pending, pending_langs, context)
+    if translated is None:
+        return None
+
+    for lang, values in translated.items():
+        for key, value in values.items():
+            if key not in results[lang]:
+                memory.put(pending[key], 'ja', lang, backend().name, value)
+                results[lang][key] = value
+    return results
+
+
+def request_batch_multi(texts, target_langs, context="programming tutorial"):
+    """
+    Send one batch of Japanese texts to Gemini for several target languages.
+
+    The reply is {key: {lang: text}}; it is validated and split into
+    {lang: {key: text}}, keeping only non-empty strings for requested keys
+    and languages.
+    """
+    masked, spans, code_only = protect_texts(texts)
+    if not masked:
+        return {lang: dict(code_only) for lang in target_langs}
+    language_list = "\n".join(f"- {lang}: {LANGUAGE_NAMES.get(lang, lang)}" for lang in target_langs)
+
+    prompt = f"""Translate the following Japanese programming tutorial texts into each of these languages:
+{language_list}
+{CODE_INSTRUCTION}
+Keep markdown formatting (# headers, bullet points, etc.).
+Keep all variable names, function names, and technical terms in their original form.
+Return ONLY a JSON object with the same keys as the input. Each value must be an object
+mapping every language code above to the translation in that language.
+
+Context: {context}
+
+Input JSON:
+{json.dumps(masked, ensure_ascii=False, indent=2)}
+
+Output the translated JSON only, no explanation:"""
+
+    parsed = parse_json_reply(call_gemini(prompt))
+    if parsed is None:
+        return None
+
+    by_lang = {}
+    for lang in target_langs:
+        values = {}
+        for key in masked:
+            entry = parsed.get(key)
+            value = entry.get(lang) if isinstance(entry, dict) else None
+            if isinstance(value, str) and value.strip():
+                values[key] = value
+        by_lang[lang] = restore_texts(sanitize_values(values), spans)
+        by_lang[lang].update(code_only)
+    return by_lang
 
 
 def translate_single(key, text, target_lang):
     """Translate a single text to the target language."""
+    memory = get_memory()
+    cached = memory.get(text, 'ja', target_lang, backend().name)
+    if cached is not None:
+        return cached
+
+    protected, spans = protect_code(text)
+    if is_code_only(protected):
+        return text
+
     target_lang_name = LANGUAGE_NAMES.get(target_lang, target_lang)
 
     prompt = f"""Translate this Japanese programming tutorial text to {target_lang_name}.
-Keep all code blocks and inline code exactly as they are.
+{CODE_INSTRUCTION}
 Keep markdown formatting.
 Keep all variable names, function names, and technical terms in their original form.
 Return ONLY the {target_lang_name} translation, nothing else.
 
 Japanese:
-{text}
+{protected}
 
 {target_lang_name}:"""
 
     result = call_gemini(prompt)
     if result:
         # Sanitize to prevent JSON corruption
-        return sanitize_text_for_json(result)
+        result = sanitize_text_for_json(result)
+        try:
+            result = restore_code(result, spans)
+        except CodeSpanError as e:
+            print(f"    Warning: {key} - {e}")
+            return text
+        # 日本語が残った英訳はメモリに保存しない（次回再翻訳させる）
+        if target_lang != 'en' or not has_japanese(result):
+            memory.put(text, 'ja', target_lang, backend().name, result)
+        return result
     return text
 
 
-def has_japanese(text):
-    """Check if text contains Japanese characters."""
-    return bool(re.search(r'[\u3040-\u309f\u30a0-\u30ff\u4e00-\u9fff]', text))
-
-
 def get_file_context(filepath):
     """Get translation context based on filename."""
     basename = os.path.basename(filepath)
@@ -180,27 +346,8 @@ def get_file_context(filepath):
         return f"{lang} programming tutorial"
 
 
-def process_file(filepath, target_lang, batch_size=10, force=False):
-    """Process a single JSON file for a specific target language."""
-    with open(filepath, 'r', encoding='utf-8') as f:
-        data = json.load(f)
-
-    basename = os.path.basename(filepath)
-    print(f"\nProcessing {basename} -> {target_lang} ({LANGUAGE_NAMES.get(target_lang, target_lang)})...")
-
-    ja_data = data.get('ja', {})
-    target_data = data.get(target_lang, {})
-
-    if not ja_data:
-        print(f"  No Japanese data found in {basename}")
-        return 0
-
-    if not target_data:
-        # ターゲット言語のセクションがない場合は作成
-        target_data = {}
-        data[target_lang] = target_data
-
-    # Find keys that need translation
+def collect_keys_to_translate(ja_data, target_data, force=False):
+    """Return the Japanese keys whose target-language value needs translating."""
     keys_to_translate = []
     for key, ja_value in ja_data.items():
         # Skip image keys
@@ -221,54 +368,82 @@ def process_file(filepath, target_lang, batch_size=10, force=False):
             if not target_value or has_japanese(target_value):
                 keys_to_translate.append(key)
 
-    total = len(keys_to_translate)
-    print(f"  Found {total} keys to translate")
-
-    if total == 0:
-        return 0
-
-    translated = 0
-    context = get_file_context(filepath)
-
-    # Process in batches
-    for i in range(0, total, batch_size):
-        batch_keys = keys_to_translate[i:i+batch_size]
-        batch_texts = {k: ja_data[k] for k in batch_keys}
-
-        print(f"  Translating batch {i//batch_size + 1}/{(total + batch_size - 1)//batch_size}...")
+    return keys_to_translate
+
+
+def translate_work_item(item, limiter, retries=3):
+    """
+    Translate one (file, languages, batch) work item.
+
+    Several languages are requested in one call (translate_batch_multi);
+    only the locales whose part of the reply was missing or unparsable are
+    retried per locale. Returns {lang: {key: translated_text}}.
+    """
+    filepath, target_langs, batch_index, batch_texts, context = item
+    if len(target_langs) == 1:
+        lang = target_langs[0]
+        return {lang: translate_language_batch(batch_texts, lang, context, limiter, retries)}
+
+    translations = retry_with_backoff(
+        lambda: translate_batch_multi(batch_texts, target_langs, context=context),
+        retries=retries, limiter=limiter, is_success=lambda result: result is not None)
+    if translations is None:
+        translations = {lang: {} for lang in target_langs}
+
+    for lang in target_langs:
+        missing = {k: v for k, v in batch_texts.items() if k not in translations[lang]}
+        if missing:
+            print(f"    {lang}: {len(missing)}/{len(batch_texts)} keys missing from the reply, "
+                  f"translating them separately")
+            translations[lang].update(translate_language_batch(missing, lang, context, limiter, retries))
+    return translations
+
+
+def translate_language_batch(batch_texts, target_lang, context, limiter, retries=3):
+    """
+    Translate a batch to one language, falling back to one call per key.
+
+    Returns {key: translated_text} for the keys that were translated.
+    """
+    batch_keys = list(batch_texts)
+
+    translations = retry_with_backoff(
+        lambda: translate_batch(batch_texts, target_lang, context=context),
+        retries=retries, limiter=limiter)
+
+    results = {}
+    if translations:
+        for key, translated_text in translations.items():
+            if key in batch_texts and translated_text:
+                results[key] = translated_text
+        return results
+
+    # Fallback to single translation
+    for key in batch_keys:
+        print(f"    Translating {key}...")
+        limiter.acquire()
+        result = translate_single(key, batch_texts[key], target_lang)
+        if result is batch_texts[key]:
+            limiter.on_failure()
+        else:
+            limiter.on_success()
+        if result:
+            # 翻訳結果が日本語でないことを確認（英語以外のターゲットでは日本語が残っていないかチェック）
+            if target_lang == 'en' and has_japanese(result):
+                print(f"    Warning: Translation still contains Japanese for {key}")
+            else:
+                results[key] = result
+    return results
 
-        translations = translate_batch(batch_texts, target_lang, context=context)
 
-        if translations:
-            for key, translated_text in translations.items():
-                if key in batch_keys and translated_text:
-                    target_data[key] = translated_text
-                    translated += 1
-        else:
-            # Fallback to single translation
-            for key in batch_keys:
-                print(f"    Translating {key}...")
-                result = translate_single(key, ja_data[key], target_lang)
-                if result:
-                    # 翻訳結果が日本語でないことを確認（英語以外のターゲットでは日本語が残っていないかチェック）
-                    if target_lang == 'en' and has_japanese(result):
-                        print(f"    Warning: Translation still contains Japanese for {key}")
-                    else:
-                        target_data[key] = result
-                        translated += 1
-                time.sleep(0.5)  # Rate limiting
-
-        time.sleep(1)  # Rate limiting between batches
-
-    data[target_lang] = target_data
-
-    # Write with validation
+def save_translation_file(filepath, data):
+    """Write a translation file, validating it when json_utils is available."""
     if HAS_JSON_UTILS:
         try:
             safe_json_dump(data, filepath, indent=4)
         except ValueError as e:
             print(f"  ERROR: JSON validation failed: {e}")
-            return 0
+            return False
 
         # Verify written file
         is_valid, error, _ = validate_json_file(filepath)
@@ -277,9 +452,203 @@ def process_file(filepath, target_lang, batch_size=10, force=False):
     else:
         with open(filepath, 'w', encoding='utf-8') as f:
             json.dump(data, f, ensure_ascii=False, indent=4)
+    return True
+
+
+def process_files(files, target_langs, batch_size=5, force=False, max_concurrency=4,
+                  retries=3, limiter=None, resume=True, langs_per_call=1, budget=None,
+                  budget_unit='chars'):
+    """
+    Translate every (file, languages, batch) work item on a bounded worker pool.
+
+    Each file is loaded once and written once, as soon as all of its work
+    items have finished. Results are merged in batch order so the output
+    does not depend on completion order.
+
+    With langs_per_call > 1, up to that many target languages share one
+    request. Keys are grouped by the exact set of those languages that
+    still need them, so no key is requested for a language that already
+    has it.
+
+    With a budget, requests are packed by size instead of batch_size
+    (translation_batches.pack_batches; batch_size then only caps the number
+    of keys per request). The budget covers the source text times the
+    number of languages in the request, roughly the size of the reply.
+    Values larger than that are split on markdown sections and joined
+    again once all of their parts are translated.
+
+    Every finished batch is also appended to a per-(file, language)
+    TranslationJournal. With resume=True, translations journaled by an
+    interrupted run are merged back in and not requested again.
+    """
+    if limiter is None:
+        limiter = AdaptiveRateLimiter()
+    langs_per_call = max(1, langs_per_call)
+    measure = MEASURES[budget_unit]
+
+    def make_batches(texts, state, key_langs):
+        """
+        Split a group of keys into request batches.
+
+        Split state is keyed by the language group: the same key can be
+        split again with another limit for another group, and its parts
+        must only be joined with that split's separators.
+        """
+        if not budget:
+            keys = list(texts)
+            return [{k: texts[k] for k in keys[i:i+batch_size]} for i in range(0, len(keys), batch_size)]
+        limit = max(1, budget // len(key_langs))
+        texts, splits = split_oversized(texts, limit, measure)
+        for key, (part_keys, separators) in splits.items():
+            state['splits'][(key_langs, key)] = (part_keys, separators)
+            for part_key in part_keys:
+                state['part_of'][(key_langs, part_key)] = key
+        return pack_batches(texts, limit, measure, max_items=batch_size or None)
+
+    def join_parts(state, key_langs, target_lang, values):
+        """Replace translated parts by whole values once every part is in."""
+        whole = {}
+        for key, value in values.items():
+            owner_key = state['part_of'].get((key_langs, key))
+            if owner_key is None:
+                whole[key] = value
+                continue
+            part_keys, separators = state['splits'][(key_langs, owner_key)]
+            parts = state['parts'].setdefault((key_langs, target_lang, owner_key), {})
+            parts[key] = value
+            # Only a value with every part of its own split is joined
+            if set(parts) == set(part_keys):
+                whole[owner_key] = join_sections([parts[k] for k in part_keys], separators)
+            elif len(parts) >= len(part_keys):
+                print(f"    Warning: {owner_key} -> {target_lang}: parts do not match the split, not saved")
+        return whole
+
+    files_state = {}
+    work_items = []
+    translated_total = 0
+
+    def finish_file(filepath, state):
+        """Merge a file's results in batch order, write it and drop its journals."""
+        nonlocal translated_total
+        data = state['data']
+        for target_lang in target_langs:
+            if target_lang not in state['total']:
+                continue
+            target_data = data.setdefault(target_lang, {})
+            translated = 0
+            for index in range(state['batches']):
+                batch_result = state['results'].get(index, {}).get(target_lang, {})
+                target_data.update(batch_result)
+                translated += len(batch_result)
+            print(f"  {os.path.basename(filepath)} -> {target_lang}: "
+                  f"Translated {translated}/{state['total'][target_lang]} keys")
+            translated_total += translated
+
+        if save_translation_file(filepath, data):
+            for journal in state['journals'].values():
+                journal.discard()
+        state['results'].clear()
+
+    for filepath in files:
+        with open(filepath, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+
+        basename = os.path.basename(filepath)
+        ja_data = data.get('ja', {})
+        if not ja_data:
+            print(f"  No Japanese data found in {basename}")
+            continue
 
-    print(f"  Translated {translated}/{total} keys")
-    return translated
+        context = get_file_context(filepath)
+        state = {'data': data, 'pending': 0, 'batches': 0, 'results': {}, 'total': {}, 'journals': {},
+                 'splits': {}, 'part_of': {}, 'parts': {}}
+        replayed_any = False
+        needed = {}
+
+        for target_lang in target_langs:
+            journal = TranslationJournal(filepath, target_lang)
+            state['journals'][target_lang] = journal
+
+            replayed = {}
+            if journal.exists():
+                if resume:
+                    replayed = journal.replay(ja_data)
+                    print(f"{basename} -> {target_lang}: resumed {len(replayed)} keys from journal")
+                else:
+                    journal.discard()
+            if replayed:
+                data.setdefault(target_lang, {}).update(replayed)
+                translated_total += len(replayed)
+                replayed_any = True
+
+            target_data = data.get(target_lang, {})
+            keys_to_translate = [key for key in collect_keys_to_translate(ja_data, target_data, force)
+                                 if key not in replayed]
+            total = len(keys_to_translate)
+            print(f"{basename} -> {target_lang} ({LANGUAGE_NAMES.get(target_lang, target_lang)}): "
+                  f"{total} keys to translate")
+            if total == 0:
+                continue
+
+            state['total'][target_lang] = total
+            needed[target_lang] = set(keys_to_translate)
+
+        langs = list(needed)
+        for i in range(0, len(langs), langs_per_call):
+            chunk = langs[i:i+langs_per_call]
+            groups = {}
+            for key in ja_data:
+                key_langs = tuple(lang for lang in chunk if key in needed[lang])
+                if key_langs:
+                    groups.setdefault(key_langs, []).append(key)
+            for key_langs, keys in groups.items():
+                texts = {k: ja_data[k] for k in keys}
+                for batch_texts in make_batches(texts, state, key_langs):
+                    work_items.append((filepath, key_langs, state['batches'], batch_texts, context))
+                    state['batches'] += 1
+                    state['pending'] += 1
+
+        if state['pending']:
+            files_state[filepath] = state
+        elif replayed_any:
+            # Everything left was already in the journal
+            finish_file(filepath, state)
+
+    print(f"\nWork items: {len(work_items)} (max concurrency: {max_concurrency})")
+
+    done = 0
+
+    def on_result(item, result):
+        nonlocal done
+        filepath, item_langs, batch_index, batch_texts, _ = item
+        label = ','.join(item_langs)
+        done += 1
+        if isinstance(result, Exception):
+            print(f"  ERROR: {os.path.basename(filepath)} -> {label} batch {batch_index + 1}: {result}")
+            result = {}
+        translated = sum(len(values) for values in result.values())
+        print(f"  [{done}/{len(work_items)}] {os.path.basename(filepath)} -> {label} "
+              f"batch {batch_index + 1}: {translated}/{len(batch_texts) * len(item_langs)}")
+
+        state = files_state[filepath]
+        result = {lang: join_parts(state, item_langs, lang, values) for lang, values in result.items()}
+        ja_data = state['data']['ja']
+        for target_lang in item_langs:
+            state['journals'][target_lang].append(result.get(target_lang, {}), ja_data)
+        state['results'][batch_index] = result
+        state['pending'] -= 1
+        if not state['pending']:
+            finish_file(filepath, state)
+
+    run_concurrently(work_items, lambda item: translate_work_item(item, limiter, retries),
+                     max_concurrency=max_concurrency, on_result=on_result)
+
+    return translated_total
+
+
+def process_file(filepath, target_lang, batch_size=10, force=False):
+    """Process a single JSON file for a specific target language."""
+    return process_files([filepath], [target_lang], batch_size, force, max_concurrency=1)
 
 
 def get_all_translation_files():
@@ -308,10 +677,25 @@ def main():
                         help='Only process *Lessons.json files (exclude localizedText.json)')
     parser.add_argument('--localized-only', action='store_true',
                         help='Only process localizedText.json')
-    parser.add_argument('--batch-size', '-b', type=int, default=5,
-                        help='Batch size for translation (default: 5)')
+    parser.add_argument('--batch-size', '-b', type=int, default=0,
+                        help='Maximum keys per request; without --budget 0 means 5 (default: 0)')
+    parser.add_argument('--budget', type=int, default=4000,
+                        help='Size budget per request, 0 for fixed --batch-size batches (default: 4000)')
+    parser.add_argument('--budget-unit', choices=sorted(MEASURES), default='chars',
+                        help='Unit of --budget: characters or estimated tokens (default: chars)')
     parser.add_argument('--force', action='store_true',
                         help='Force re-translation of all keys')
+    parser.add_argument('--langs-per-call', type=int, default=1,
+                        help='Target languages requested together in one Gemini call (default: 1)')
+    parser.add_argument('--backend', choices=available_backends(),
+                        help='Translation backend (default: TRANSLATION_BACKEND or gemini-cli); '
+                             'stub and replay run without a network')
+    parser.add_argument('--max-concurrency', '-c', type=int, default=4,
+                        help='Maximum number of concurrent Gemini calls (default: 4)')
+    parser.add_argument('--retries', type=int, default=3,
+                        help='Retries per batch, with exponential backoff (default: 3)')
+    parser.add_argument('--no-resume', action='store_true',
+                        help='Discard journals left by an interrupted run instead of resuming from them')
     parser.add_argument('--list-langs', action='store_true',
                         help='List all supported language codes')
     parser.add_argument('--list-files', action='store_true',
@@ -319,6 +703,9 @@ def main():
 
     args = parser.parse_args()
 
+    global BACKEND
+    BACKEND = args.backend
+
     if args.list_langs:
         print("Supported language codes:")
         for code, name in sorted(LANGUAGE_NAMES.items()):
@@ -360,28 +747,34 @@ def main():
 
     print(f"Files to process: {len(files)}")
     print(f"Target languages: {len(target_langs)}")
-    print(f"Batch size: {args.batch_size}")
+    if not args.budget and not args.batch_size:
+        args.batch_size = 5
+    print(f"Batch size: {args.batch_size or 'no limit'}")
+    print(f"Budget: {args.budget or 'none'}{' ' + args.budget_unit if args.budget else ''}")
     print(f"Force mode: {args.force}")
+    print(f"Backend: {backend().name}")
+    print(f"Max concurrency: {args.max_concurrency}")
+    print(f"Languages per call: {args.langs_per_call}")
+
+    if 'ja' in target_langs:
+        print(f"Skipping 'ja' (source language)")
+        target_langs = [lang for lang in target_langs if lang != 'ja']
+
+    existing_files = []
+    for f in files:
+        if os.path.exists(f):
+            existing_files.append(f)
+        else:
+            print(f"File not found: {f}")
 
-    total = 0
-    for target_lang in target_langs:
-        if target_lang == 'ja':
-            print(f"Skipping 'ja' (source language)")
-            continue
-
-        print(f"\n{'='*60}")
-        print(f"Target language: {target_lang} ({LANGUAGE_NAMES.get(target_lang, target_lang)})")
-        print(f"{'='*60}")
-
-        for f in files:
-            if os.path.exists(f):
-                count = process_file(f, target_lang, args.batch_size, args.force)
-                total += count
-            else:
-                print(f"File not found: {f}")
+    total = process_files(existing_files, target_langs, args.batch_size, args.force,
+                          max_concurrency=args.max_concurrency, retries=args.retries,
+                          resume=not args.no_resume, langs_per_call=args.langs_per_call,
+                          budget=args.budget, budget_unit=args.budget_unit)
 
     print(f"\n{'='*60}")
     print(f"=== Total: {total} keys translated ===")
+    print(get_memory().summary())
     print(f"{'='*60}")
 
 
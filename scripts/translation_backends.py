@@ -0,0 +1,421 @@
+#!/usr/bin/env python3
+"""
+Pluggable translation backends.
+
+Every translation script used to carry its own copy of the Gemini CLI or
+Google Translate call, each with its own error handling, and none of them
+could run without a network. Scripts now ask the registry for a backend:
+
+    backend = get_backend(default='google')
+    text = backend.translate("こんにちは", "ja", "en")   # str, raises on failure
+    reply = backend.complete(prompt)                    # raw LLM reply (gemini-cli, stub, replay)
+
+Registered backends:
+
+    gemini-cli  Gemini CLI subprocess (GEMINI_CLI, default "gemini")
+    google      Google Translate through async_translation.AsyncTranslator
+    stub        deterministic pseudo-translations ("[de] ...") with
+                configurable latency and failure rates; no network
+    replay      answers from responses recorded with TRANSLATION_RECORD
+
+Every backend raises TranslationBackendError when a request fails and has
+`name` (used as the translation memory backend) and `max_in_flight` (how
+many requests the scheduler should keep running).
+
+Environment:
+    TRANSLATION_BACKEND  backend to use instead of the script's default
+    TRANSLATION_RECORD   append every successful request/response to this
+                         JSONL file ("1" for translation_recordings.jsonl)
+    TRANSLATION_REPLAY   recordings the replay backend answers from
+                         (default: translation_recordings.jsonl)
+    STUB_LATENCY         seconds per stub request (default: 0)
+    STUB_FAIL_RATE       probability that a stub request fails (default: 0)
+    STUB_DROP_RATE       probability that a stub multi-language reply leaves
+                         a language out (default: 0)
+    STUB_SEED            seed of the stub's failures (default: 0, "random"
+                         for non-deterministic failures)
+
+Usage:
+    python translation_backends.py --list
+    python translation_backends.py --benchmark 500 --latency 0.01 --fail-rate 0.2
+"""
+
+import argparse
+import hashlib
+import inspect
+import json
+import os
+import random
+import re
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+
+from async_translation import AsyncTranslator, get_translator
+
+DEFAULT_RECORDINGS = Path(__file__).parent / "translation_recordings.jsonl"
+
+BACKENDS = {}
+
+_instances = {}
+_instances_lock = threading.Lock()
+
+
+class TranslationBackendError(RuntimeError):
+    """Raised when a backend cannot answer a request."""
+
+
+def register_backend(name):
+    """Class decorator adding a backend to BACKENDS under name."""
+    def decorator(cls):
+        cls.name = name
+        BACKENDS[name] = cls
+        return cls
+    return decorator
+
+
+def available_backends():
+    return sorted(BACKENDS)
+
+
+def get_backend(name=None, default='gemini-cli', **options):
+    """
+    Return a backend by name (TRANSLATION_BACKEND, then default).
+
+    Without options the instance is shared per process. Options a backend
+    does not take are ignored, so a script can pass gemini-cli settings
+    such as model and still run against the stub.
+    """
+    name = name or os.environ.get('TRANSLATION_BACKEND') or default
+    if name not in BACKENDS:
+        raise TranslationBackendError(
+            f"Unknown backend '{name}' (available: {', '.join(available_backends())})")
+    cls = BACKENDS[name]
+    if options:
+        accepted = inspect.signature(cls.__init__).parameters
+        options = {k: v for k, v in options.items() if k in accepted}
+    if options:
+        return _wrap_recording(cls(**options))
+    with _instances_lock:
+        if name not in _instances:
+            _instances[name] = _wrap_recording(cls())
+        return _instances[name]
+
+
+def request_key(kind, *parts):
+    """Hash identifying a request, used by RecordingBackend and ReplayBackend."""
+    digest = hashlib.sha256(json.dumps([kind, *parts], ensure_ascii=False).encode('utf-8'))
+    return digest.hexdigest()
+
+
+class Backend:
+    """Base class: translate() and complete() raise unless overridden."""
+
+    name = None
+    max_in_flight = 4
+
+    def translate(self, text, src, dest):
+        """Translate text from src to dest; raises TranslationBackendError."""
+        raise TranslationBackendError(f"{self.name} does not support translate()")
+
+    def complete(self, prompt):
+        """Return the reply to an LLM prompt; raises TranslationBackendError."""
+        raise TranslationBackendError(f"{self.name} does not support prompts")
+
+
+@register_backend('gemini-cli')
+class GeminiCLIBackend(Backend):
+    """
+    Gemini CLI in non-interactive mode, one subprocess per request.
+
+    model=None leaves out --model, so the CLI uses its own default.
+    """
+
+    def __init__(self, command=None, model="gemini-2.5-flash-lite", timeout=300, max_in_flight=4):
+        # ベンチマーク時は GEMINI_CLI でフェイク実行ファイルに差し替え可能
+        # e.g. GEMINI_CLI="python scripts/fake_gemini.py"
+        self.command = command or os.environ.get('GEMINI_CLI', 'gemini')
+        self.model = model
+        self.timeout = timeout
+        self.max_in_flight = max_in_flight
+
+    def complete(self, prompt):
+        # Windows環境ではshell=Trueが必要な場合がある
+        command = f'{self.command} --model {self.model}' if self.model else self.command
+        process = subprocess.Popen(
+            command,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            encoding='utf-8',
+            shell=True
+        )
+        try:
+            # inputとしてpromptを流し込み、入力を閉じる(非対話実行)
+            stdout, stderr = process.communicate(input=prompt, timeout=self.timeout)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.communicate()
+            raise TranslationBackendError("Gemini CLI timeout")
+        if process.returncode != 0:
+            raise TranslationBackendError(f"CLI Error: {stderr.strip()}")
+        # ツールが出力する「Loaded cached credentials」などのログを除去
+        lines = [line for line in stdout.strip().split('\n') if 'cached credentials' not in line.lower()]
+        return '\n'.join(lines).strip()
+
+    def translate(self, text, src, dest):
+        prompt = (f"Translate this text from language code '{src}' to '{dest}'.\n"
+                  f"Keep code, markdown formatting and placeholders exactly as they are.\n"
+                  f"Return ONLY the translation, nothing else.\n\n{text}")
+        result = self.complete(prompt)
+        if not result:
+            raise TranslationBackendError("Gemini CLI returned nothing")
+        return result
+
+
+@register_backend('google')
+class GoogleBackend(Backend):
+    """Google Translate over async_translation's pooled connections."""
+
+    def __init__(self, endpoint=None, max_in_flight=None, rate_per_host=None):
+        if endpoint or max_in_flight or rate_per_host:
+            self.translator = AsyncTranslator(endpoint, max_in_flight, rate_per_host)
+        else:
+            self.translator = get_translator()
+
+    @property
+    def max_in_flight(self):
+        return self.translator.max_in_flight
+
+    def translate(self, text, src, dest):
+        try:
+            return self.translator.translate(text, src, dest)
+        except Exception as e:
+            raise TranslationBackendError(str(e)) from e
+
+
+@register_backend('stub')
+class StubBackend(Backend):
+    """
+    Offline backend answering "[dest] text" after a configurable delay.
+
+    Failures are deterministic: whether attempt N of a request fails
+    depends only on the seed, the request and N, so a run with retries
+    ends the same way however the scheduler orders its threads. With
+    seed='random' failures are random instead.
+    """
+
+    def __init__(self, latency=None, fail_rate=None, drop_rate=None, seed=None, max_in_flight=16):
+        env = os.environ
+        self.latency = float(env.get('STUB_LATENCY', '0') if latency is None else latency)
+        self.fail_rate = float(env.get('STUB_FAIL_RATE', '0') if fail_rate is None else fail_rate)
+        self.drop_rate = float(env.get('STUB_DROP_RATE', '0') if drop_rate is None else drop_rate)
+        self.seed = str(env.get('STUB_SEED', '0') if seed is None else seed)
+        self.max_in_flight = max_in_flight
+        self.calls = 0
+        self.failures = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self._attempts = {}
+        self._lock = threading.Lock()
+
+    def _roll(self, *parts):
+        """Pseudo-random number in [0, 1) determined by the seed and parts."""
+        if self.seed == 'random':
+            return random.random()
+        digest = hashlib.blake2b(json.dumps([self.seed, *parts], ensure_ascii=False).encode('utf-8'),
+                                 digest_size=8).digest()
+        return int.from_bytes(digest, 'big') / 2 ** 64
+
+    def _request(self, key):
+        """Count the call, wait `latency` and fail it with probability fail_rate."""
+        with self._lock:
+            self.calls += 1
+            attempt = self._attempts[key] = self._attempts.get(key, 0) + 1
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        try:
+            if self.latency:
+                time.sleep(self.latency)
+            if self.fail_rate and self._roll(key, attempt) < self.fail_rate:
+                with self._lock:
+                    self.failures += 1
+                raise TranslationBackendError(f"stub failure (attempt {attempt})")
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+    def translate(self, text, src, dest):
+        if not text or not text.strip():
+            return text
+        self._request(request_key('translate', text, src, dest))
+        return f"[{dest}] {text}"
+
+    def complete(self, prompt):
+        """Answer the prompts of translate_with_gemini like the real model would."""
+        key = request_key('complete', prompt)
+        self._request(key)
+
+        # Multi-language batch prompt: "- en: English" lines
+        languages = re.findall(r'^- ([A-Za-z-]+): ([A-Za-z ]+)$', prompt, re.MULTILINE)
+        json_match = re.search(r'Input JSON:\n(\{[\s\S]*?\n\})', prompt)
+        if languages and json_match:
+            texts = json.loads(json_match.group(1))
+            kept = [(code, name) for code, name in languages
+                    if not self.drop_rate or self._roll(key, code) >= self.drop_rate]
+            return json.dumps({k: {code: f"[{name}] {v}" for code, name in kept} for k, v in texts.items()},
+                              ensure_ascii=False, indent=2)
+
+        match = re.search(r'to ([A-Za-z ]+?)[.:\n]', prompt)
+        target = match.group(1) if match else "Translated"
+
+        # Batch prompt: answer with the input JSON, values tagged
+        if json_match:
+            texts = json.loads(json_match.group(1))
+            return json.dumps({k: f"[{target}] {v}" for k, v in texts.items()}, ensure_ascii=False, indent=2)
+
+        # Single prompt: answer with the text between "Japanese:" and the last line
+        single_match = re.search(r'Japanese:\n([\s\S]*)\n\n[^\n]*:$', prompt.rstrip())
+        return f"[{target}] {single_match.group(1) if single_match else prompt}"
+
+    def summary(self):
+        return (f"stub: {self.calls} calls, {self.failures} failed, "
+                f"peak {self.peak_in_flight} in flight")
+
+
+@register_backend('replay')
+class ReplayBackend(Backend):
+    """Answers from a JSONL file written with TRANSLATION_RECORD; unknown requests fail."""
+
+    def __init__(self, path=None, max_in_flight=16):
+        self.path = Path(path or os.environ.get('TRANSLATION_REPLAY') or DEFAULT_RECORDINGS)
+        self.max_in_flight = max_in_flight
+        self.responses = {}
+        self.misses = 0
+        if not self.path.exists():
+            raise TranslationBackendError(f"No recordings at {self.path}")
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    record = json.loads(line)
+                    self.responses[record['key']] = record['response']
+
+    def _answer(self, key, description):
+        try:
+            return self.responses[key]
+        except KeyError:
+            self.misses += 1
+            raise TranslationBackendError(f"No recorded response for {description}") from None
+
+    def translate(self, text, src, dest):
+        return self._answer(request_key('translate', text, src, dest), f"{src}->{dest} {text[:40]!r}")
+
+    def complete(self, prompt):
+        return self._answer(request_key('complete', prompt), f"prompt {prompt[:40]!r}")
+
+
+class RecordingBackend(Backend):
+    """Wraps a backend and appends each successful request to a JSONL file."""
+
+    def __init__(self, backend, path):
+        self.backend = backend
+        self.name = backend.name
+        self.path = Path(path)
+        self._lock = threading.Lock()
+
+    @property
+    def max_in_flight(self):
+        return self.backend.max_in_flight
+
+    def _record(self, key, request, response):
+        line = json.dumps({'key': key, 'backend': self.name, 'request': request, 'response': response},
+                          ensure_ascii=False)
+        with self._lock, open(self.path, 'a', encoding='utf-8') as f:
+            f.write(line + '\n')
+
+    def translate(self, text, src, dest):
+        result = self.backend.translate(text, src, dest)
+        self._record(request_key('translate', text, src, dest),
+                     {'text': text, 'src': src, 'dest': dest}, result)
+        return result
+
+    def complete(self, prompt):
+        result = self.backend.complete(prompt)
+        self._record(request_key('complete', prompt), {'prompt': prompt}, result)
+        return result
+
+
+def _wrap_recording(backend):
+    path = os.environ.get('TRANSLATION_RECORD')
+    if not path or path == '0' or isinstance(backend, ReplayBackend):
+        return backend
+    return RecordingBackend(backend, DEFAULT_RECORDINGS if path == '1' else path)
+
+
+def benchmark(count, latency, fail_rate, retries, concurrency_levels):
+    """Run the stub through the scheduler at several concurrency levels."""
+    from translation_scheduler import retry_with_backoff, run_concurrently
+
+    texts = [f"テキスト {i}" for i in range(count)]
+    print("=" * 60)
+    print(f"Stub scheduler benchmark: {count} texts, {latency * 1000:.0f} ms latency, "
+          f"{fail_rate:.0%} failures, {retries} retries")
+    print("=" * 60)
+
+    outcomes = []
+    for concurrency in concurrency_levels:
+        backend = StubBackend(latency=latency, fail_rate=fail_rate, drop_rate=0)
+
+        def worker(text):
+            def call():
+                try:
+                    return backend.translate(text, 'ja', 'en')
+                except TranslationBackendError:
+                    return None
+            return retry_with_backoff(call, retries=retries, base_delay=0.001, max_delay=0.01)
+
+        results = {}
+        start = time.perf_counter()
+        run_concurrently(texts, worker, max_concurrency=concurrency,
+                         on_result=lambda text, result: results.__setitem__(text, result))
+        elapsed = time.perf_counter() - start
+        translated = sorted(text for text, result in results.items() if result == f"[en] {text}")
+        outcomes.append(translated)
+        print(f"Concurrency {concurrency:3d}: {elapsed:6.2f}s  {count / elapsed:8.1f} texts/s  "
+              f"{len(translated)}/{count} translated ({backend.summary()})")
+
+    # Deterministic failures: every concurrency level must end the same way
+    ok = all(outcome == outcomes[0] for outcome in outcomes)
+    print(f"\n[{'OK' if ok else 'NG'}] Results identical across concurrency levels")
+    return 0 if ok else 1
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Translation backend registry')
+    parser.add_argument('--list', action='store_true', help='List the registered backends')
+    parser.add_argument('--benchmark', type=int, metavar='N',
+                        help='Translate N texts with the stub at several concurrency levels')
+    parser.add_argument('--latency', type=float, default=0.01,
+                        help='Stub latency in seconds for --benchmark (default: 0.01)')
+    parser.add_argument('--fail-rate', type=float, default=0.1,
+                        help='Stub failure rate for --benchmark (default: 0.1)')
+    parser.add_argument('--retries', type=int, default=3,
+                        help='Retries per text for --benchmark (default: 3)')
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 4, 16],
+                        help='Concurrency levels for --benchmark (default: 1 4 16)')
+    args = parser.parse_args()
+
+    if args.benchmark:
+        return benchmark(args.benchmark, args.latency, args.fail_rate, args.retries, args.concurrency)
+
+    for name in available_backends():
+        doc = (BACKENDS[name].__doc__ or '').strip().split('\n')[0]
+        print(f"  {name:12s} {doc}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Size-aware batching for the translation scripts.
+
+Fixed-count batches mix 10-character titles with 4 KB slide bodies, so a
+request is either tiny or large enough to time out. Instead:
+
+- pack_batches() fills each request up to a size budget with first-fit
+  decreasing: values are placed largest first into the first batch that
+  still has room.
+- split_sections() cuts a value larger than the budget on markdown section
+  boundaries (before `#` headings, then between paragraphs), never inside
+  a ``` fence. join_sections() puts the translated parts back together
+  with the original separators.
+
+Sizes are measured in characters or estimated tokens (MEASURES).
+"""
+
+import re
+
+# Suffix of the keys under which the parts of a split value are sent
+PART_SEPARATOR = '#part'
+
+_FENCE_RE = re.compile(r'```.*?(?:```|\Z)', re.DOTALL)
+_BLANK_LINES_RE = re.compile(r'\n[ \t]*\n\s*')
+
+
+def estimate_tokens(text):
+    """Rough token count: ~4 ASCII characters per token, 1 per other character."""
+    non_ascii = sum(1 for c in text if c > '\x7f')
+    return non_ascii + (len(text) - non_ascii + 3) // 4
+
+
+MEASURES = {
+    'chars': len,
+    'tokens': estimate_tokens,
+}
+
+
+def _paragraphs(text):
+    """Return [(start, end)] of the blank-line separated paragraphs outside fences."""
+    fences = [m.span() for m in _FENCE_RE.finditer(text)]
+    units = []
+    pos = 0
+    fence = 0
+    for match in _BLANK_LINES_RE.finditer(text):
+        while fence < len(fences) and fences[fence][1] <= match.start():
+            fence += 1
+        if fence < len(fences) and fences[fence][0] < match.start():
+            continue  # blank line inside a code block
+        units.append((pos, match.start()))
+        pos = match.end()
+    units.append((pos, len(text)))
+    return units
+
+
+def split_sections(text, budget, measure=len):
+    """
+    Split text into parts of at most budget, on markdown boundaries.
+
+    Returns (parts, separators) with len(separators) == len(parts) - 1, so
+    that join_sections(parts, separators) == text. A single paragraph or
+    code block larger than the budget stays one (oversized) part.
+    """
+    if measure(text) <= budget:
+        return [text], []
+
+    # Sections start at a heading; each is a run of paragraphs
+    sections = []
+    for start, end in _paragraphs(text):
+        if not sections or text.startswith('#', start):
+            sections.append([])
+        sections[-1].append((start, end))
+
+    pieces = []
+    for section in sections:
+        whole = (section[0][0], section[-1][1])
+        candidates = [whole] if measure(text[whole[0]:whole[1]]) <= budget else section
+        for start, end in candidates:
+            if pieces and measure(text[pieces[-1][0]:end]) <= budget:
+                pieces[-1] = (pieces[-1][0], end)
+            else:
+                pieces.append((start, end))
+
+    parts = [text[start:end] for start, end in pieces]
+    separators = [text[pieces[i][1]:pieces[i + 1][0]] for i in range(len(pieces) - 1)]
+    return parts, separators
+
+
+def join_sections(parts, separators):
+    """Inverse of split_sections()."""
+    result = [parts[0]]
+    for separator, part in zip(separators, parts[1:]):
+        result.append(separator)
+        result.append(part)
+    return ''.join(result)
+
+
+def split_oversized(texts, budget, measure=len):
+    """
+    Replace values larger than budget by their sections.
+
+    Returns (texts, splits): texts has `key#partN` entries in place of each
+    split value, and splits maps the original key to (part_keys, separators).
+    """
+    result = {}
+    splits = {}
+    for key, text in texts.items():
+        if measure(text) <= budget:
+            result[key] = text
+            continue
+        parts, separators = split_sections(text, budget, measure)
+        if len(parts) == 1:
+            result[key] = text
+            continue
+        part_keys = [f"{key}{PART_SEPARATOR}{i}" for i in range(1, len(parts) + 1)]
+        result.update(zip(part_keys, parts))
+        splits[key] = (part_keys, separators)
+    return result, splits
+
+
+def pack_batches(texts, budget, measure=len, max_items=None):
+    """
+    Pack {key: text} into batches of at most budget with first-fit decreasing.
+
+    A value larger than the budget gets a batch of its own. Keys keep their
+    original order within a batch, and batches are returned in the order
+    they were opened.
+    """
+    order = {key: i for i, key in enumerate(texts)}
+    sizes = {key: measure(text) for key, text in texts.items()}
+    bins = []  # [remaining, [keys]]
+    for key in sorted(texts, key=lambda k: -sizes[k]):
+        for entry in bins:
+            if sizes[key] <= entry[0] and (max_items is None or len(entry[1]) < max_items):
+                entry[0] -= sizes[key]
+                entry[1].append(key)
+                break
+        else:
+            bins.append([budget - sizes[key], [key]])
+    return [{key: texts[key] for key in sorted(keys, key=order.get)} for _, keys in bins]
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Crash-safe checkpoint journal for long translation runs.
+
+Each (file, target language) pair gets an append-only JSONL journal. Every
+completed batch is appended and fsynced right away, so a crash or timeout
+only loses the batch in flight. On the next run the journal is replayed
+and only the remaining keys are translated; once the merged file has been
+written the journal is discarded.
+
+Each line records the key, a hash of the source text it was translated
+from, and the translation. Entries whose source text has changed since
+are ignored on replay, as is a line truncated by a crash.
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+
+JOURNAL_DIR = Path(__file__).parent / ".translation_journal"
+
+
+def source_hash(text):
+    """Return the short hash that ties a journal entry to its source text."""
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()[:16]
+
+
+class TranslationJournal:
+    """Append-only journal of completed translations for one file and language."""
+
+    def __init__(self, filepath, target_lang, journal_dir=JOURNAL_DIR):
+        self.path = Path(journal_dir) / f"{Path(filepath).name}.{target_lang}.jsonl"
+
+    def exists(self):
+        return self.path.exists()
+
+    def replay(self, source_texts):
+        """
+        Return {key: translation} for journal entries that still match
+        the current source texts.
+        """
+        translations = {}
+        if not self.path.exists():
+            return translations
+
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # Last line cut short by a crash
+                    continue
+                key = entry.get("k")
+                source = source_texts.get(key)
+                if source is not None and entry.get("s") == source_hash(source):
+                    translations[key] = entry["t"]
+        return translations
+
+    def append(self, translations, source_texts):
+        """Append a completed batch and flush it to disk."""
+        if not translations:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        lines = []
+        for key, text in translations.items():
+            entry = {"k": key, "s": source_hash(source_texts[key]), "t": text}
+            lines.append(json.dumps(entry, ensure_ascii=False) + "\n")
+        if self._ends_mid_line():
+            # Keep a line cut short by a crash from swallowing the next entry
+            lines.insert(0, "\n")
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.writelines(lines)
+            f.flush()
+            os.fsync(f.fileno())
+
+    def _ends_mid_line(self):
+        try:
+            with open(self.path, 'rb') as f:
+                f.seek(0, os.SEEK_END)
+                if f.tell() == 0:
+                    return False
+                f.seek(-1, os.SEEK_END)
+                return f.read(1) != b"\n"
+        except FileNotFoundError:
+            return False
+
+    def discard(self):
+        """Remove the journal once its translations have been merged."""
+        try:
+            self.path.unlink()
+        except FileNotFoundError:
+            pass
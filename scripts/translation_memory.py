@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Persistent translation memory shared by all translation scripts.
+
+Stores every successful translation in a local SQLite database keyed by
+(source text hash, source language, target language, backend), so repeated
+strings - slide titles like "やってみよう！", the exercise boilerplate added by
+sync_from_reference.py, and anything already translated by a previous run -
+are answered locally instead of being sent to the backend again.
+
+Usage:
+    memory = get_memory()
+    cached = memory.get(text, 'ja', 'en', 'google')
+    if cached is None:
+        cached = backend_translate(text)
+        memory.put(text, 'ja', 'en', 'google', cached)
+
+The least recently used entries are evicted once the store grows past
+max_entries. Set TRANSLATION_MEMORY=0 to disable it, or
+TRANSLATION_MEMORY_PATH to use a different database file.
+"""
+
+import atexit
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+DEFAULT_PATH = Path(__file__).parent / ".translation_memory.sqlite3"
+DEFAULT_MAX_ENTRIES = 500000
+
+# Commit after this many new entries so a crash loses little work
+COMMIT_EVERY = 50
+
+
+def text_hash(text):
+    """Return the hash used to key a source text."""
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+class TranslationMemory:
+    """SQLite-backed translation store with LRU eviction and hit/miss stats."""
+
+    def __init__(self, path=DEFAULT_PATH, max_entries=DEFAULT_MAX_ENTRIES, enabled=True):
+        self.path = Path(path)
+        self.max_entries = max_entries
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self._pending = 0
+        self._lock = threading.Lock()
+        self._conn = None
+
+        if enabled:
+            self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS translations ("
+                " source_hash TEXT NOT NULL,"
+                " source_lang TEXT NOT NULL,"
+                " target_lang TEXT NOT NULL,"
+                " backend TEXT NOT NULL,"
+                " translation TEXT NOT NULL,"
+                " last_used REAL NOT NULL,"
+                " PRIMARY KEY (source_hash, source_lang, target_lang, backend))")
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS translations_last_used ON translations (last_used)")
+            self._conn.commit()
+
+    def get(self, text, source_lang, target_lang, backend):
+        """Return the stored translation of text, or None."""
+        if not self.enabled or not text:
+            return None
+
+        key = (text_hash(text), source_lang, target_lang, backend)
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT translation FROM translations WHERE source_hash=? AND source_lang=?"
+                " AND target_lang=? AND backend=?", key).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self._conn.execute(
+                "UPDATE translations SET last_used=? WHERE source_hash=? AND source_lang=?"
+                " AND target_lang=? AND backend=?", (time.time(),) + key)
+            self.hits += 1
+            return row[0]
+
+    def put(self, text, source_lang, target_lang, backend, translation):
+        """Store a successful translation of text."""
+        if not self.enabled or not text or not isinstance(translation, str):
+            return
+
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO translations VALUES (?, ?, ?, ?, ?, ?)",
+                (text_hash(text), source_lang, target_lang, backend, translation, time.time()))
+            self.stores += 1
+            self._pending += 1
+            if self._pending >= COMMIT_EVERY:
+                self._conn.commit()
+                self._pending = 0
+
+    def evict(self):
+        """Drop the least recently used entries beyond max_entries."""
+        if not self.enabled:
+            return 0
+        with self._lock:
+            count = self._conn.execute("SELECT COUNT(*) FROM translations").fetchone()[0]
+            excess = count - self.max_entries
+            if excess <= 0:
+                return 0
+            self._conn.execute(
+                "DELETE FROM translations WHERE rowid IN"
+                " (SELECT rowid FROM translations ORDER BY last_used LIMIT ?)", (excess,))
+            self._conn.commit()
+            return excess
+
+    def close(self):
+        """Evict, commit and close the database."""
+        if not self.enabled or self._conn is None:
+            return
+        self.evict()
+        with self._lock:
+            self._conn.commit()
+            self._conn.close()
+            self._conn = None
+        self.enabled = False
+
+    def summary(self):
+        """Return a one-line hit/miss summary for reports."""
+        lookups = self.hits + self.misses
+        rate = (self.hits / lookups * 100) if lookups else 0.0
+        return (f"Translation memory: {self.hits} hits, {self.misses} misses "
+                f"({rate:.1f}% hit rate), {self.stores} stored")
+
+
+_default_memory = None
+
+
+def get_memory():
+    """Return the process-wide translation memory, opening it on first use."""
+    global _default_memory
+    if _default_memory is None:
+        enabled = os.environ.get('TRANSLATION_MEMORY', '1') != '0'
+        path = os.environ.get('TRANSLATION_MEMORY_PATH', DEFAULT_PATH)
+        _default_memory = TranslationMemory(path, enabled=enabled)
+        atexit.register(_default_memory.close)
+    return _default_memory
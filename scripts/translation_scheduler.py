@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Concurrent scheduling helpers for the translation scripts.
+
+Provides:
+- AdaptiveRateLimiter: spaces out backend calls, backing off when calls
+  fail and speeding up again while they succeed
+- retry_with_backoff: retries a call with exponential backoff and jitter
+- run_concurrently: runs work items on a bounded thread pool
+
+Translation backends are subprocesses or network calls, so threads are
+enough to keep several requests in flight.
+"""
+
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+
+class AdaptiveRateLimiter:
+    """
+    Shared request pacing for all workers.
+
+    Every call to acquire() reserves the next free slot, `interval` seconds
+    after the previous one. Failures grow the interval by `slowdown` (up to
+    max_interval); successes shrink it by `speedup` (down to min_interval).
+    """
+
+    def __init__(self, initial_interval=0.5, min_interval=0.0, max_interval=30.0,
+                 speedup=0.9, slowdown=1.5):
+        self.interval = initial_interval
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.speedup = speedup
+        self.slowdown = slowdown
+        self._next_slot = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Block until this caller's slot comes up."""
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval
+        delay = slot - now
+        if delay > 0:
+            time.sleep(delay)
+
+    def on_success(self):
+        with self._lock:
+            self.interval = max(self.min_interval, self.interval * self.speedup)
+
+    def on_failure(self):
+        with self._lock:
+            # Step off zero so a failing backend is actually slowed down
+            self.interval = min(self.max_interval, max(self.interval, 0.1) * self.slowdown)
+
+
+def retry_with_backoff(call, retries=3, base_delay=1.0, max_delay=60.0, limiter=None,
+                       is_success=bool):
+    """
+    Call `call()` until `is_success(result)` holds or retries run out.
+
+    Waits base_delay * 2**attempt (with jitter, capped at max_delay) between
+    attempts. When a limiter is given, each attempt waits for a slot and
+    reports its outcome. Returns the last result either way.
+    """
+    result = None
+    for attempt in range(retries + 1):
+        if limiter is not None:
+            limiter.acquire()
+        result = call()
+        if is_success(result):
+            if limiter is not None:
+                limiter.on_success()
+            return result
+        if limiter is not None:
+            limiter.on_failure()
+        if attempt < retries:
+            delay = min(max_delay, base_delay * (2 ** attempt))
+            time.sleep(delay * random.uniform(0.5, 1.0))
+    return result
+
+
+def run_concurrently(items, worker, max_concurrency=4, on_result=None):
+    """
+    Run worker(item) for every item on at most max_concurrency threads.
+
+    on_result(item, result) is called from the calling thread as each item
+    finishes, so it can update shared state without locking. An exception
+    raised by a worker is passed on as the result.
+    """
+    items = list(items)
+    if max_concurrency <= 1:
+        for item in items:
+            try:
+                result = worker(item)
+            except Exception as e:
+                result = e
+            if on_result is not None:
+                on_result(item, result)
+        return
+
+    with ThreadPoolExecutor(max_workers=max_concurrency) as executor:
+        futures = {executor.submit(worker, item): item for item in items}
+        for future in as_completed(futures):
+            try:
+                result = future.result()
+            except Exception as e:
+                result = e
+            if on_result is not None:
+                on_result(futures[future], result)
@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+"""
+Shared parser for senkou-code TypeScript lesson files.
+
+Reference lessons are stored as `export const pythonData = { ... };`. The
+object literal is mostly JSON, but may contain unquoted keys, single-quoted
+strings, backtick template strings, comments and trailing commas. This
+module reads it with one tokenizer pass and a recursive-descent parser,
+instead of each script applying its own regex rewrites before json.loads.
+
+String escapes are decoded with JavaScript semantics, so values match what
+the reference site actually displays.
+
+Usage:
+    data = load_ts_data(path)        # plain dict, as json.loads would give
+    lesson = load_lesson(path)       # typed Lesson / Exercise / Slide model
+
+Parsed files are cached per content hash for the lifetime of the process;
+treat the returned objects as read-only.
+"""
+
+import hashlib
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+
+class TSParseError(ValueError):
+    """Raised when a TypeScript object literal cannot be parsed."""
+
+
+_TOKEN_RE = re.compile(r'''
+    (?P<skip>\s+|//[^\n]*|/\*.*?\*/)
+  | (?P<string>"(?:[^"\\]|\\.)*"|'(?:[^'\\]|\\.)*'|`(?:[^`\\]|\\.)*`)
+  | (?P<number>-?(?:0[xX][0-9a-fA-F]+|(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?))
+  | (?P<ident>[A-Za-z_$][\w$]*)
+  | (?P<punct>[{}\[\]:,])
+''', re.DOTALL | re.VERBOSE)
+
+_ESCAPE_RE = re.compile(r'\\(u\{[0-9a-fA-F]+\}|u[0-9a-fA-F]{4}|x[0-9a-fA-F]{2}|\r\n|.)', re.DOTALL)
+
+_SIMPLE_ESCAPES = {
+    'n': '\n', 't': '\t', 'r': '\r', 'b': '\b', 'f': '\f', 'v': '\v', '0': '\0',
+    '\n': '', '\r\n': '', '\u2028': '', '\u2029': '',
+}
+
+_KEYWORDS = {'true': True, 'false': False, 'null': None, 'undefined': None}
+
+_EXPORT_RE = re.compile(r'export\s+(?:default\s+|(?:const|let|var)\s+[\w$]+\s*(?::[^=]+)?=\s*)')
+
+
+def _decode_escape(match):
+    seq = match.group(1)
+    if seq in _SIMPLE_ESCAPES:
+        return _SIMPLE_ESCAPES[seq]
+    if seq[0] == 'u' and len(seq) > 1:
+        return chr(int(seq[2:-1] if seq[1] == '{' else seq[1:], 16))
+    if seq[0] == 'x' and len(seq) == 3:
+        return chr(int(seq[1:], 16))
+    # Any other escaped character stands for itself (\" \' \` \\ \d ...)
+    return seq
+
+
+def _decode_string(literal):
+    body = literal[1:-1]
+    if '\\' not in body:
+        return body
+    return _ESCAPE_RE.sub(_decode_escape, body)
+
+
+def _tokenize(text, pos):
+    """Split text from pos into (kind, value, position) tokens in one pass."""
+    tokens = []
+    scanner = _TOKEN_RE.scanner(text, pos)
+    end = len(text)
+    while True:
+        match = scanner.match()
+        if match is None:
+            break
+        kind = match.lastgroup
+        if kind == 'skip':
+            continue
+        if kind == 'string':
+            tokens.append(('value', _decode_string(match.group()), match.start()))
+        elif kind == 'number':
+            literal = match.group()
+            if literal.lstrip('-')[:2] in ('0x', '0X'):
+                number = int(literal, 16)
+            elif any(c in literal for c in '.eE'):
+                number = float(literal)
+            else:
+                number = int(literal)
+            tokens.append(('value', number, match.start()))
+        elif kind == 'ident':
+            tokens.append(('ident', match.group(), match.start()))
+        else:
+            tokens.append((match.group(), None, match.start()))
+        pos = match.end()
+    if pos < end:
+        tokens.append(('other', text[pos], pos))
+    tokens.append(('eof', None, end))
+    return tokens
+
+
+class _Parser:
+    def __init__(self, tokens):
+        self.tokens = tokens
+        self.index = 0
+
+    def error(self, message):
+        kind, value, pos = self.tokens[self.index]
+        return TSParseError(f"{message} at offset {pos} (got {value if value is not None else kind!r})")
+
+    def parse_value(self):
+        kind, value, _ = self.tokens[self.index]
+        if kind == '{':
+            return self.parse_object()
+        if kind == '[':
+            return self.parse_array()
+        if kind == 'value':
+            self.index += 1
+            return value
+        if kind == 'ident' and value in _KEYWORDS:
+            self.index += 1
+            return _KEYWORDS[value]
+        raise self.error("Unexpected token")
+
+    def parse_object(self):
+        tokens = self.tokens
+        self.index += 1
+        result = {}
+        while True:
+            kind, value, _ = tokens[self.index]
+            if kind == '}':
+                self.index += 1
+                return result
+            if kind == 'value':
+                key = str(value)
+            elif kind == 'ident':
+                key = value
+            else:
+                raise self.error("Expected property name")
+            self.index += 1
+            if tokens[self.index][0] != ':':
+                raise self.error("Expected ':'")
+            self.index += 1
+            result[key] = self.parse_value()
+
+            kind = tokens[self.index][0]
+            if kind == ',':
+                self.index += 1
+            elif kind != '}':
+                raise self.error("Expected ',' or '}'")
+
+    def parse_array(self):
+        tokens = self.tokens
+        self.index += 1
+        result = []
+        while True:
+            if tokens[self.index][0] == ']':
+                self.index += 1
+                return result
+            result.append(self.parse_value())
+
+            kind = tokens[self.index][0]
+            if kind == ',':
+                self.index += 1
+            elif kind != ']':
+                raise self.error("Expected ',' or ']'")
+
+
+def parse_ts_object(text):
+    """
+    Parse the exported object literal of a TypeScript lesson file.
+
+    Accepts `export const name = {...}`, `export const name: Type = {...}`
+    and `export default {...}`; falls back to the first '{' in the text.
+    Raises TSParseError if the literal is malformed.
+    """
+    match = _EXPORT_RE.search(text)
+    start = match.end() if match else text.find('{')
+    if start == -1:
+        raise TSParseError("No object literal found")
+
+    # Anything after the literal (';', 'as const', ...) is ignored
+    parser = _Parser(_tokenize(text, start))
+    return parser.parse_value()
+
+
+@dataclass
+class Slide:
+    title: str = ''
+    content: str = ''
+    image: str = ''
+
+
+@dataclass
+class Exercise:
+    title: str = ''
+    description: str = ''
+    order_index: Optional[int] = None
+    slides: List[Slide] = field(default_factory=list)
+    correct_code: str = ''
+    correct_lines: List[Any] = field(default_factory=list)
+    line_hints: List[Any] = field(default_factory=list)
+    raw: Dict[str, Any] = field(default_factory=dict, repr=False)
+
+
+@dataclass
+class Lesson:
+    lesson_id: str = ''
+    title: str = ''
+    description: str = ''
+    exercises: List[Exercise] = field(default_factory=list)
+    raw: Dict[str, Any] = field(default_factory=dict, repr=False)
+
+    @property
+    def lesson_number(self):
+        """Lesson number taken from lessonId ("python-3" -> 3), defaulting to 1."""
+        try:
+            return int(self.lesson_id.split('-')[-1])
+        except (ValueError, IndexError):
+            return 1
+
+
+def lesson_from_dict(data):
+    """Build the typed model from parsed lesson data."""
+    exercises = []
+    for ex in data.get('exercises', []) or []:
+        slides = [Slide(title=s.get('title', '') or '',
+                        content=s.get('content', '') or '',
+                        image=s.get('image', '') or '')
+                  for s in ex.get('tutorialSlides', []) or []]
+        exercises.append(Exercise(
+            title=ex.get('title', '') or '',
+            description=ex.get('description', '') or '',
+            order_index=ex.get('orderIndex'),
+            slides=slides,
+            correct_code=ex.get('correctCode', '') or '',
+            correct_lines=ex.get('correctLines', []) or [],
+            line_hints=ex.get('lineHints', []) or [],
+            raw=ex,
+        ))
+    return Lesson(
+        lesson_id=data.get('lessonId', '') or '',
+        title=data.get('lessonTitle', '') or '',
+        description=data.get('lessonDescription', '') or '',
+        exercises=exercises,
+        raw=data,
+    )
+
+
+_cache = {}
+
+
+def load_ts_data(file_path, warn=True):
+    """
+    Parse a TypeScript lesson file into plain Python data.
+
+    Returns None if the file does not exist or cannot be parsed. Results
+    are cached per content hash.
+    """
+    file_path = Path(file_path)
+    try:
+        content = file_path.read_bytes()
+    except FileNotFoundError:
+        return None
+
+    digest = hashlib.blake2b(content, digest_size=16).digest()
+    if digest in _cache:
+        return _cache[digest]
+
+    try:
+        data = parse_ts_object(content.decode('utf-8'))
+    except (TSParseError, UnicodeDecodeError) as e:
+        if warn:
+            print(f"  Warning: Failed to parse {file_path.name}: {e}")
+        data = None
+    _cache[digest] = data
+    return data
+
+
+def load_lesson(file_path, warn=True):
+    """Parse a TypeScript lesson file into a Lesson, or None."""
+    data = load_ts_data(file_path, warn)
+    if not isinstance(data, dict):
+        return None
+    return lesson_from_dict(data)
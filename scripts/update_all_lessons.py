@@ -8,26 +8,12 @@ import re
 import os
 from pathlib import Path
 
+from json_utils import safe_json_dump
+from ts_lesson_parser import load_ts_data
+
 def parse_ts_file(filepath):
     """Parse TypeScript file and extract JSON data"""
-    with open(filepath, 'r', encoding='utf-8') as f:
-        content = f.read()
-
-    # Extract the JSON part (after 'export const XXXData = ')
-    json_start = content.find('{')
-    if json_start == -1:
-        return None
-    json_str = content[json_start:].rstrip()
-
-    # Remove trailing semicolon and whitespace
-    if json_str.endswith(';'):
-        json_str = json_str[:-1]
-
-    try:
-        return json.loads(json_str)
-    except json.JSONDecodeError as e:
-        print(f"  Warning: Failed to parse {filepath}: {e}")
-        return None
+    return load_ts_data(filepath)
 
 def extract_comments_from_correct_code(correct_code, language):
     """Extract comment lines from correctCode based on language"""
@@ -180,8 +166,7 @@ def update_language_lessons(language, source_files, target_file):
     target_data['ja'] = ja
 
     # Save updated JSON
-    with open(target_file, 'w', encoding='utf-8') as f:
-        json.dump(target_data, f, ensure_ascii=False, indent=4)
+    safe_json_dump(target_data, target_file, indent=4)
 
     print(f"  Total: {total_exercises} exercises updated")
     return total_exercises
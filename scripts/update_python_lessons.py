@@ -6,16 +6,12 @@ import json
 import re
 import os
 
+from json_utils import safe_json_dump
+from ts_lesson_parser import load_ts_data
+
 def parse_ts_file(filepath):
     """Parse TypeScript file and extract JSON data"""
-    with open(filepath, 'r', encoding='utf-8') as f:
-        content = f.read()
-
-    # Extract the JSON part (after 'export const XXXData = ')
-    json_start = content.find('{')
-    json_str = content[json_start:]
-
-    return json.loads(json_str)
+    return load_ts_data(filepath)
 
 def extract_comments_from_correct_code(correct_code):
     """Extract comment lines from correctCode"""
@@ -105,8 +101,7 @@ def main():
     # For now, we keep English as-is since source is Japanese
 
     # Save updated JSON
-    with open(target_file, 'w', encoding='utf-8') as f:
-        json.dump(target_data, f, ensure_ascii=False, indent=4)
+    safe_json_dump(target_data, target_file, indent=4)
 
     print(f"\nUpdated {target_file}")
 
@@ -11,41 +11,54 @@ Run this:
 Exit code: 0 if all valid, 1 if errors found
 """
 
+import argparse
 import json
 import os
+import re
 import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
+from validation_cache import ValidationCache
+
 RESOURCES_PATH = Path(r"C:\Work\MetaXR\ProgramShooting\Assets\Resources")
 
 # Characters that indicate potential issues
 SMART_QUOTES = ['\u201c', '\u201d', '\u2018', '\u2019']
 
+# Bump when the checks below change so cached results are discarded
+CACHE_VERSION = 1
 
-def check_potential_issues(content, filename):
-    """Check for potential issues that might cause problems later."""
-    issues = []
+# One token per escape pair, quote or newline. Escape pairs are consumed
+# whole, so a quote is only matched here when it is unescaped and the
+# backslash run before it never has to be counted.
+_SCAN_TOKEN = re.compile(r'\\(.)|(")|(\n)', re.DOTALL)
 
-    # Check for smart quotes after backslash (will cause JSON error if not caught)
-    for i, c in enumerate(content):
-        if c == '\\' and i + 1 < len(content):
-            if content[i + 1] in SMART_QUOTES:
-                issues.append(f"Smart quote after backslash at position {i}")
 
-    # Check for actual newlines inside strings
+def check_potential_issues(content, filename):
+    """
+    Check for potential issues that might cause problems later.
+
+    Runs as a single linear scan over the content, tracking whether the
+    current position is inside a string.
+    """
+    issues = []
     in_string = False
-    for i, c in enumerate(content):
-        if c == '"':
-            bs = 0
-            j = i - 1
-            while j >= 0 and content[j] == '\\':
-                bs += 1
-                j -= 1
-            if bs % 2 == 0:
-                in_string = not in_string
-        elif c == '\n' and in_string:
-            issues.append(f"Actual newline in string at position {i}")
-            break  # One is enough to report
+    newline_reported = False
+
+    for match in _SCAN_TOKEN.finditer(content):
+        escaped = match.group(1)
+        if escaped is not None:
+            # Smart quote after backslash (will cause JSON error if not caught)
+            if escaped in SMART_QUOTES:
+                issues.append(f"Smart quote after backslash at position {match.start()}")
+        elif match.group(2) is not None:
+            in_string = not in_string
+        elif in_string and not newline_reported:
+            # Actual newline inside a string; one is enough to report
+            issues.append(f"Actual newline in string at position {match.start()}")
+            newline_reported = True
 
     return issues
 
@@ -74,7 +87,44 @@ def validate_file(filepath):
         return False, str(e), []
 
 
+def _validate_timed(filepath):
+    """Worker entry point: validate a file and measure how long it took."""
+    start = time.perf_counter()
+    is_valid, error, potential_issues = validate_file(filepath)
+    return filepath.name, is_valid, error, potential_issues, time.perf_counter() - start
+
+
+def validate_files(filepaths, jobs=None):
+    """
+    Validate files across a process pool.
+
+    Yields (filename, is_valid, error, potential_issues, seconds) in the
+    order the files were given. jobs=1 validates in-process.
+    """
+    filepaths = list(filepaths)
+    if jobs == 1 or len(filepaths) < 2:
+        for filepath in filepaths:
+            yield _validate_timed(filepath)
+        return
+
+    workers = jobs or os.cpu_count() or 1
+    chunksize = max(1, len(filepaths) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        yield from executor.map(_validate_timed, filepaths, chunksize=chunksize)
+
+
 def main():
+    parser = argparse.ArgumentParser(description='Validate all JSON files in Resources')
+    parser.add_argument('--path', type=Path, default=RESOURCES_PATH,
+                        help='Resources folder to validate')
+    parser.add_argument('--jobs', '-j', type=int, default=None,
+                        help='Number of worker processes (default: CPU count, 1 = no pool)')
+    parser.add_argument('--timings', type=int, nargs='?', const=10, default=0, metavar='N',
+                        help='Report the N slowest files (default N: 10)')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Re-validate every file, ignoring the validation cache')
+    args = parser.parse_args()
+
     print("=" * 70)
     print("JSON Validation Report")
     print("=" * 70)
@@ -83,13 +133,36 @@ def main():
     errors = []
     warnings = []
     valid_count = 0
+    timings = []
+
+    filepaths = [args.path / filename for filename in sorted(os.listdir(args.path))
+                 if filename.endswith('.json')]
+
+    start = time.perf_counter()
+    cache = ValidationCache("validate_all_json", CACHE_VERSION, enabled=not args.no_cache)
+
+    # Only files that changed since the last run go to the pool
+    results = {}
+    changed = []
+    fingerprints = {}
+    for filepath in filepaths:
+        cached = cache.lookup(filepath)
+        if cached is None:
+            changed.append(filepath)
+            fingerprints[filepath.name] = cache.fingerprint(filepath)
+        else:
+            results[filepath.name] = tuple(cached)
 
-    for filename in sorted(os.listdir(RESOURCES_PATH)):
-        if not filename.endswith('.json'):
-            continue
+    for filename, is_valid, error, potential_issues, seconds in validate_files(changed, args.jobs):
+        timings.append((seconds, filename))
+        results[filename] = (is_valid, error, potential_issues)
+        cache.store(args.path / filename, [is_valid, error, potential_issues],
+                    fingerprints[filename])
+    cache.save()
 
-        filepath = RESOURCES_PATH / filename
-        is_valid, error, potential_issues = validate_file(filepath)
+    for filepath in filepaths:
+        filename = filepath.name
+        is_valid, error, potential_issues = results[filename]
 
         if not is_valid:
             errors.append((filename, error))
@@ -99,12 +172,23 @@ def main():
         else:
             valid_count += 1
 
+    elapsed = time.perf_counter() - start
+
     # Report results
     print(f"Valid files: {valid_count}")
     print(f"Files with errors: {len(errors)}")
     print(f"Files with warnings: {len(warnings)}")
+    print(f"Elapsed: {elapsed:.2f}s")
+    print(cache.summary())
     print()
 
+    if args.timings:
+        print("SLOWEST FILES (per-file validation time):")
+        print("-" * 50)
+        for seconds, filename in sorted(timings, reverse=True)[:args.timings]:
+            print(f"  {seconds * 1000:8.1f} ms  {filename}")
+        print()
+
     if errors:
         print("ERRORS:")
         print("-" * 50)
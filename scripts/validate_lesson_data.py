@@ -11,10 +11,13 @@ This script validates that all lesson JSON files have complete data:
 Run this after syncing data from the reference site.
 """
 
+import argparse
 import json
 import re
 from pathlib import Path
-from collections import defaultdict
+
+from lesson_index import LessonIndex, build_index
+from validation_cache import ValidationCache
 
 PROJECT_RESOURCES_PATH = Path(r"C:\Work\MetaXR\ProgramShooting\Assets\Resources")
 
@@ -24,6 +27,9 @@ LANGUAGES = [
     "lua", "perl", "haskell", "elixir", "assembly"
 ]
 
+# Bump when the checks below change so cached results are discarded
+CACHE_VERSION = 1
+
 # Minimum required keys for each exercise
 REQUIRED_EXERCISE_KEYS = [
     "title",
@@ -41,23 +47,17 @@ def load_json_file(file_path):
 
 def extract_exercise_structure(data, language):
     """Extract exercise structure from lesson data."""
-    exercises = defaultdict(lambda: defaultdict(dict))
-
-    # Pattern: {language}_lesson{N}_ex{M}_{field}
-    pattern = re.compile(rf'^{language}_lesson(\d+)_ex(\d+)_(.+)$')
-
-    for key in data.keys():
-        match = pattern.match(key)
-        if match:
-            lesson_num = int(match.group(1))
-            ex_num = int(match.group(2))
-            field = match.group(3)
-            exercises[lesson_num][ex_num][field] = True
+    index = LessonIndex()
+    index.add_file(f"{language}Lessons_ja.json", {"ja": list(data)})
+    return index.exercise_structure(language, "ja")
 
-    return exercises
+def validate_language(language, index=None):
+    """
+    Validate lesson data for a language.
 
-def validate_language(language):
-    """Validate lesson data for a language."""
+    With a lesson_index.LessonIndex the exercise structure is read from the
+    index instead of re-parsing the file's keys.
+    """
     errors = []
     warnings = []
 
@@ -70,7 +70,10 @@ def validate_language(language):
         return errors, warnings
 
     # Extract exercise structure
-    exercises = extract_exercise_structure(ja_data, language)
+    if index is not None:
+        exercises = index.exercise_structure(language, "ja")
+    else:
+        exercises = extract_exercise_structure(ja_data, language)
 
     if not exercises:
         errors.append(f"No exercises found in {ja_file.name}")
@@ -122,7 +125,37 @@ def validate_language(language):
 
     return errors, warnings
 
+def validate_language_cached(language, cache, get_index=None):
+    """
+    Validate a language, reusing the last result if its JA file is unchanged.
+
+    get_index is called only on a cache miss, so a fully cached run never
+    builds the lesson index.
+    """
+    ja_file = PROJECT_RESOURCES_PATH / f"{language}Lessons_ja.json"
+    cached = cache.lookup(ja_file)
+    if cached is not None:
+        return cached["errors"], cached["warnings"]
+
+    fingerprint = cache.fingerprint(ja_file)
+    errors, warnings = validate_language(language, get_index() if get_index else None)
+    cache.store(ja_file, {"errors": errors, "warnings": warnings}, fingerprint)
+    return errors, warnings
+
 def main():
+    parser = argparse.ArgumentParser(description='Validate lesson data completeness')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Re-validate every language, ignoring the validation cache')
+    args = parser.parse_args()
+
+    cache = ValidationCache("validate_lesson_data", CACHE_VERSION, enabled=not args.no_cache)
+    indexes = []
+
+    def get_index():
+        if not indexes:
+            indexes.append(build_index(PROJECT_RESOURCES_PATH, use_cache=not args.no_cache))
+        return indexes[0]
+
     print("=" * 70)
     print("Lesson Data Validation Report")
     print("=" * 70)
@@ -133,7 +166,7 @@ def main():
     languages_with_errors = []
 
     for language in LANGUAGES:
-        errors, warnings = validate_language(language)
+        errors, warnings = validate_language_cached(language, cache, get_index)
 
         if errors or warnings:
             print(f"\n{language.upper()}:")
@@ -163,6 +196,9 @@ def main():
     print("=" * 70)
     print(f"Total Errors: {total_errors}")
     print(f"Total Warnings: {total_warnings}")
+    print(cache.summary())
+
+    cache.save()
 
     if languages_with_errors:
         print(f"\nLanguages with errors: {', '.join(languages_with_errors)}")
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Incremental validation cache shared by the validation scripts.
+
+Maps each validated file to its mtime, size and content hash together with
+the last validation result, so a validator only has to re-check files that
+actually changed since the previous run.
+
+Usage:
+    cache = ValidationCache("validate_all_json", version=1)
+    result = cache.lookup(path)
+    if result is None:
+        fingerprint = cache.fingerprint(path)
+        result = validate(path)
+        cache.store(path, result, fingerprint)
+    cache.save()
+
+Results must be JSON-serializable. Bump `version` whenever the validator's
+checks change so stale results are discarded. Take the fingerprint before
+validating: if the file changes meanwhile, the stored entry then describes
+the contents that were validated and the next lookup re-checks the file.
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+
+CACHE_DIR = Path(__file__).parent / ".validation_cache"
+
+
+def file_fingerprint(filepath, content=None):
+    """
+    Return (mtime_ns, size, content_hash) for a file.
+
+    Pass `content` (bytes) when the file has already been read to avoid
+    reading it again.
+    """
+    stat = os.stat(filepath)
+    if content is None:
+        with open(filepath, 'rb') as f:
+            content = f.read()
+    digest = hashlib.blake2b(content, digest_size=16).hexdigest()
+    return stat.st_mtime_ns, stat.st_size, digest
+
+
+class ValidationCache:
+    """On-disk cache of per-file validation results for one validator."""
+
+    def __init__(self, name, version=1, cache_dir=CACHE_DIR, enabled=True):
+        self.path = Path(cache_dir) / f"{name}.json"
+        self.version = version
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+        self._entries = {}
+        self._dirty = False
+
+        if enabled:
+            self._load()
+
+    def _load(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if data.get("version") == self.version:
+            self._entries = data.get("files", {})
+
+    @staticmethod
+    def _key(filepath):
+        return str(Path(filepath).resolve())
+
+    def lookup(self, filepath):
+        """
+        Return the cached result for a file, or None if it changed.
+
+        A matching mtime and size is trusted without reading the file. If
+        only the mtime moved (e.g. a checkout touched it), the content hash
+        decides, and the entry is refreshed on a match.
+        """
+        if not self.enabled:
+            self.misses += 1
+            return None
+
+        key = self._key(filepath)
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        try:
+            stat = os.stat(filepath)
+        except OSError:
+            self.misses += 1
+            return None
+
+        if stat.st_mtime_ns == entry["mtime_ns"] and stat.st_size == entry["size"]:
+            self.hits += 1
+            return entry["result"]
+
+        if stat.st_size == entry["size"]:
+            mtime_ns, size, digest = file_fingerprint(filepath)
+            if digest == entry["hash"]:
+                entry["mtime_ns"] = mtime_ns
+                self._dirty = True
+                self.hits += 1
+                return entry["result"]
+
+        self.misses += 1
+        return None
+
+    def fingerprint(self, filepath):
+        """
+        Return the file's (mtime_ns, size, content_hash) for store().
+
+        Returns None when the cache is disabled (nothing is read) or the
+        file cannot be read.
+        """
+        if not self.enabled:
+            return None
+        try:
+            return file_fingerprint(filepath)
+        except OSError:
+            return None
+
+    def store(self, filepath, result, fingerprint):
+        """
+        Record the validation result for the contents described by
+        `fingerprint`, as returned by fingerprint() before validating.
+        """
+        if not self.enabled or fingerprint is None:
+            return
+        mtime_ns, size, digest = fingerprint
+        self._entries[self._key(filepath)] = {
+            "mtime_ns": mtime_ns,
+            "size": size,
+            "hash": digest,
+            "result": result,
+        }
+        self._dirty = True
+
+    def save(self):
+        """Write the cache back to disk if anything changed."""
+        if not self.enabled or not self._dirty:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({"version": self.version, "files": self._entries}, f)
+        os.replace(tmp_path, self.path)
+        self._dirty = False
+
+    def summary(self):
+        """Return a one-line hit/miss summary for reports."""
+        if not self.enabled:
+            return "Cache: disabled"
+        return f"Cache: {self.hits} unchanged, {self.misses} re-checked"
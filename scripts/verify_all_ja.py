@@ -8,6 +8,8 @@ import sys
 import io
 from pathlib import Path
 
+from lesson_index import split_by_course
+
 sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
 
 LOCAL_DIR = Path("C:/Work/MetaXR/ProgramShooting/Assets/Resources")
@@ -46,13 +48,13 @@ def main():
 
     print(f"参考サイトキー数: {len(all_ref_keys)}")
 
+    ref_by_course = split_by_course(all_ref_keys)
     results = {}
     checklist = []
 
     for lang in LANGUAGES:
         # Get reference keys for this language
-        prefix = f"{lang}_"
-        ref_lang_keys = {k: v for k, v in all_ref_keys.items() if k.startswith(prefix)}
+        ref_lang_keys = ref_by_course.get(lang, {})
 
         # Load local file
         local_filename = f"{lang}Lessons_ja.json"
@@ -8,6 +8,8 @@ import sys
 import io
 from pathlib import Path
 
+from lesson_index import course_of_key, split_by_course
+
 # Fix Windows console encoding
 sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
 
@@ -49,10 +51,8 @@ PREFIX_TO_FILE = {
 
 def get_prefix_for_key(key):
     """Get the prefix for a key"""
-    for prefix in LANGUAGE_PREFIXES:
-        if key.startswith(prefix):
-            return prefix
-    return None
+    prefix = f"{course_of_key(key)}_"
+    return prefix if prefix in PREFIX_TO_FILE else None
 
 def main():
     # Load reference data
@@ -63,13 +63,8 @@ def main():
     print(f"Reference keys: {len(reference_data)}")
 
     # Group reference keys by prefix
-    reference_by_prefix = {}
-    for key, value in reference_data.items():
-        prefix = get_prefix_for_key(key)
-        if prefix:
-            if prefix not in reference_by_prefix:
-                reference_by_prefix[prefix] = {}
-            reference_by_prefix[prefix][key] = value
+    reference_by_prefix = {f"{course}_": keys
+                           for course, keys in split_by_course(reference_data).items()}
 
     # Load and compare each local file
     results = {}